@@ -5,6 +5,7 @@ import { getModelName } from '../lib/aiClient.js';
 import connectToDatabase from '../lib/db.js';
 import Student from '../models/Student.js';
 import { escapeRegex } from '../lib/regexUtils.js';
+import { normalizeRollNumber } from '../lib/rollNumber.js';
 
 export const maxDuration = 60;
 
@@ -51,11 +52,8 @@ async function fetchStudentData(rollNumber?: string, name?: string) {
 
   try {
     if (rollNumber) {
-      // Escape regex to prevent injection attacks
-      const escapedRollNumber = escapeRegex(rollNumber);
-      const student = await Student.findOne({
-        rollNumber: { $regex: `^${escapedRollNumber}$`, $options: 'i' },
-      });
+      // Roll numbers are stored normalized, so this is an exact match on the unique index
+      const student = await Student.findOne({ rollNumber: normalizeRollNumber(rollNumber) });
       return student ? student.toObject() : null;
     }
 
@@ -2,6 +2,7 @@ import type { VercelRequest, VercelResponse } from '@vercel/node';
 import connectToDatabase from '../lib/db.js';
 import Student from '../models/Student.js';
 import { escapeRegex } from '../lib/regexUtils.js';
+import { normalizeRollNumber } from '../lib/rollNumber.js';
 
 export const maxDuration = 60;
 
@@ -25,7 +26,7 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
     // POST /api/students - Create or update a student
     if (req.method === 'POST') {
       const {
-        rollNumber,
+        rollNumber: rawRollNumber,
         name,
         semester,
         branch,
@@ -34,6 +35,9 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
         cgpa,
       } = req.body;
 
+      // Stored normalized, like load_mongodb.py, so exact lookups use the index
+      const rollNumber = typeof rawRollNumber === 'string' ? normalizeRollNumber(rawRollNumber) : rawRollNumber;
+
       if (!rollNumber || !name || !semester || !branch || !subjects || sgpa === undefined) {
         return res.status(400).json({
           error: 'Missing required fields: rollNumber, name, semester, branch, subjects, sgpa',
@@ -2,7 +2,7 @@ import type { VercelRequest, VercelResponse } from '@vercel/node';
 import connectToDatabase from '../../lib/db.js';
 import Student from '../../models/Student.js';
 import PDFDocument from 'pdfkit';
-import { escapeRegex } from '../../lib/regexUtils.js';
+import { normalizeRollNumber } from '../../lib/rollNumber.js';
 
 export const maxDuration = 60;
 
@@ -35,11 +35,8 @@ export default async function handler(
       return res.status(400).json({ error: 'rollNumber query parameter is required' });
     }
 
-    // Find student by roll number - escape regex to prevent injection attacks
-    const escapedRollNumber = escapeRegex(rollNumber);
-    const student = await Student.findOne({
-      rollNumber: { $regex: `^${escapedRollNumber}$`, $options: 'i' },
-    });
+    // Roll numbers are stored normalized, so this is an exact match on the unique index
+    const student = await Student.findOne({ rollNumber: normalizeRollNumber(rollNumber) });
 
     if (!student) {
       return res.status(404).json({ error: 'Student not found' });
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Vectorized cohort statistics for converted (app format) subjects.
+
+All students are loaded into students x subjects NumPy arrays once, and
+SGPA, class rank, percentile rank, per-subject summaries and grade
+distributions are computed with array operations instead of a Python loop
+per student.
+"""
+
+import numpy as np
+
+from records import Grade
+
+
+GRADE_POINTS = {grade.value: grade.points for grade in Grade}
+GRADE_ORDER = list(GRADE_POINTS)
+
+# (minimum SGPA, remarks), checked top to bottom
+REMARK_THRESHOLDS = [
+    (8.5, "First Class with Distinction"),
+    (6.5, "First Class"),
+    (5.5, "Second Class"),
+]
+DEFAULT_REMARKS = "Pass"
+
+FAIL_GRADE = "F"
+QUANTILES = (10, 25, 50, 75, 90)
+DEFAULT_BUCKETS = 10
+DEFAULT_TOP_N = 5
+
+
+class CohortMatrix:
+    """
+    Dense students x subjects view of a cohort.
+    
+    Columns are (subject name, category) pairs in order of first appearance,
+    since the same paper name appears under Theory and Practical; cells for
+    subjects a student did not take are NaN (marks) or 0 (credits) and
+    masked out by `present`. Grades are stored as indices into GRADE_ORDER,
+    with -1 for missing or unknown grades.
+    """
+    
+    def __init__(self, subject_lists):
+        columns = {}
+        for subjects in subject_lists:
+            for s in subjects:
+                columns.setdefault((s["name"], s["category"]), len(columns))
+        
+        n_students, n_subjects = len(subject_lists), len(columns)
+        self.subject_names = [name for name, _ in columns]
+        self.subject_categories = [category for _, category in columns]
+        self.obtained = np.full((n_students, n_subjects), np.nan)
+        self.max_marks = np.full((n_students, n_subjects), np.nan)
+        self.credits = np.zeros((n_students, n_subjects))
+        self.grade_points = np.zeros((n_students, n_subjects))
+        self.grade_codes = np.full((n_students, n_subjects), -1, dtype=np.int8)
+        self.backlog = np.zeros((n_students, n_subjects), dtype=bool)
+        
+        grade_index = {grade: idx for idx, grade in enumerate(GRADE_ORDER)}
+        for row, subjects in enumerate(subject_lists):
+            for s in subjects:
+                col = columns[(s["name"], s["category"])]
+                self.obtained[row, col] = s["obtainedMarks"]
+                self.max_marks[row, col] = s["maxMarks"]
+                self.credits[row, col] = s["credits"]
+                self.grade_points[row, col] = GRADE_POINTS.get(s["grade"], 0)
+                self.grade_codes[row, col] = grade_index.get(s["grade"], -1)
+                self.backlog[row, col] = s["isBacklog"]
+        
+        self.present = ~np.isnan(self.obtained)
+
+
+def _round(values, digits=2):
+    """Round like Python's round() (numpy's rounding differs on .xx5 ties)."""
+    return [round(float(v), digits) for v in values]
+
+
+def _summary(values):
+    """mean/median/std/min/max of a 1-D array, ignoring NaN."""
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {"count": 0, "mean": None, "median": None, "std": None, "min": None, "max": None}
+    return {
+        "count": int(values.size),
+        "mean": round(float(values.mean()), 2),
+        "median": round(float(np.median(values)), 2),
+        "std": round(float(values.std()), 2),
+        "min": round(float(values.min()), 2),
+        "max": round(float(values.max()), 2),
+    }
+
+
+def _grade_distribution(codes):
+    """Count grades in an array of GRADE_ORDER indices (-1 ignored)."""
+    counts = np.bincount(codes[codes >= 0].astype(np.intp), minlength=len(GRADE_ORDER))
+    return {grade: int(count) for grade, count in zip(GRADE_ORDER, counts) if count}
+
+
+def compute_cohort_stats(subject_lists, matrix=None):
+    """
+    Compute per-student and class-wide statistics in one vectorized pass.
+    
+    subject_lists holds one list of app-format subjects per student.
+    Returns (per_student, cohort) where per_student is a list of dicts with
+    sgpa, totalMarks, maxTotalMarks, percentage, remarks, backlogCount,
+    classRank and percentileRank, and cohort is a JSON-ready summary with
+    SGPA spread, overall grade distribution and per-subject statistics.
+    
+    classRank is the competition rank by SGPA (ties share the best rank);
+    percentileRank is the share of the class with SGPA <= the student's,
+    the same definition PercentileInfo uses in the frontend.
+    
+    Pass a prebuilt CohortMatrix to share it with compute_subject_analytics.
+    """
+    m = matrix if matrix is not None else CohortMatrix(subject_lists)
+    n_students = len(subject_lists)
+    
+    total_marks = np.where(m.present, m.obtained, 0).sum(axis=1)
+    max_total = np.where(m.present, m.max_marks, 0).sum(axis=1)
+    total_credits = m.credits.sum(axis=1)
+    weighted_points = (m.grade_points * m.credits).sum(axis=1)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sgpa = np.where(total_credits > 0, weighted_points / total_credits, 0.0)
+        percentage = np.where(max_total > 0, total_marks / max_total * 100, 0.0)
+    sgpa = np.array(_round(sgpa))
+    
+    # Rank and percentile from one sort instead of comparing every pair
+    sorted_sgpa = np.sort(sgpa)
+    count_leq = np.searchsorted(sorted_sgpa, sgpa, side='right')
+    class_rank = n_students - count_leq + 1
+    percentile_rank = count_leq / max(n_students, 1) * 100
+    
+    remarks = np.select(
+        [sgpa >= threshold for threshold, _ in REMARK_THRESHOLDS],
+        [label for _, label in REMARK_THRESHOLDS],
+        default=DEFAULT_REMARKS
+    )
+    backlog_count = m.backlog.sum(axis=1)
+    
+    per_student = [
+        {
+            "sgpa": sgpa_value,
+            "totalMarks": int(total),
+            "maxTotalMarks": int(max_value),
+            "percentage": percentage_value,
+            "remarks": str(remark),
+            "backlogCount": int(backlogs),
+            "classRank": int(rank),
+            "percentileRank": percentile_value,
+        }
+        for sgpa_value, total, max_value, percentage_value, remark, backlogs, rank, percentile_value
+        in zip(sgpa.tolist(), total_marks, max_total, _round(percentage, 1), remarks,
+               backlog_count, class_rank, _round(percentile_rank))
+    ]
+    
+    subjects = []
+    for col, (name, category) in enumerate(zip(m.subject_names, m.subject_categories)):
+        taken = m.present[:, col]
+        max_values = m.max_marks[taken, col]
+        subjects.append({
+            "name": name,
+            "category": category,
+            "maxMarks": int(max_values.max()) if max_values.size else 0,
+            "marks": _summary(m.obtained[:, col]),
+            "gradeDistribution": _grade_distribution(m.grade_codes[taken, col]),
+        })
+    
+    cohort = {
+        "classSize": n_students,
+        "sgpa": _summary(sgpa.astype(float)),
+        "percentage": _summary(np.array(_round(percentage, 1))),
+        "gradeDistribution": _grade_distribution(m.grade_codes[m.present]),
+        "subjects": subjects,
+    }
+    
+    return per_student, cohort
+
+
+def _distribution(values, upper, buckets):
+    """Histogram buckets over [0, upper] plus quantiles of a 1-D array."""
+    edges = np.linspace(0, upper, buckets + 1) if upper > 0 else np.array([0.0, 1.0])
+    counts, _ = np.histogram(np.clip(values, 0, edges[-1]), bins=edges)
+    histogram = [
+        {"from": round(float(lo), 2), "to": round(float(hi), 2), "count": int(count)}
+        for lo, hi, count in zip(edges[:-1], edges[1:], counts)
+    ]
+    if values.size:
+        quantiles = {f"p{q}": round(float(v), 2)
+                     for q, v in zip(QUANTILES, np.percentile(values, QUANTILES))}
+    else:
+        quantiles = {f"p{q}": None for q in QUANTILES}
+    return histogram, quantiles
+
+
+def _top_n(scores, rolls, names, top_n):
+    """Best top_n rows by score (NaN excluded), ties broken by roll number."""
+    valid = np.flatnonzero(~np.isnan(scores))
+    order = valid[np.lexsort((np.asarray(rolls)[valid], -scores[valid]))][:top_n]
+    return [
+        {"rollNumber": rolls[i], "name": names[i], "score": round(float(scores[i]), 2)}
+        for i in order
+    ]
+
+
+def compute_subject_analytics(matrix, rolls, names, buckets=DEFAULT_BUCKETS, top_n=DEFAULT_TOP_N):
+    """
+    Precompute chart aggregates per subject and per category.
+    
+    Per subject the histogram and quantiles are over raw marks (0..maxMarks)
+    and top-N is by marks. Per category every (student, paper) cell is pooled
+    as a percentage of its maximum, and top-N ranks students by their
+    combined percentage across the category's papers. A paper counts as
+    passed unless it is graded F or marked as a backlog.
+    """
+    m = matrix
+    fail_code = GRADE_ORDER.index(FAIL_GRADE)
+    passed = m.present & (m.grade_codes != fail_code) & ~m.backlog
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent = np.where(m.present & (m.max_marks > 0), m.obtained / m.max_marks * 100, np.nan)
+    
+    subjects = []
+    for col, (name, category) in enumerate(zip(m.subject_names, m.subject_categories)):
+        taken = m.present[:, col]
+        marks = m.obtained[taken, col]
+        max_marks = float(np.nanmax(m.max_marks[:, col])) if taken.any() else 0.0
+        histogram, quantiles = _distribution(marks, max_marks, buckets)
+        subjects.append({
+            "name": name,
+            "category": category,
+            "maxMarks": int(max_marks),
+            "students": int(taken.sum()),
+            "passRate": round(float(passed[:, col].sum() / taken.sum() * 100), 2) if taken.any() else None,
+            "mean": round(float(marks.mean()), 2) if marks.size else None,
+            "histogram": histogram,
+            "quantiles": quantiles,
+            "top": _top_n(m.obtained[:, col], rolls, names, top_n),
+        })
+    
+    categories = []
+    for category in dict.fromkeys(m.subject_categories):
+        cols = [c for c, cat in enumerate(m.subject_categories) if cat == category]
+        cells = percent[:, cols]
+        pooled = cells[~np.isnan(cells)]
+        taken = m.present[:, cols]
+        obtained = np.where(taken, m.obtained[:, cols], 0).sum(axis=1)
+        maximum = np.where(taken, m.max_marks[:, cols], 0).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            student_percent = np.where(maximum > 0, obtained / maximum * 100, np.nan)
+        histogram, quantiles = _distribution(pooled, 100.0, buckets)
+        categories.append({
+            "category": category,
+            "subjects": len(cols),
+            "papers": int(taken.sum()),
+            "passRate": round(float(passed[:, cols].sum() / taken.sum() * 100), 2) if taken.any() else None,
+            "meanPercent": round(float(pooled.mean()), 2) if pooled.size else None,
+            "histogram": histogram,
+            "quantiles": quantiles,
+            "top": _top_n(student_percent, rolls, names, top_n),
+        })
+    
+    return {
+        "version": 1,
+        "classSize": len(rolls),
+        "subjects": subjects,
+        "categories": categories,
+    }
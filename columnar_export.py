@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Columnar export of the whole results dataset for analysis.
+
+Writes two flat tables next to the nested JSON outputs:
+
+  subjects   one row per subject on every sheet: roll, semester, subject,
+             category, credits, max, internal, final, total, grade
+  students   one row per student and semester: roll, registration, name,
+             semester, session, sgpa, total_marks, max_total_marks,
+             percentage, class_rank, percentile_rank, backlog_count, remarks
+
+The default format is the Arrow IPC file format, written uncompressed so
+load_table() can memory-map it: columns are used in place, without
+parsing or copying, and loading the whole cohort takes milliseconds.
+Parquet is smaller and understood by more tools, but is decoded on load.
+Repeated strings (subject names, categories, grades, remarks) are
+dictionary-encoded and missing or unreadable marks are nulls.
+
+Needs the optional pyarrow package (pip install pyarrow).
+"""
+
+from pathlib import Path
+
+from combined_students import atomic_writer
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for --columnar output
+    pa = None
+
+
+COLUMNAR_FORMATS = ("arrow", "parquet")
+DEFAULT_COLUMNAR_FORMAT = "arrow"
+COLUMNAR_DIR_NAME = "columnar"
+DEFAULT_COLUMNAR_DIR = f"result/{COLUMNAR_DIR_NAME}"
+TABLE_NAMES = ("subjects", "students")
+
+
+def _number(value):
+    """Parsed marks/credits as a number, or None when missing or not numeric."""
+    return None if value is None or isinstance(value, str) else value
+
+
+def _strings(values):
+    return pa.array(values, type=pa.string()).dictionary_encode()
+
+
+def subjects_table(records, app_students):
+    """
+    One row per subject. records are the Student records and app_students
+    the matching app-format students from build_app_data; each record is
+    one semester's sheet, whose semester is taken from its app result.
+    """
+    columns = {name: [] for name in (
+        "roll", "semester", "subject", "category", "credits", "max", "internal", "final", "total", "grade"
+    )}
+    for record, student in zip(records, app_students):
+        semester = student["results"][0]["semester"]
+        for subject, app_subject in zip(record.subjects, student["results"][0]["subjects"]):
+            columns["roll"].append(record.roll_number)
+            columns["semester"].append(semester)
+            columns["subject"].append(subject.name)
+            columns["category"].append(app_subject["category"])
+            columns["credits"].append(_number(subject.credits))
+            columns["max"].append(_number(subject.total_marks))
+            columns["internal"].append(_number(subject.marks_internal))
+            columns["final"].append(_number(subject.marks_final))
+            columns["total"].append(_number(subject.marks_total))
+            columns["grade"].append(str(subject.grade))
+    
+    return pa.table({
+        "roll": pa.array(columns["roll"], type=pa.string()),
+        "semester": pa.array(columns["semester"], type=pa.int8()),
+        "subject": _strings(columns["subject"]),
+        "category": _strings(columns["category"]),
+        "credits": pa.array(columns["credits"], type=pa.float32()),
+        "max": pa.array(columns["max"], type=pa.int16()),
+        "internal": pa.array(columns["internal"], type=pa.int16()),
+        "final": pa.array(columns["final"], type=pa.int16()),
+        "total": pa.array(columns["total"], type=pa.int16()),
+        "grade": _strings(columns["grade"]),
+    })
+
+
+def students_table(app_students):
+    """One row per student and semester, from the app-format students."""
+    rows = [(student, result) for student in app_students for result in student["results"]]
+    
+    def column(get, type):
+        return pa.array([get(student, result) for student, result in rows], type=type)
+    
+    return pa.table({
+        "roll": column(lambda s, r: s["rollNumber"], pa.string()),
+        "registration": column(lambda s, r: s["regNumber"], pa.string()),
+        "name": column(lambda s, r: s["name"], pa.string()),
+        "semester": column(lambda s, r: r["semester"], pa.int8()),
+        "session": _strings([result["session"] for _, result in rows]),
+        "sgpa": column(lambda s, r: r["sgpa"], pa.float64()),
+        "total_marks": column(lambda s, r: r["totalMarks"], pa.int32()),
+        "max_total_marks": column(lambda s, r: r["maxTotalMarks"], pa.int32()),
+        "percentage": column(lambda s, r: r["percentage"], pa.float64()),
+        "class_rank": column(lambda s, r: r["classRank"], pa.int32()),
+        "percentile_rank": column(lambda s, r: r["percentileRank"], pa.float64()),
+        "backlog_count": column(lambda s, r: r["backlogCount"], pa.int16()),
+        "remarks": _strings([result["remarks"] for _, result in rows]),
+    })
+
+
+def columnar_files(output_dir=DEFAULT_COLUMNAR_DIR, fmt=DEFAULT_COLUMNAR_FORMAT):
+    """{table name: path} of the files write_columnar writes."""
+    return {name: Path(output_dir) / f"{name}.{fmt}" for name in TABLE_NAMES}
+
+
+def write_table(table, path, fmt=DEFAULT_COLUMNAR_FORMAT):
+    """Write one table atomically as an Arrow IPC file or Parquet."""
+    with atomic_writer(path, binary=True) as f:
+        if fmt == "parquet":
+            pq.write_table(table, f)
+        else:
+            with pa.ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+
+
+def write_columnar(records, app_students, output_dir=DEFAULT_COLUMNAR_DIR, fmt=DEFAULT_COLUMNAR_FORMAT):
+    """
+    Write the subjects and students tables for records (Student records)
+    and their app-format students. Returns the paths written.
+    """
+    if pa is None:
+        raise RuntimeError("Columnar export needs pyarrow (pip install pyarrow)")
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format '{fmt}' (choose from {', '.join(COLUMNAR_FORMATS)})")
+    
+    tables = {"subjects": subjects_table(records, app_students), "students": students_table(app_students)}
+    paths = columnar_files(output_dir, fmt)
+    for name, table in tables.items():
+        write_table(table, paths[name], fmt)
+        print(f"✓ Generated {paths[name]} ({table.num_rows:,} rows, {paths[name].stat().st_size:,} bytes)")
+    return list(paths.values())
+
+
+def load_table(path):
+    """
+    Load a table written by write_columnar. Arrow files are memory-mapped,
+    so the columns reference the file's pages instead of being copied.
+    """
+    if pa is None:
+        raise RuntimeError("Columnar export needs pyarrow (pip install pyarrow)")
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return pq.read_table(path, memory_map=True)
+    return pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+
+
+def add_columnar_arguments(parser):
+    """Register the --columnar / --columnar-dir switches on an argparse parser."""
+    parser.add_argument(
+        '--columnar',
+        nargs='?',
+        const=DEFAULT_COLUMNAR_FORMAT,
+        choices=COLUMNAR_FORMATS,
+        default=None,
+        help=f'Also write flat subjects/students tables for analysis, as memory-mappable '
+             f'Arrow IPC files or Parquet (default format: {DEFAULT_COLUMNAR_FORMAT}; needs pyarrow)'
+    )
+    parser.add_argument(
+        '--columnar-dir',
+        default=None,
+        help=f'Output directory for the columnar tables (default: <result dir>/{COLUMNAR_DIR_NAME})'
+    )
+
+
+def validate_columnar_argument(parser, args):
+    """Exit with a usage error if --columnar was given but pyarrow is missing."""
+    if args.columnar and pa is None:
+        parser.error("--columnar needs pyarrow (pip install pyarrow)")
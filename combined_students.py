@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Incremental maintenance of result/all_students.json.
+
+The combined file is kept in the same indent=2 layout json.dump produces,
+but each student is stored as its own pre-serialized text fragment so an
+update only re-serializes the students that changed. Writes go to a temp
+file that is renamed over the original, so a crash can never leave a
+truncated all_students.json behind.
+
+Per-roll source files (result/<roll>.json) are tracked by mtime, size and
+SHA-256 in result/.cache/all_students.state.json so an incremental rebuild
+only re-reads the files that actually changed.
+
+write_json_array / write_json_lines stream records to disk one at a time
+(a full rewrite never holds the cohort in memory) and iter_records reads
+either layout back the same way.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from records import Student
+
+
+COMBINED_FILE_NAME = "all_students.json"
+STATE_FILE_NAME = "all_students.state.json"
+CACHE_DIR_NAME = ".cache"
+
+# JSON files in result/ that are not per-roll subject lists. Anything else
+# written to result/ (e.g. convert_to_app_format.COHORT_STATS_FILE) must be
+# listed here, or rebuilds will take it for a student
+NON_STUDENT_FILES = {"all_students", "students_app_format", "cohort_stats"}
+
+_ELEMENT_START = "  {"
+_ELEMENT_END = ("  }", "  },")
+_ROLL_PREFIX = '    "roll_number": '
+
+
+def _replacement_mode(path):
+    """
+    Permission bits for a file about to replace path: the existing file's,
+    or what open() would give a new file under the current umask.
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextlib.contextmanager
+def atomic_writer(path, binary=False):
+    """
+    Open a temp file in path's directory for writing (text, or bytes with
+    binary=True); it is fsynced and renamed over path when the block exits
+    normally, and removed otherwise. The result keeps path's permissions
+    (mkstemp's temp files are private to the owner).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            yield f
+            f.flush()
+            os.fchmod(f.fileno(), _replacement_mode(path))
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write_text(path, text):
+    """Write text to path via a temp file in the same directory plus rename."""
+    with atomic_writer(path) as f:
+        f.write(text)
+
+
+def write_text_if_changed(path, text):
+    """
+    Atomically write text unless the file already holds exactly that text.
+    Leaving unchanged files alone keeps their mtimes stable for change
+    tracking. Returns True if the file was written.
+    """
+    path = Path(path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except FileNotFoundError:
+        pass
+    atomic_write_text(path, text)
+    return True
+
+
+def atomic_write_json(path, data, **dump_kwargs):
+    """json.dump to path atomically."""
+    atomic_write_text(path, json.dumps(data, **dump_kwargs))
+
+
+def student_json_files(result_dir):
+    """Return the per-roll result/<roll>.json files, sorted by name."""
+    return sorted(
+        f for f in Path(result_dir).glob("*.json")
+        if f.stem not in NON_STUDENT_FILES
+    )
+
+
+def file_stamp(path, with_hash=False):
+    """Return a dict describing a file's current version."""
+    stat = os.stat(path)
+    stamp = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    if with_hash:
+        with open(path, 'rb') as f:
+            stamp["sha256"] = hashlib.sha256(f.read()).hexdigest()
+    return stamp
+
+
+def format_fragment(record):
+    """Serialize one student exactly as it appears inside the indent=2 array."""
+    text = json.dumps(record, indent=2, ensure_ascii=False)
+    return "\n".join("  " + line for line in text.split("\n"))
+
+
+def split_fragments(text):
+    """
+    Split an indent=2 all_students.json into {roll: fragment} without
+    decoding the student records. JSON strings cannot contain raw newlines,
+    so every line that is exactly "  {" / "  }" delimits a top-level element.
+    Returns None if the text is not in that layout.
+    """
+    if text.strip() == "[]":
+        return {}
+    
+    lines = text.rstrip("\n").split("\n")
+    if len(lines) < 2 or lines[0] != "[" or lines[-1] != "]":
+        return None
+    
+    fragments = {}
+    start = None
+    roll = None
+    for idx in range(1, len(lines) - 1):
+        line = lines[idx]
+        if start is None:
+            if line != _ELEMENT_START:
+                return None
+            start = idx
+            roll = None
+        elif line in _ELEMENT_END:
+            if roll is None:
+                return None
+            fragments[roll] = "\n".join(lines[start:idx] + ["  }"])
+            start = None
+        elif roll is None and line.startswith(_ROLL_PREFIX):
+            roll = json.loads(line[len(_ROLL_PREFIX):].rstrip(","))
+    
+    return fragments if start is None else None
+
+
+def join_fragments(fragments):
+    """Assemble fragments (already in output order) into the array text."""
+    if not fragments:
+        return "[]"
+    return "[\n" + ",\n".join(fragments) + "\n]"
+
+
+def write_json_array(path, records):
+    """
+    Atomically write records as an indent=2 JSON array, byte-identical to
+    json.dump(records, f, indent=2, ensure_ascii=False), serializing one
+    record at a time. Returns the number of records written.
+    """
+    count = 0
+    with atomic_writer(path) as f:
+        for record in records:
+            f.write(("[\n" if count == 0 else ",\n") + format_fragment(record))
+            count += 1
+        f.write("\n]" if count else "[]")
+    return count
+
+
+def write_json_lines(path, records):
+    """Atomically write records as JSON lines (one object per line). Returns the count."""
+    count = 0
+    with atomic_writer(path) as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def write_records(path, records):
+    """Stream records to path as JSON lines for .jsonl files, else as a JSON array."""
+    if Path(path).suffix == ".jsonl":
+        return write_json_lines(path, records)
+    return write_json_array(path, records)
+
+
+def iter_records(path):
+    """
+    Yield the records of a JSON lines file or a JSON array one at a time.
+    Arrays in the indent=2 layout written above are read line by line;
+    any other array is loaded with json.load.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if Path(path).suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        
+        first = f.readline().rstrip("\n")
+        if first.strip() == "[]":
+            return
+        if first == "[":
+            element = []
+            yielded = False
+            for line in f:
+                line = line.rstrip("\n")
+                if not element:
+                    if line == "]":
+                        return
+                    if line != _ELEMENT_START:
+                        break
+                element.append(line)
+                if line in _ELEMENT_END:
+                    element[-1] = "  }"
+                    yield json.loads("\n".join(element))
+                    yielded = True
+                    element = []
+            if yielded:
+                raise ValueError(f"{path} is truncated or not in the indent=2 array layout")
+        
+        # Not in the fragment layout: decode the whole document
+        f.seek(0)
+        records = json.load(f)
+    yield from records
+
+
+def write_combined(result_dir, records):
+    """
+    Replace all_students.json with records (already in roll order),
+    streaming them to disk. Equivalent to CombinedStudents.clear() +
+    upserts + save(force=True) without holding the cohort in memory.
+    Returns the number of students written.
+    """
+    result_path = Path(result_dir)
+    path = result_path / COMBINED_FILE_NAME
+    count = write_json_array(path, records)
+    
+    # clear() forgets every source stamp; keep the state file consistent
+    state_path = result_path / CACHE_DIR_NAME / STATE_FILE_NAME
+    if state_path.exists():
+        atomic_write_json(state_path, {"combined": file_stamp(path), "sources": {}}, indent=2)
+    return count
+
+
+class CombinedStudents:
+    """
+    all_students.json held as roll-ordered text fragments.
+    
+    Records are decoded only on demand and re-serialized only when upserted;
+    save() rewrites the file atomically if anything changed.
+    """
+    
+    def __init__(self, result_dir="result"):
+        self.result_path = Path(result_dir)
+        self.path = self.result_path / COMBINED_FILE_NAME
+        self.state_path = self.result_path / CACHE_DIR_NAME / STATE_FILE_NAME
+        self.fragments = {}
+        self.sources = {}
+        self.upserted = set()
+        self.removed = set()
+        self._state_current = False
+        self._needs_rewrite = False
+        self._load()
+    
+    def _load(self):
+        if not self.path.exists():
+            return
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        
+        fragments = split_fragments(text)
+        if fragments is None:
+            # Hand-edited or differently formatted file: normalise it once
+            fragments = {
+                record["roll_number"]: format_fragment(record)
+                for record in json.loads(text)
+            }
+            self._needs_rewrite = True
+        self.fragments = fragments
+        
+        if self.state_path.exists():
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return
+            self._state_current = state.get("combined") == file_stamp(self.path)
+            if self._state_current:
+                self.sources = state.get("sources", {})
+    
+    @property
+    def state_is_current(self):
+        """True if the recorded source stamps describe the current file."""
+        return self._state_current
+    
+    @property
+    def dirty(self):
+        return bool(self.upserted or self.removed)
+    
+    def __contains__(self, roll_number):
+        return roll_number in self.fragments
+    
+    def __len__(self):
+        return len(self.fragments)
+    
+    def rolls(self):
+        return sorted(self.fragments)
+    
+    def get(self, roll_number):
+        """Decode and return one student record, or None."""
+        fragment = self.fragments.get(roll_number)
+        return json.loads(fragment) if fragment is not None else None
+    
+    def records(self):
+        """Decode every student record in roll order."""
+        return [json.loads(self.fragments[roll]) for roll in self.rolls()]
+    
+    def students(self):
+        """Decode every student in roll order as Student records."""
+        return [Student.from_dict(json.loads(self.fragments[roll])) for roll in self.rolls()]
+    
+    def upsert(self, record):
+        """Insert or replace a student; returns True if the stored text changed."""
+        roll_number = record["roll_number"]
+        fragment = format_fragment(record)
+        if self.fragments.get(roll_number) == fragment:
+            return False
+        self.fragments[roll_number] = fragment
+        self.upserted.add(roll_number)
+        self.removed.discard(roll_number)
+        return True
+    
+    def remove(self, roll_number):
+        if self.fragments.pop(roll_number, None) is not None:
+            self.removed.add(roll_number)
+            self.upserted.discard(roll_number)
+        self.sources.pop(roll_number, None)
+    
+    def clear(self):
+        for roll_number in list(self.fragments):
+            self.remove(roll_number)
+        self.sources = {}
+    
+    def source_changed(self, json_file):
+        """
+        Compare a per-roll source file with its recorded stamp. A cheap
+        mtime/size match counts as unchanged; otherwise the content hash
+        decides. The stamp is refreshed either way.
+        """
+        roll_number = Path(json_file).stem
+        recorded = self.sources.get(roll_number)
+        stamp = file_stamp(json_file)
+        if recorded and all(recorded.get(k) == v for k, v in stamp.items()):
+            return False
+        stamp = file_stamp(json_file, with_hash=True)
+        self.sources[roll_number] = stamp
+        return not recorded or recorded.get("sha256") != stamp["sha256"]
+    
+    def forget_source(self, roll_number):
+        """
+        Drop a source's recorded stamp, so the next incremental run re-reads
+        it even if it has not changed (e.g. after it failed to load).
+        """
+        self.sources.pop(roll_number, None)
+    
+    def save(self, force=False):
+        """Write all_students.json atomically if it changed. Returns True if written."""
+        if self.dirty or force or self._needs_rewrite or not self.path.exists():
+            text = join_fragments([self.fragments[roll] for roll in self.rolls()])
+            atomic_write_text(self.path, text)
+            self._needs_rewrite = False
+            written = True
+        else:
+            written = False
+        
+        self._write_state()
+        self.upserted.clear()
+        self.removed.clear()
+        return written
+    
+    def _write_state(self):
+        if not self.sources and not self.state_path.exists():
+            return
+        state = {"combined": file_stamp(self.path), "sources": self.sources}
+        atomic_write_json(self.state_path, state, indent=2)
+        self._state_current = True
@@ -1,5 +1,26 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { ResponsiveContainer, LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, BarChart, Bar, Legend, RadarChart, PolarGrid, PolarAngleAxis, PolarRadiusAxis, Radar } from 'recharts';
+import { Subject } from '../types';
+import { SubjectStats, findSubjectAggregate, loadSubjectStats } from '../services/subjectStats';
+
+// Class-wide aggregates precomputed by convert_to_app_format.py; null until
+// loaded (or if public/data/subject_stats.json is missing), in which case
+// the charts show the student alone
+const useSubjectStats = (): SubjectStats | null => {
+    const [stats, setStats] = useState<SubjectStats | null>(null);
+    useEffect(() => {
+        let active = true;
+        loadSubjectStats()
+            .then(loaded => { if (active) setStats(loaded); })
+            .catch(error => console.warn('Subject stats unavailable:', error));
+        return () => { active = false; };
+    }, []);
+    return stats;
+};
+
+const percentOf = (marks: number | null | undefined, maxMarks: number): number | null => {
+    return marks == null || !maxMarks ? null : Math.round((marks / maxMarks) * 1000) / 10;
+};
 
 export const PerformanceTrendChart = ({ data }: { data: any[] }) => {
     return (
@@ -20,10 +41,16 @@ export const PerformanceTrendChart = ({ data }: { data: any[] }) => {
     );
 };
 
-export const SubjectMarksChart = ({ data }: { data: any[] }) => {
+export const SubjectMarksChart = ({ data }: { data: Subject[] }) => {
+    const stats = useSubjectStats();
+    const chartData = data.map(sub => ({
+        ...sub,
+        classMean: stats ? findSubjectAggregate(stats, sub)?.mean ?? null : null,
+    }));
+
     return (
         <ResponsiveContainer width="100%" height={300}>
-            <BarChart data={data}>
+            <BarChart data={chartData}>
                 <CartesianGrid strokeDasharray="3 3" stroke="rgba(255,255,255,0.1)" />
                 <XAxis dataKey="code" stroke="rgba(255,255,255,0.5)" />
                 <YAxis domain={[0, 100]} stroke="rgba(255,255,255,0.5)" />
@@ -32,17 +59,21 @@ export const SubjectMarksChart = ({ data }: { data: any[] }) => {
                      itemStyle={{ color: '#fff' }}
                 />
                 <Bar dataKey="obtainedMarks" fill="#6366f1" radius={[4, 4, 0, 0]} name="Obtained Marks" />
+                {stats && <Bar dataKey="classMean" fill="#82ca9d" radius={[4, 4, 0, 0]} name="Class Average" />}
                 <Bar dataKey="maxMarks" fill="rgba(255,255,255,0.1)" radius={[4, 4, 0, 0]} name="Max Marks" />
             </BarChart>
         </ResponsiveContainer>
     );
 };
 
-export const SkillsRadarChart = ({ data }: { data: any[] }) => {
-    // Transform subject data to mock "skills" or just map subjects to axes
+export const SkillsRadarChart = ({ data }: { data: Subject[] }) => {
+    const stats = useSubjectStats();
+    // One axis per subject, as a percentage of its max marks so papers of
+    // different weight share the scale
     const radarData = data.slice(0, 6).map(sub => ({
         subject: sub.name.split(' ')[0], // First word for brevity
-        A: sub.obtainedMarks,
+        A: percentOf(sub.obtainedMarks, sub.maxMarks),
+        B: stats ? percentOf(findSubjectAggregate(stats, sub)?.mean, sub.maxMarks) : null,
         fullMark: 100,
     }));
 
@@ -53,6 +84,8 @@ export const SkillsRadarChart = ({ data }: { data: any[] }) => {
                 <PolarAngleAxis dataKey="subject" stroke="rgba(255,255,255,0.6)" />
                 <PolarRadiusAxis angle={30} domain={[0, 100]} stroke="rgba(255,255,255,0.2)" />
                 <Radar name="Student" dataKey="A" stroke="#8884d8" fill="#8884d8" fillOpacity={0.6} />
+                {stats && <Radar name="Class Average" dataKey="B" stroke="#82ca9d" fill="#82ca9d" fillOpacity={0.3} />}
+                {stats && <Legend />}
             </RadarChart>
         </ResponsiveContainer>
     );
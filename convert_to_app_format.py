@@ -3,45 +3,77 @@
 Convert extracted PDF data to TypeScript format compatible with the application.
 """
 
+import argparse
+import gzip
+import hashlib
 import json
 from pathlib import Path
 
+from columnar_export import (COLUMNAR_DIR_NAME, add_columnar_arguments, validate_columnar_argument,
+                             write_columnar)
+from cohort_stats import GRADE_POINTS, CohortMatrix, compute_cohort_stats, compute_subject_analytics
+from combined_students import atomic_writer, iter_records, write_text_if_changed
+from records import Student
+from run_report import RunReport, add_report_arguments, instrumented_run
+from search_index import SEARCH_INDEX_FILE, write_search_index
+
+try:
+    import brotli
+except ImportError:  # optional: only needed for .br output in --compact mode
+    brotli = None
+
+
+DEFAULT_RESULT_DIR = "result"
+# The app build reads these relative to its root (the repository root)
+TYPESCRIPT_FILE = "generatedData.ts"
+SUBJECT_STATS_FILE = "public/data/subject_stats.json"
+# Default location for sharded output; Vite copies public/ into the build
+DEFAULT_SHARD_DIR = "public/data/students"
+# Written next to the per-roll JSON files, in the result directory
+APP_FORMAT_FILE_NAME = "students_app_format.json"
+COHORT_STATS_FILE_NAME = "cohort_stats.json"
+APP_FORMAT_FILE = f"{DEFAULT_RESULT_DIR}/{APP_FORMAT_FILE_NAME}"
+COHORT_STATS_FILE = f"{DEFAULT_RESULT_DIR}/{COHORT_STATS_FILE_NAME}"
+DEFAULT_SHARD_SIZE = 50
+SHARD_INDEX_FILE = "index.json"
+SHARD_PREFIX = "students-"
+
+# Fields that are normally identical for a whole cohort; --compact hoists them
+# into a shared header when every student agrees on the value
+COHORT_STUDENT_FIELDS = ("course", "contact", "currentSemester")
+COHORT_RESULT_FIELDS = ("semester", "session", "publishedDate", "classSize")
+COMPACT_SEPARATORS = (',', ':')
+
 
 def convert_subject_to_app_format(subject):
     """
-    Convert extracted subject data to application format.
-    
-    Extracted format has:
-    - subject_name, credits, total_marks, marks_internal, marks_final, marks_total, grade, category
+    Convert an extracted Subject to application format.
     
     App format needs:
     - name, category, maxMarks, obtainedMarks, credits, grade, isBacklog
+    
+    The marks and credits were parsed once when the Subject was built.
     """
-    return {
-        "name": subject["subject_name"],
-        "category": subject["category"].title(),  # "THEORY" -> "Theory"
-        "maxMarks": int(subject["total_marks"]) if subject["total_marks"] else 0,
-        "obtainedMarks": int(subject["marks_total"]) if subject["marks_total"] else 0,
-        "credits": float(subject["credits"]) if subject["credits"] else 0.0,
-        "grade": subject["grade"],
-        "isBacklog": False  # Default to False, can be updated based on grade or pass marks
-    }
+    return subject.to_app_dict()
 
 
-def load_all_students_data():
-    """Load the all_students.json file"""
-    data_file = Path("result/all_students.json")
+def load_all_students_data(result_dir=DEFAULT_RESULT_DIR):
+    """Load result_dir/all_students.json as Student records"""
+    data_file = Path(result_dir) / "all_students.json"
     
     if not data_file.exists():
         print(f"Error: {data_file} not found")
         return []
     
-    with open(data_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return [Student.from_dict(record) for record in iter_records(data_file)]
 
 
 def calculate_semester_stats(subjects):
-    """Calculate SGPA, total marks, etc. from subjects"""
+    """
+    Calculate SGPA, total marks, etc. from one student's subjects.
+    The build uses compute_cohort_stats, which does this for the whole
+    cohort at once and adds class rank and percentile rank.
+    """
     total_marks = sum(s["obtainedMarks"] for s in subjects)
     max_total_marks = sum(s["maxMarks"] for s in subjects)
     
@@ -49,13 +81,8 @@ def calculate_semester_stats(subjects):
     total_grade_points = 0
     total_credits = 0
     
-    grade_map = {
-        "A+": 10, "A": 9, "B+": 8, "B": 7, 
-        "C": 6, "D": 5, "E": 4, "F": 0
-    }
-    
     for s in subjects:
-        grade_point = grade_map.get(s["grade"], 0)
+        grade_point = GRADE_POINTS.get(s["grade"], 0)
         credits = s["credits"]
         total_grade_points += grade_point * credits
         total_credits += credits
@@ -87,22 +114,35 @@ def calculate_semester_stats(subjects):
     }
 
 
-def generate_typescript_data():
-    """Generate TypeScript-compatible data"""
-    students_data = load_all_students_data()
+def build_app_data(students_data):
+    """
+    Convert extracted Student records to app format.
+    Returns (students, cohort, subject_stats) where cohort is the class-wide
+    summary from compute_cohort_stats and subject_stats the chart aggregates
+    from compute_subject_analytics.
+    """
+    # Convert subjects to app format
+    subject_lists = [
+        [convert_subject_to_app_format(s) for s in student_data.subjects]
+        for student_data in students_data
+    ]
+    
+    # Calculate stats for the whole cohort in one pass
+    matrix = CohortMatrix(subject_lists)
+    per_student_stats, cohort = compute_cohort_stats(subject_lists, matrix=matrix)
+    subject_stats = compute_subject_analytics(
+        matrix,
+        [s.roll_number for s in students_data],
+        [s.name for s in students_data]
+    )
     
     ts_students = []
     
-    for idx, student_data in enumerate(students_data, 1):
-        roll_number = student_data["roll_number"]
-        name = student_data["name"]
-        reg_number = student_data["registration_number"]
-        
-        # Convert subjects to app format
-        subjects = [convert_subject_to_app_format(s) for s in student_data["subjects"]]
-        
-        # Calculate stats
-        stats = calculate_semester_stats(subjects)
+    for idx, (student_data, subjects, stats) in enumerate(
+            zip(students_data, subject_lists, per_student_stats), 1):
+        roll_number = student_data.roll_number
+        name = student_data.name
+        reg_number = student_data.registration_number
         
         # Create student object in app format
         student = {
@@ -126,49 +166,445 @@ def generate_typescript_data():
                     "remarks": stats["remarks"],
                     "backlogCount": stats["backlogCount"],
                     "publishedDate": "10/06/2025",
-                    "percentile": stats["percentile"]
+                    # Historical name: this is the marks percentage, kept for
+                    # existing consumers. The cohort-relative figure is percentileRank.
+                    "percentile": stats["percentage"],
+                    "percentage": stats["percentage"],
+                    "classRank": stats["classRank"],
+                    "classSize": cohort["classSize"],
+                    "percentileRank": stats["percentileRank"]
                 }
             ]
         }
         
         ts_students.append(student)
     
+    return ts_students, cohort, subject_stats
+
+
+def generate_typescript_data(report=None, result_dir=DEFAULT_RESULT_DIR):
+    """Generate TypeScript-compatible data"""
+    report = report or RunReport("convert_to_app_format")
+    with report.stage("load"):
+        students_data = load_all_students_data(result_dir)
+    with report.stage("build"):
+        ts_students, _, _ = build_app_data(students_data)
     return ts_students
 
 
-def write_typescript_file(students):
-    """Write the students data to a TypeScript file"""
-    output_file = Path("generatedData.ts")
+def write_cohort_stats(cohort, output_file=COHORT_STATS_FILE):
+    """Write the class-wide statistics summary."""
+    output_path = Path(output_file)
+    with atomic_writer(output_path) as f:
+        json.dump(cohort, f, indent=2, ensure_ascii=False)
     
-    # Convert to JSON first
-    json_str = json.dumps(students, indent=2)
+    print(f"✓ Generated {output_path} (class size {cohort['classSize']}, "
+          f"{len(cohort['subjects'])} subjects)")
+
+
+def write_subject_stats(subject_stats, output_file=SUBJECT_STATS_FILE, compact=False):
+    """
+    Write the precomputed chart aggregates. The file is served statically
+    next to the app, so it is always minified.
+    """
+    output_path = Path(output_file)
+    with atomic_writer(output_path) as f:
+        json.dump(subject_stats, f, separators=COMPACT_SEPARATORS, ensure_ascii=False)
+    if compact:
+        write_precompressed(output_path)
+    else:
+        remove_precompressed(output_path)
     
-    # Create TypeScript content
-    ts_content = f"""// Auto-generated from PDF data - DO NOT EDIT MANUALLY
+    print(f"✓ Generated {output_path} ({output_path.stat().st_size:,} bytes, "
+          f"{len(subject_stats['subjects'])} subjects)")
+
+
+def hoist_cohort_constants(students):
+    """
+    Move fields that have the same value for every student (and every
+    semester result) into a shared header.
+    
+    Returns (header, stripped_students) where header is
+    {"student": {...}, "result": {...}}. expand_cohort_constants reverses it.
+    """
+    header = {"student": {}, "result": {}}
+    if not students:
+        return header, students
+    
+    results = [r for s in students for r in s["results"]]
+    for key, records, fields in (("student", students, COHORT_STUDENT_FIELDS),
+                                 ("result", results, COHORT_RESULT_FIELDS)):
+        for field in fields:
+            if records and all(field in r for r in records) and len({r[field] for r in records}) == 1:
+                header[key][field] = records[0][field]
+    
+    stripped = []
+    for student in students:
+        compact = {k: v for k, v in student.items() if k not in header["student"]}
+        compact["results"] = [
+            {k: v for k, v in result.items() if k not in header["result"]}
+            for result in student["results"]
+        ]
+        stripped.append(compact)
+    
+    return header, stripped
+
+
+def expand_cohort_constants(header, students):
+    """Inverse of hoist_cohort_constants."""
+    return [
+        {
+            **header["student"],
+            **student,
+            "results": [{**header["result"], **result} for result in student["results"]]
+        }
+        for student in students
+    ]
+
+
+def write_precompressed(path):
+    """
+    Write .gz (and .br when the brotli module is installed) siblings next to
+    a file so a static host can serve precompressed bytes.
+    Returns the paths that were written.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    written = []
+    
+    gz_path = path.with_name(path.name + ".gz")
+    with atomic_writer(gz_path, binary=True) as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    written.append(gz_path)
+    
+    br_path = path.with_name(path.name + ".br")
+    if brotli is not None:
+        with atomic_writer(br_path, binary=True) as f:
+            f.write(brotli.compress(data, quality=11))
+        written.append(br_path)
+    elif br_path.exists():
+        # Never leave a .br behind that no longer matches its source
+        br_path.unlink()
+    
+    return written
+
+
+def _has_precompressed(path):
+    """True if path has every precompressed sibling write_precompressed would write."""
+    path = Path(path)
+    suffixes = (".gz", ".br") if brotli is not None else (".gz",)
+    return all(path.with_name(path.name + suffix).exists() for suffix in suffixes)
+
+
+def remove_precompressed(path):
+    """Delete stale .gz/.br siblings of a file, if any."""
+    path = Path(path)
+    for suffix in (".gz", ".br"):
+        sibling = path.with_name(path.name + suffix)
+        if sibling.exists():
+            sibling.unlink()
+
+
+def write_typescript_file(students, compact=False, output_file=TYPESCRIPT_FILE, json_file=APP_FORMAT_FILE):
+    """
+    Write the students data to a TypeScript file, and as plain JSON to
+    json_file.
+    
+    With compact=True the JSON is minified and cohort-wide constants are
+    stored once in a header that is spread back into each student at load.
+    """
+    output_file = Path(output_file)
+    
+    if compact:
+        header, stripped = hoist_cohort_constants(students)
+        header_str = json.dumps(header, separators=COMPACT_SEPARATORS)
+        json_str = json.dumps(stripped, separators=COMPACT_SEPARATORS)
+        ts_content = f"""// Auto-generated from PDF data - DO NOT EDIT MANUALLY
+import {{ Student }} from './types';
+
+const COHORT = {header_str};
+const STUDENTS: any[] = {json_str};
+
+export const GENERATED_STUDENTS: Student[] = STUDENTS.map(s => ({{
+  ...COHORT.student,
+  ...s,
+  results: s.results.map((r: any) => ({{ ...COHORT.result, ...r }})),
+}}));
+"""
+    else:
+        # Convert to JSON first
+        json_str = json.dumps(students, indent=2)
+        
+        # Create TypeScript content
+        ts_content = f"""// Auto-generated from PDF data - DO NOT EDIT MANUALLY
 import {{ Student }} from './types';
 
 export const GENERATED_STUDENTS: Student[] = {json_str};
 """
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
+
+    with atomic_writer(output_file) as f:
         f.write(ts_content)
     
-    print(f"✓ Generated {output_file} with {len(students)} students")
+    print(f"✓ Generated {output_file} with {len(students)} students ({len(ts_content.encode('utf-8')):,} bytes)")
     
     # Also write as plain JSON for easier debugging
-    json_file = Path("result/students_app_format.json")
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(students, f, indent=2)
+    json_file = Path(json_file)
+    with atomic_writer(json_file) as f:
+        if compact:
+            json.dump(students, f, separators=COMPACT_SEPARATORS)
+        else:
+            json.dump(students, f, indent=2)
     
     print(f"✓ Generated {json_file} for debugging")
 
 
-if __name__ == "__main__":
+def plan_shards(students, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Split students into consecutive roll-number ranges of at most
+    shard_size students each. Returns a list of student lists.
+    """
+    ordered = sorted(students, key=lambda s: s["rollNumber"])
+    shard_size = max(1, shard_size)
+    return [ordered[i:i + shard_size] for i in range(0, len(ordered), shard_size)]
+
+
+def write_sharded_data(students, output_dir=DEFAULT_SHARD_DIR, shard_size=DEFAULT_SHARD_SIZE,
+                       compact=False):
+    """
+    Write students as roll-range JSON shards plus a compact index.
+    
+    Shard files are named by a hash of their content so they can be cached
+    forever. index.json keeps a fixed name, maps every roll number to its
+    shard, and should be served with a short cache lifetime. Shards left
+    over from a previous build are removed.
+    
+    With compact=True cohort-wide constants are stored once in the index
+    under "cohort" instead of in every student, and every file gets .gz/.br
+    precompressed siblings.
+    
+    Index format:
+    {
+        "version": 1,
+        "shards": [{"file": "students-<hash>.json", "first": "...", "last": "...", "count": N}],
+        "rolls": {"211271524001": 0, ...},
+        "cohort": {"student": {...}, "result": {...}}   (compact only)
+    }
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    
+    if compact:
+        header, students = hoist_cohort_constants(students)
+    
+    shards = []
+    rolls = {}
+    
+    for shard_idx, shard_students in enumerate(plan_shards(students, shard_size)):
+        payload = json.dumps(shard_students, separators=COMPACT_SEPARATORS, ensure_ascii=False)
+        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+        file_name = f"{SHARD_PREFIX}{digest}.json"
+        
+        # Shards are named by content: an existing file (and its compressed
+        # siblings) is already up to date, so only changed ranges are written.
+        # Writes are atomic, so an existing name is never a truncated shard
+        shard_file = output_path / file_name
+        is_new = not shard_file.exists()
+        if is_new:
+            with atomic_writer(shard_file) as f:
+                f.write(payload)
+        if compact and (is_new or not _has_precompressed(shard_file)):
+            write_precompressed(shard_file)
+        
+        shards.append({
+            "file": file_name,
+            "first": shard_students[0]["rollNumber"],
+            "last": shard_students[-1]["rollNumber"],
+            "count": len(shard_students)
+        })
+        for student in shard_students:
+            rolls[student["rollNumber"]] = shard_idx
+    
+    index = {"version": 1, "shards": shards, "rolls": rolls}
+    if compact:
+        index["cohort"] = header
+    index_file = output_path / SHARD_INDEX_FILE
+    index_changed = write_text_if_changed(index_file, json.dumps(index, separators=COMPACT_SEPARATORS))
+    if not compact:
+        remove_precompressed(index_file)
+    elif index_changed or not _has_precompressed(index_file):
+        write_precompressed(index_file)
+    
+    # Drop shards (and their compressed siblings) from earlier builds
+    live_files = {shard["file"] for shard in shards}
+    for stale in output_path.glob(f"{SHARD_PREFIX}*"):
+        if stale.name.split(".json")[0] + ".json" not in live_files:
+            stale.unlink()
+    
+    total_bytes = sum(f.stat().st_size for f in output_path.glob("*.json"))
+    print(f"✓ Generated {len(shards)} shards for {len(rolls)} students in {output_path} ({total_bytes:,} bytes)")
+    if compact:
+        gz_bytes = sum(f.stat().st_size for f in output_path.glob("*.json.gz"))
+        summary = f"✓ Precompressed: {gz_bytes:,} bytes gzip"
+        if brotli is not None:
+            br_bytes = sum(f.stat().st_size for f in output_path.glob("*.json.br"))
+            summary += f", {br_bytes:,} bytes brotli"
+        else:
+            summary += " (install 'brotli' for .br output)"
+        print(summary)
+    
+    return index
+
+
+def resolve_app_dir(result_dir=DEFAULT_RESULT_DIR, app_dir=None):
+    """
+    The directory the app files (generatedData.ts, its search index and
+    public/data/) are written under. By default that is the repository
+    root for the default result directory and the result directory itself
+    for any other one, so converting a side batch cannot overwrite the
+    data the app is built from.
+    """
+    if app_dir is not None:
+        return Path(app_dir)
+    if Path(result_dir).resolve() == Path(DEFAULT_RESULT_DIR).resolve():
+        return Path(".")
+    return Path(result_dir)
+
+
+def app_output_paths(result_dir=DEFAULT_RESULT_DIR, app_dir=None, shard_dir=None):
+    """
+    {role: path} for every file write_app_outputs writes; shard_dir
+    defaults to public/data/students under the app directory.
+    """
+    app_path = resolve_app_dir(result_dir, app_dir)
+    result_path = Path(result_dir)
+    return {
+        "typescript": app_path / TYPESCRIPT_FILE,
+        "app_format": result_path / APP_FORMAT_FILE_NAME,
+        "search_index": app_path / SEARCH_INDEX_FILE,
+        "shard_dir": app_path / DEFAULT_SHARD_DIR if shard_dir is None else Path(shard_dir),
+        "cohort_stats": result_path / COHORT_STATS_FILE_NAME,
+        "subject_stats": app_path / SUBJECT_STATS_FILE,
+    }
+
+
+def write_app_outputs(students, cohort, subject_stats, sharded=False, shard_dir=None,
+                      shard_size=DEFAULT_SHARD_SIZE, compact=False, result_dir=DEFAULT_RESULT_DIR, app_dir=None):
+    """
+    Write everything built by build_app_data: generatedData.ts and its
+    search index, the shards when sharded, and the cohort and subject
+    statistics, to the paths given by app_output_paths. generatedData.ts
+    is written in sharded mode too, since the pages import it; the shards
+    are for code that opts in to services/studentShards.ts.
+    """
+    paths = app_output_paths(result_dir, app_dir, shard_dir)
+    write_typescript_file(students, compact, paths["typescript"], paths["app_format"])
+    write_search_index(students, paths["search_index"])
+    if sharded:
+        write_sharded_data(students, paths["shard_dir"], shard_size, compact=compact)
+    write_cohort_stats(cohort, paths["cohort_stats"])
+    write_subject_stats(subject_stats, paths["subject_stats"], compact=compact)
+
+
+def app_output_files(sharded=False, shard_dir=None, result_dir=DEFAULT_RESULT_DIR, app_dir=None, **_):
+    """
+    The fixed-name files write_app_outputs writes (shards are reachable
+    through index.json, so it stands in for them).
+    """
+    paths = app_output_paths(result_dir, app_dir, shard_dir)
+    data_files = [paths["typescript"], paths["app_format"], paths["search_index"]]
+    if sharded:
+        data_files.append(paths["shard_dir"] / SHARD_INDEX_FILE)
+    return data_files + [paths["cohort_stats"], paths["subject_stats"]]
+
+
+def write_app_data(students_data, sharded=False, shard_dir=None, shard_size=DEFAULT_SHARD_SIZE,
+                   compact=False, report=None, columnar=None, columnar_dir=None,
+                   result_dir=DEFAULT_RESULT_DIR, app_dir=None):
+    """
+    Build the app data for students_data (Student records in roll order)
+    and write every output, plus the columnar tables in the columnar format
+    ("arrow" or "parquet") if one is given; they go to columnar_dir, by
+    default result_dir/columnar. Returns the app-format students.
+    """
+    report = report or RunReport("convert_to_app_format")
+    with report.stage("build"):
+        students, cohort, subject_stats = build_app_data(students_data)
+    with report.stage("write"):
+        write_app_outputs(students, cohort, subject_stats, sharded, shard_dir, shard_size, compact,
+                          result_dir, app_dir)
+    if columnar:
+        if columnar_dir is None:
+            columnar_dir = Path(result_dir) / COLUMNAR_DIR_NAME
+        with report.stage("columnar"):
+            write_columnar(students_data, students, columnar_dir, columnar)
+    report.count("students", len(students))
+    return students
+
+
+def add_app_dir_argument(parser):
+    """Register the --app-dir switch on an argparse parser."""
+    parser.add_argument(
+        '--app-dir',
+        default=None,
+        help=f'Directory to write generatedData.ts, its search index and public/data/ under '
+             f'(default: the current directory for --result_dir {DEFAULT_RESULT_DIR}, '
+             f'otherwise the result directory)'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert extracted PDF data to the application format'
+    )
+    parser.add_argument(
+        '--result_dir',
+        default=DEFAULT_RESULT_DIR,
+        help=f'Directory containing all_students.json (default: {DEFAULT_RESULT_DIR})'
+    )
+    add_app_dir_argument(parser)
+    parser.add_argument(
+        '--sharded',
+        action='store_true',
+        help='Also emit a roll-number index plus content-hashed JSON shards '
+             'for on-demand loading (see services/studentShards.ts)'
+    )
+    parser.add_argument(
+        '--shard-dir',
+        default=None,
+        help=f'Output directory for shards (default: <app dir>/{DEFAULT_SHARD_DIR})'
+    )
+    parser.add_argument(
+        '--shard-size',
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help=f'Students per shard; 1 gives one file per student (default: {DEFAULT_SHARD_SIZE})'
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Minify output, hoist cohort-wide constants into a shared header '
+             'and write .gz/.br siblings for sharded files'
+    )
+    add_columnar_arguments(parser)
+    add_report_arguments(parser)
+    
+    args = parser.parse_args()
+    validate_columnar_argument(parser, args)
+    
     print("Converting extracted PDF data to application format...")
-    students = generate_typescript_data()
-    write_typescript_file(students)
+    with instrumented_run("convert_to_app_format", args) as report:
+        with report.stage("load"):
+            students_data = load_all_students_data(args.result_dir)
+        students = write_app_data(students_data, args.sharded, args.shard_dir, args.shard_size,
+                                  compact=args.compact, report=report,
+                                  columnar=args.columnar, columnar_dir=args.columnar_dir,
+                                  result_dir=args.result_dir, app_dir=args.app_dir)
     
     print(f"\n✓ Successfully converted {len(students)} students")
     print("\nSample student data:")
     if students:
         print(json.dumps(students[0], indent=2)[:500] + "...")
+
+
+if __name__ == "__main__":
+    main()
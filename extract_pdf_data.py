@@ -5,153 +5,417 @@ Generates JSON files for each student with detailed subject information.
 """
 
 import pdfplumber
+import argparse
+import contextlib
 import json
 import os
 import re
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
 
+from combined_students import (
+    CACHE_DIR_NAME, COMBINED_FILE_NAME, CombinedStudents, iter_records, write_combined, write_text_if_changed
+)
+from extraction_cache import add_cache_arguments, file_digest, open_cache
+from job_manifest import DONE, FAILED, JobManifest, add_manifest_arguments
+from records import Student, Subject
+from record_spool import CHECKPOINT_EVERY, RecordSpool, add_checkpoint_arguments
+from run_report import RunReport, add_report_arguments, instrumented_run, peak_rss_mb
+from text_backends import (
+    DEFAULT_BACKEND, FALLBACK_BACKEND, add_backend_arguments, get_backend, get_page_backend, page_count,
+    validate_backend_argument
+)
+
+
+# Files a --resume worker claims from the job manifest at a time, per process
+CLAIM_BATCH_PER_WORKER = 4
+
+# Bump whenever parsing output changes so cached records are invalidated
+PARSER_VERSION = "2"
+
+# Consolidated PDFs: a page with this header starts the next student's sheet
+SHEET_START_MARKER = "Roll No"
+# Pages of a consolidated PDF handed to a worker process at a time
+PAGES_PER_TASK = 25
+# Tasks queued per worker process; finished results are not kept around
+IN_FLIGHT_PER_WORKER = 2
+
+
+@dataclass(frozen=True)
+class WorkerLimits:
+    """
+    Memory caps for the parser processes. The worker pool is replaced with
+    fresh processes after about max_files files per worker, or as soon as a
+    worker's peak RSS has reached max_rss_mb. None disables a cap.
+    """
+    max_files: int = None
+    max_rss_mb: float = None
+    
+    def __bool__(self):
+        return self.max_files is not None or self.max_rss_mb is not None
+
+# Section header text -> category, checked in this order
+SECTION_HEADERS = (
+    ("THEORY PAPERS", "THEORY"),
+    ("PRACTICAL PAPERS", "PRACTICAL"),
+    ("TERM WORK PAPERS", "TERM WORK"),
+)
+# Any of these ends the subject table
+END_MARKERS = ("GRAND TOTAL", "SGPA", "REMARKS")
+GRADE_LETTERS = frozenset("ABCDE")
+FAIL_GRADE = "F"
+
+# GRAND TOTAL <credits> <full marks> <marks obtained>
+_GRAND_TOTAL_RE = re.compile(r'GRAND TOTAL\s+(\d+(?:\.\d+)?)\s+(\d+)\s+(\d+)')
+
+# Marks with a moderation adjustment, e.g. "44-5" or "23+5"
+_MARKS_EXPR_RE = re.compile(r'(\d+)((?:[+-]\d+)+)')
+_MARKS_TERM_RE = re.compile(r'([+-])(\d+)')
+
+_INFO_PATTERNS = (
+    ('registration_number', re.compile(r'Registration No\s*:\s*(\d+)')),
+    ('roll_number', re.compile(r'Roll No\s*:\s*(\d+)')),
+    ('name', re.compile(r'obtained by\s+([A-Z\s]+)\s+of')),
+)
+
+
+def _is_credits(token):
+    """Credits look like 1.0, 3.0, 0.5, 2.0."""
+    head, dot, tail = token.rpartition('.')
+    return dot == '.' and len(tail) == 1 and tail.isdecimal() and head.isdecimal()
+
+
+def _is_full_marks(token):
+    """FULL MARKS TOTAL is always three digits: 015, 025, 050, 100, 010."""
+    return len(token) == 3 and token.isdecimal()
+
+
+def _ends_with_grade(line):
+    """True if the line ends with a grade such as A, B or A+."""
+    if line.endswith('+'):
+        line = line[:-1]
+    return line[-1:] in GRADE_LETTERS
+
+
+def evaluate_marks(token):
+    """
+    Resolve a moderation adjustment such as "44-5" -> "39" or "23+5" -> "28".
+    Only integers joined by + and - are accepted; anything else is returned
+    unchanged, so no expression is ever executed.
+    """
+    if '+' not in token and '-' not in token:
+        return token
+    match = _MARKS_EXPR_RE.fullmatch(token)
+    if not match:
+        return token
+    value = int(match.group(1))
+    for sign, number in _MARKS_TERM_RE.findall(match.group(2)):
+        value = value + int(number) if sign == '+' else value - int(number)
+    return str(value)
+
 
 def parse_subject_line(line, category):
     """
     Parse a single subject line from the PDF text.
-    Returns a dict with extracted fields or None if parsing fails.
+    Returns a Subject or None if parsing fails.
     
     Line format example:
     ENVT. EDU. AND SUST. DEVELOP. 1.0 15 - 015 - 06 12 - 12 A
     APPLIED PHYSICS -A 3.0 30 70 100 28 40 18 43 61 C
     
     Structure: NAME CREDITS INT FIN TOTAL FIN TOTAL INT FIN TOTAL GRADE
+    
+    The obtained-marks columns are read from the right, the subject name and
+    credits from the left, and the FULL MARKS TOTAL column from its fixed
+    offset window in between.
     """
-    # Split by single space and filter empty strings
-    parts = [p.strip() for p in line.split() if p.strip()]
+    parts = line.split()
+    n = len(parts)
     
-    if len(parts) < 5:
+    if n < 5:
         return None
     
-    try:
-        # Grade is always the last element
-        grade = parts[-1]
-        
-        # Marks total is second to last
-        marks_total = parts[-2]
-        
-        # Working backwards from the end:
-        # parts[-1] = GRADE
-        # parts[-2] = TOTAL (marks obtained)
-        # parts[-3] = FIN (marks obtained) or "-"
-        # parts[-4] = INT (marks obtained)
-        
-        marks_final = parts[-3] if parts[-3] != "-" else ""
-        marks_internal = parts[-4]
-        
-        # Now find the total_marks column
-        # It's a 3-digit number in the FULL MARKS TOTAL column
-        # Usually appears as 015, 025, 050, 100, 010
-        total_marks = ""
-        for i in range(len(parts) - 8, len(parts) - 5):
-            if i >= 0 and i < len(parts):
-                val = parts[i]
-                if re.match(r'^\d{3}$', val):
-                    total_marks = val
-                    break
-        
-        # Credits is the first numeric value (like 1.0, 3.0, 0.5, 2.0)
-        credits = ""
-        subject_name_parts = []
-        found_credits = False
+    # Working backwards from the end:
+    # parts[-1] = GRADE
+    # parts[-2] = TOTAL (marks obtained)
+    # parts[-3] = FIN (marks obtained) or "-"
+    # parts[-4] = INT (marks obtained) or "-"
+    grade = parts[-1]
+    marks_total = parts[-2]
+    marks_final = parts[-3] if parts[-3] != "-" else ""
+    marks_internal = parts[-4] if parts[-4] != "-" else ""
+    
+    # FULL MARKS TOTAL sits 6-8 tokens from the end
+    total_marks = ""
+    for i in range(max(n - 8, 0), n - 5):
+        if _is_full_marks(parts[i]):
+            total_marks = parts[i]
+            break
+    
+    # Credits is the first numeric value; everything before it is the name
+    credits = ""
+    name_end = n
+    for i, part in enumerate(parts):
+        if _is_credits(part):
+            credits = part
+            name_end = i
+            break
+    
+    return Subject.from_text(
+        " ".join(parts[:name_end]),
+        category,
+        credits,
+        total_marks,
+        evaluate_marks(marks_internal),
+        evaluate_marks(marks_final),
+        marks_total,
+        grade
+    )
+
+
+def _iter_table_lines(text):
+    """
+    Yield (category, line) for every non-blank line inside a section of
+    the subject table, stopping at the first end marker.
+    """
+    current_category = None
+    
+    for line in text.split('\n'):
+        line = line.strip()
         
-        for i, part in enumerate(parts):
-            if not found_credits and re.match(r'^\d+\.\d$', part):
-                credits = part
-                found_credits = True
-                break
-            subject_name_parts.append(part)
+        # Detect section headers
+        header = next((cat for marker, cat in SECTION_HEADERS if marker in line), None)
+        if header:
+            current_category = header
+            continue
         
-        subject_name = " ".join(subject_name_parts)
+        if not line or line.startswith("---"):
+            continue
         
-        # If marks_internal or marks_final is "-", make it empty
-        if marks_internal == "-":
-            marks_internal = ""
-        if marks_final == "-":
-            marks_final = ""
+        if "SUBJECT" in line and "CREDITS" in line:
+            # Header line
+            continue
         
-        # Evaluate arithmetic expressions if present (e.g., "44-5" -> "39", "23+5" -> "28")
-        if marks_internal and re.search(r'[\+\-]', marks_internal):
-            try:
-                marks_internal = str(eval(marks_internal))
-            except:
-                pass
+        if any(marker in line for marker in END_MARKERS):
+            # End of subject data
+            break
         
-        if marks_final and re.search(r'[\+\-]', marks_final):
-            try:
-                marks_final = str(eval(marks_final))
-            except:
-                pass
-            
-        return {
-            "subject_name": subject_name,
-            "credits": credits,
-            "total_marks": total_marks,
-            "marks_internal": marks_internal,
-            "marks_final": marks_final,
-            "marks_total": marks_total,
-            "grade": grade,
-            "category": category
-        }
-    except (IndexError, ValueError) as e:
-        return None
+        if current_category:
+            yield current_category, line
 
 
-def extract_subjects_from_pdf(pdf_path):
+def parse_subjects_text(text):
     """
-    Extract all subjects from a PDF file.
-    Returns a list of subject dictionaries.
+    Parse all subjects from the extracted text of a mark sheet page.
+    Returns a list of Subject records.
     """
     subjects = []
     
+    for category, line in _iter_table_lines(text):
+        # Parse subject line if it ends with a grade
+        if _ends_with_grade(line):
+            subject = parse_subject_line(line, category)
+            if subject:
+                subjects.append(subject)
+    
+    return subjects
+
+
+def check_marksheet_text(table_text, marksheet):
+    """
+    Structural checks on extracted text, used to decide whether a fast
+    text backend can be trusted for a sheet. Returns a list of problems;
+    an empty list means the sheet looks complete.
+    
+    Every subject row (including F rows, which are not parsed as subjects)
+    is added up and compared with the GRAND TOTAL line, so a merged,
+    split or missing row shows up as a credits/marks mismatch.
+    """
+    problems = []
+    if not marksheet.registration_number or not marksheet.name:
+        problems.append("missing registration number or name")
+    
+    sections = set()
+    rows = 0
+    credits = 0.0
+    full_marks = obtained = 0
+    for category, line in _iter_table_lines(table_text):
+        sections.add(category)
+        if not (_ends_with_grade(line) or line.endswith(" " + FAIL_GRADE)):
+            continue
+        row = parse_subject_line(line, category)
+        try:
+            credits += row.credits
+            full_marks += row.total_marks
+            obtained += row.marks_total
+        except (AttributeError, TypeError):
+            problems.append(f"unreadable subject row: {line}")
+            continue
+        rows += 1
+    
+    if not sections:
+        problems.append("missing section headers")
+    if not marksheet.subjects:
+        problems.append("no subjects")
+    
+    grand_total = _GRAND_TOTAL_RE.search(table_text)
+    if grand_total is None:
+        problems.append("missing GRAND TOTAL")
+    else:
+        expected = (float(grand_total.group(1)), int(grand_total.group(2)), int(grand_total.group(3)))
+        if (credits, full_marks, obtained) != expected:
+            problems.append(
+                f"subject count mismatch: {rows} rows add up to "
+                f"{credits:g}/{full_marks}/{obtained}, GRAND TOTAL says "
+                f"{expected[0]:g}/{expected[1]}/{expected[2]}"
+            )
+    
+    return problems
+
+
+def parse_student_info_text(text):
+    """
+    Parse student information from the extracted text of a mark sheet page.
+    Returns dict with roll number, registration number, and name.
+    """
+    info = {}
+    
+    for key, pattern in _INFO_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            info[key] = match.group(1).strip()
+    
+    return info
+
+
+def marksheet_from_text(pdf_path, header_text, table_text, default_roll=None):
+    """
+    Build a Student from the header and subject table text of a sheet.
+    Without a roll number in the header, default_roll (or the file name) is used.
+    """
+    info = parse_student_info_text(header_text)
+    
+    return Student(
+        roll_number=info.get('roll_number') or default_roll or Path(pdf_path).stem,
+        registration_number=info.get('registration_number', ''),
+        name=info.get('name', ''),
+        subjects=parse_subjects_text(table_text)
+    )
+
+
+def parse_marksheet(pdf_path, timings=None, crop=False, backend=None):
+    """
+    Parse header info and subjects from a PDF mark sheet in a single pass.
+    
+    The document is opened once and the page text is extracted once, then
+    both the header and the subject table are parsed from that text.
+    Falls back to the file name for the roll number if the header has none.
+    Raises on unreadable PDFs; callers decide how to report the error.
+    
+    Text comes from `backend` (see text_backends.py; default: the fastest
+    installed). Unless that is already pdfplumber, the result must pass
+    check_marksheet_text or the sheet is re-extracted with pdfplumber.
+    With crop=True pdfplumber extracts only the header block and subject
+    table (see table_regions.py); crop implies pdfplumber unless a backend
+    is given.
+    
+    If a timings dict is given, the seconds spent opening the PDF,
+    extracting its text and parsing that text are stored in it under
+    "open", "extract" and "parse", along with the "backend" that produced
+    the result and, after a fallback, the "fallback" reasons. In crop mode
+    "layout" records whether the text was cropped, learned the template or
+    came from the full page.
+    """
+    name = backend or (FALLBACK_BACKEND if crop else DEFAULT_BACKEND)
+    if timings is None:
+        timings = {}
+    
+    header_text, table_text = get_backend(name)(pdf_path, crop, timings)
+    return _checked_marksheet(
+        pdf_path, name, header_text, table_text,
+        lambda: get_backend(FALLBACK_BACKEND)(pdf_path, crop, timings), timings
+    )
+
+
+def _checked_marksheet(pdf_path, name, header_text, table_text, reextract, timings, default_roll=None):
+    """
+    Parse a sheet's text from backend `name`; unless that is pdfplumber,
+    re-extract it with reextract() when it fails check_marksheet_text.
+    """
+    start = time.perf_counter()
+    marksheet = marksheet_from_text(pdf_path, header_text, table_text, default_roll)
+    
+    if name != FALLBACK_BACKEND:
+        problems = check_marksheet_text(table_text, marksheet)
+        if problems:
+            timings["fallback"] = problems
+            name = FALLBACK_BACKEND
+            header_text, table_text = reextract()
+            start = time.perf_counter()
+            marksheet = marksheet_from_text(pdf_path, header_text, table_text, default_roll)
+    
+    timings["parse"] = round(time.perf_counter() - start, 4)
+    timings["backend"] = name
+    
+    return marksheet
+
+
+def group_sheet_pages(pages, start=0, stop=None):
+    """
+    Group the (page_index, header_text, table_text) stream of a consolidated
+    PDF into sheets, yielding (first_page, last_page, header_text, table_text)
+    per student. A sheet starts at every page carrying SHEET_START_MARKER
+    (and at the first page of the document) and runs until the next one;
+    its header is its first page's and its table all its pages' text.
+    
+    Only sheets starting in pages start..stop-1 are yielded, so the PDF can
+    be split into page ranges: leading pages that continue a sheet from an
+    earlier range are skipped, and the last sheet is followed past stop.
+    """
+    sheet = None
+    for index, header_text, table_text in pages:
+        starts_sheet = SHEET_START_MARKER in header_text or index == 0
+        if sheet is None and not starts_sheet:
+            # Continues a sheet that started before this range
+            if stop is not None and index >= stop:
+                return
+            continue
+        if starts_sheet:
+            if sheet is not None:
+                yield sheet[0], sheet[1], sheet[2], "\n".join(sheet[3])
+            if stop is not None and index >= stop:
+                return
+            sheet = [index, index, header_text, [table_text]]
+        else:
+            sheet[1] = index
+            sheet[3].append(table_text)
+    if sheet is not None:
+        yield sheet[0], sheet[1], sheet[2], "\n".join(sheet[3])
+
+
+def _sheet_text(name, pdf_path, crop, first_page, last_page):
+    """(header_text, table_text) of one sheet's pages, re-extracted with backend name."""
+    pages = get_page_backend(name)(pdf_path, crop, None, first_page, last_page + 1)
+    texts = list(pages)
+    return texts[0][1], "\n".join(table_text for _, _, table_text in texts)
+
+
+def extract_subjects_from_pdf(pdf_path):
+    """
+    Extract all subjects from a PDF file.
+    Returns a list of Subject records.
+    """
     try:
         with pdfplumber.open(pdf_path) as pdf:
-            page = pdf.pages[0]
-            text = page.extract_text()
-            
-            lines = text.split('\n')
-            current_category = None
-            
-            for line in lines:
-                line = line.strip()
-                
-                # Detect section headers
-                if "THEORY PAPERS" in line:
-                    current_category = "THEORY"
-                    continue
-                elif "PRACTICAL PAPERS" in line:
-                    current_category = "PRACTICAL"
-                    continue
-                elif "TERM WORK PAPERS" in line:
-                    current_category = "TERM WORK"
-                    continue
-                elif line.startswith("---") or not line:
-                    continue
-                elif "SUBJECT" in line and "CREDITS" in line:
-                    # Header line
-                    continue
-                elif "GRAND TOTAL" in line or "SGPA" in line or "REMARKS" in line:
-                    # End of subject data
-                    break
-                
-                # Parse subject line if we're in a category
-                if current_category and line:
-                    # Check if this line contains a grade at the end
-                    if re.search(r'[A-E]\+?$', line):
-                        subject = parse_subject_line(line, current_category)
-                        if subject:
-                            subjects.append(subject)
-    
+            text = pdf.pages[0].extract_text() or ""
     except Exception as e:
         print(f"Error processing {pdf_path}: {e}")
         return []
     
-    return subjects
+    return parse_subjects_text(text)
 
 
 def extract_student_info_from_pdf(pdf_path):
@@ -161,91 +425,600 @@ def extract_student_info_from_pdf(pdf_path):
     """
     try:
         with pdfplumber.open(pdf_path) as pdf:
-            page = pdf.pages[0]
-            text = page.extract_text()
-            
-            info = {}
-            
-            # Extract registration number
-            reg_match = re.search(r'Registration No\s*:\s*(\d+)', text)
-            if reg_match:
-                info['registration_number'] = reg_match.group(1)
-            
-            # Extract roll number
-            roll_match = re.search(r'Roll No\s*:\s*(\d+)', text)
-            if roll_match:
-                info['roll_number'] = roll_match.group(1)
-            
-            # Extract name
-            name_match = re.search(r'obtained by\s+([A-Z\s]+)\s+of', text)
-            if name_match:
-                info['name'] = name_match.group(1).strip()
-            
-            return info
+            text = pdf.pages[0].extract_text() or ""
     except Exception as e:
         print(f"Error extracting info from {pdf_path}: {e}")
         return {}
+    
+    return parse_student_info_text(text)
+
+
+def default_worker_count():
+    """Number of parser processes to use when none is given."""
+    return os.cpu_count() or 1
 
 
-def process_all_pdfs(result_dir="result"):
+def _parse_marksheet_safe(pdf_path, crop=False, backend=None):
+    """
+    Worker entry point for the process pool.
+    Returns (pdf_path, marksheet, error, timings) so failures travel back as
+    data; timings holds the per-stage seconds plus the worker's peak RSS.
+    """
+    timings = {}
+    start = time.perf_counter()
+    try:
+        marksheet, error = parse_marksheet(pdf_path, timings, crop, backend), None
+    except Exception as e:
+        marksheet, error = None, str(e)
+    timings["seconds"] = time.perf_counter() - start
+    timings["worker_peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return pdf_path, marksheet, error, timings
+
+
+def _parse_page_range(pdf_path, start, stop, crop=False, backend=None):
+    """
+    Worker entry point for consolidated PDFs: parse the sheets starting in
+    pages start..stop-1 of pdf_path, streaming its pages one at a time.
+    Returns a list of (pdf_path, marksheet, error, timings), one per sheet,
+    or a single error entry if the PDF cannot be read.
+    """
+    name = backend or (FALLBACK_BACKEND if crop else DEFAULT_BACKEND)
+    stem = Path(pdf_path).stem
+    results = []
+    range_start = time.perf_counter()
+    try:
+        pages = contextlib.closing(get_page_backend(name)(pdf_path, crop, None, start))
+        sheet_start = time.perf_counter()
+        with pages as page_texts:
+            for first, last, header_text, table_text in group_sheet_pages(page_texts, start, stop):
+                timings = {"pages": f"{first + 1}-{last + 1}" if last > first else str(first + 1)}
+                marksheet = _checked_marksheet(
+                    pdf_path, name, header_text, table_text,
+                    lambda: _sheet_text(FALLBACK_BACKEND, pdf_path, crop, first, last), timings,
+                    # A single-sheet file still falls back to its file name
+                    default_roll=f"{stem}-p{first + 1}" if first else None
+                )
+                timings["seconds"] = time.perf_counter() - sheet_start
+                timings["worker_peak_rss_mb"] = round(peak_rss_mb(), 1)
+                results.append((pdf_path, marksheet, None, timings))
+                sheet_start = time.perf_counter()
+    except Exception as e:
+        timings = {"pages": f"{start + 1}-{stop}", "seconds": time.perf_counter() - range_start}
+        results.append((pdf_path, None, str(e), timings))
+    return results
+
+
+def _pool_results(worker, tasks, workers, limits=None, worker_rss=None):
+    """
+    Run worker(*task) for every task in a process pool, yielding the results
+    in completion order. Only IN_FLIGHT_PER_WORKER tasks per process are
+    queued at a time, so memory does not grow with the number of tasks.
+    
+    With WorkerLimits the pool is shut down and replaced by fresh processes
+    after limits.max_files tasks per worker, or once worker_rss(result)
+    (the worker's peak RSS in MiB) reaches limits.max_rss_mb. Queued tasks
+    finish first; nothing is lost or parsed twice.
+    """
+    tasks = deque(tasks)
+    workers = min(workers, len(tasks))
+    limits = limits or WorkerLimits()
+    
+    while tasks:
+        budget = limits.max_files * workers if limits.max_files else len(tasks)
+        reason = None
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            running = set()
+            while True:
+                while tasks and budget > 0 and reason is None and len(running) < workers * IN_FLIGHT_PER_WORKER:
+                    running.add(executor.submit(worker, *tasks.popleft()))
+                    budget -= 1
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    rss = worker_rss(result) if worker_rss and limits.max_rss_mb else 0
+                    if limits.max_rss_mb and rss >= limits.max_rss_mb and reason is None:
+                        reason = f"a worker reached {rss:.0f} MB RSS"
+                    yield result
+        if tasks:
+            reason = reason or f"{limits.max_files} files per worker"
+            print(f"  ✓ Recycling the worker processes ({reason}); {len(tasks)} tasks left")
+
+
+def _parse_uncached(pdf_files, workers, crop=False, backend=None, limits=None):
+    """
+    Parse PDF files, serially or in a process pool, in completion order.
+    Yields (pdf_path, marksheet, error, timings). With WorkerLimits the
+    files are always parsed in worker processes, even for workers=1, so
+    the pool can be recycled; see _pool_results.
+    """
+    if len(pdf_files) <= 1 or (workers <= 1 and not limits):
+        for pdf_file in pdf_files:
+            yield _parse_marksheet_safe(pdf_file, crop, backend)
+        return
+    
+    yield from _pool_results(
+        _parse_marksheet_safe, [(pdf_file, crop, backend) for pdf_file in pdf_files], workers, limits,
+        lambda result: result[3].get("worker_peak_rss_mb", 0)
+    )
+
+
+def _recorded(results, report):
+    """Pass parse results through, logging each file's timings to report."""
+    for pdf_file, marksheet, error, timings in results:
+        if report is not None:
+            report.add_file(pdf_file, "error" if error else "parsed", timings.pop("seconds"), **timings)
+        yield pdf_file, marksheet, error
+
+
+def iter_marksheets(pdf_files, workers=None, cache=None, report=None, crop=False, backend=None,
+                    evict=True, limits=None):
+    """
+    Parse PDF files, yielding (pdf_path, marksheet, error) tuples as each
+    file finishes. Results arrive in completion order, so callers that need
+    a stable order must sort what they collect.
+    
+    With workers > 1 the files are fanned out to a ProcessPoolExecutor;
+    workers=1 parses serially in the current process.
+    
+    When an ExtractionCache is given, files whose content hash is already
+    cached are served from it without being opened by pdfplumber, newly
+    parsed files are added to it, and entries for PDFs that are no longer
+    in pdf_files are evicted.
+    
+    When a RunReport is given, every parsed file's open/extract/parse
+    timings are added to it and hashing is timed as the "hash" stage.
+    
+    crop=True extracts only the header and subject table regions and
+    backend picks the text extraction backend; see parse_marksheet.
+    limits (WorkerLimits) caps the memory of the worker processes.
+    """
+    pdf_files = list(pdf_files)
+    workers = workers or default_worker_count()
+    
+    if cache is None:
+        yield from _recorded(_parse_uncached(pdf_files, workers, crop, backend, limits), report)
+        return
+    
+    digests = {}
+    pending = []
+    for pdf_file in pdf_files:
+        start = time.perf_counter()
+        digest = digests[pdf_file] = file_digest(pdf_file)
+        record = cache.get(digest)
+        seconds = time.perf_counter() - start
+        if report is not None:
+            report.add_time("hash", seconds)
+        if record is not None:
+            if report is not None:
+                report.add_file(pdf_file, "cached", seconds)
+            yield pdf_file, Student.from_dict(record), None
+        else:
+            pending.append(pdf_file)
+    
+    if evict:
+        cache.evict_except(digests.values())
+    
+    parsed = _parse_uncached(pending, workers, crop, backend, limits)
+    for pdf_file, marksheet, error in _recorded(parsed, report):
+        if not error:
+            cache.put(digests[pdf_file], pdf_file.name, marksheet.to_dict())
+        yield pdf_file, marksheet, error
+    
+    cache.commit()
+
+
+def iter_consolidated_marksheets(pdf_files, workers=None, report=None, crop=False, backend=None,
+                                pages_per_task=PAGES_PER_TASK, limits=None):
+    """
+    Parse PDFs that may hold many students, one sheet (of one or more
+    pages) each, yielding (pdf_path, marksheet, error) per sheet in
+    completion order; see group_sheet_pages for how sheets are delimited.
+    
+    Each PDF is split into ranges of pages_per_task pages that are parsed
+    in parallel by `workers` processes; each worker streams its pages and
+    keeps only the current sheet's text. Single-sheet PDFs come out exactly
+    as from iter_marksheets. The extraction cache is not used. limits
+    (WorkerLimits) counts page ranges, not files, towards max_files.
+    """
+    pdf_files = list(pdf_files)
+    workers = workers or default_worker_count()
+    
+    tasks = []
+    for pdf_file in pdf_files:
+        try:
+            pages = page_count(pdf_file)
+        except Exception as e:
+            if report is not None:
+                report.add_file(pdf_file, "error")
+            yield pdf_file, None, str(e)
+            continue
+        tasks.extend((pdf_file, start, start + pages_per_task) for start in range(0, pages, pages_per_task))
+    
+    if len(tasks) <= 1 or (workers <= 1 and not limits):
+        for task in tasks:
+            yield from _recorded(_parse_page_range(*task, crop, backend), report)
+        return
+    
+    results = _pool_results(
+        _parse_page_range, [(*task, crop, backend) for task in tasks], workers, limits,
+        lambda sheets: max((timings.get("worker_peak_rss_mb", 0) for _, _, _, timings in sheets), default=0)
+    )
+    for sheets in results:
+        yield from _recorded(sheets, report)
+
+
+def iter_claimed_marksheets(manifest, pdf_dir, workers=None, report=None, crop=False, backend=None,
+                            limits=None):
+    """
+    Claim pending files from a JobManifest a few at a time and parse them,
+    yielding (pdf_path, marksheet, error, seconds) until nothing is left to
+    claim. The caller records each outcome with manifest.done/failed.
+    Other processes may be claiming from the same manifest concurrently.
+    """
+    workers = workers or default_worker_count()
+    while True:
+        names = manifest.claim(workers * CLAIM_BATCH_PER_WORKER)
+        if not names:
+            return
+        pdf_files = [Path(pdf_dir) / name for name in names]
+        for pdf_file, marksheet, error, timings in _parse_uncached(pdf_files, workers, crop, backend, limits):
+            seconds = timings.pop("seconds")
+            if report is not None:
+                report.add_file(pdf_file, "error" if error else "parsed", seconds, **timings)
+            yield pdf_file, marksheet, error, seconds
+
+
+def add_worker_limit_arguments(parser):
+    """Register the --max-files-per-worker / --max-worker-rss switches on an argparse parser."""
+    parser.add_argument(
+        '--max-files-per-worker',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Replace the parser processes with fresh ones after about N files each, '
+             'releasing any memory they have accumulated'
+    )
+    parser.add_argument(
+        '--max-worker-rss',
+        type=float,
+        default=None,
+        metavar='MB',
+        help='Replace the parser processes as soon as one has used MB of resident memory'
+    )
+
+
+def worker_limits(parser, args):
+    """The WorkerLimits for parsed arguments (exits with a usage error on bad values)."""
+    if args.max_files_per_worker is not None and args.max_files_per_worker < 1:
+        parser.error("--max-files-per-worker must be at least 1")
+    if args.max_worker_rss is not None and args.max_worker_rss <= 0:
+        parser.error("--max-worker-rss must be positive")
+    return WorkerLimits(args.max_files_per_worker, args.max_worker_rss)
+
+
+def open_manifest(result_dir):
+    """The job manifest used by --resume runs, in <result_dir>/.cache."""
+    return JobManifest(Path(result_dir) / CACHE_DIR_NAME, "all_students", {"parser_version": PARSER_VERSION})
+
+
+def save_marksheet(result_path, pdf_file, marksheet, error, report):
+    """
+    Write <result_path>/<roll>.json for a parsed sheet and print the outcome.
+    Returns True if the sheet produced a student record.
+    """
+    if error:
+        print(f"  ✗ Error processing {pdf_file.name}: {error}")
+        report.count("errors")
+        return False
+    
+    subjects = marksheet.subjects
+    
+    if not subjects:
+        print(f"  ✗ No subjects found")
+        report.count("no_subjects")
+        return False
+    
+    # Write individual JSON file (left untouched if unchanged)
+    json_filename = result_path / f"{marksheet.roll_number}.json"
+    with report.stage("write_files"):
+        written = write_text_if_changed(
+            json_filename, json.dumps(marksheet.subject_dicts(), indent=2, ensure_ascii=False)
+        )
+    
+    print(f"  ✓ Extracted {len(subjects)} subjects")
+    print(f"  ✓ {'Saved to' if written else 'Unchanged'} {json_filename}")
+    return True
+
+
+def _write_combined_output(result_path, records, incremental, report):
+    """
+    Write all_students.json from records in roll order: streamed as a full
+    replacement, or upserted into the existing file when incremental.
+    Returns the number of students that changed.
+    """
+    with report.stage("combine"):
+        if not incremental:
+            return write_combined(result_path, records)
+        store = CombinedStudents(result_path)
+        for student_data in records:
+            store.upsert(student_data)
+        updated = len(store.upserted)
+        store.save()
+        return updated
+
+
+def process_all_pdfs(result_dir="result", workers=None, no_cache=False, rebuild_cache=False,
+                     incremental=False, report=None, crop=False, backend=None,
+                     checkpoint_every=CHECKPOINT_EVERY, restart=False,
+                     resume=False, retry_failed=False, consolidated=False, limits=None):
     """
     Process all PDF files in the result directory.
     Creates a JSON file for each PDF with extracted data.
+    
+    PDFs are parsed by `workers` processes (default: CPU count); the
+    combined output is always ordered by roll number. Unchanged PDFs are
+    served from the extraction cache in <result_dir>/.cache unless
+    no_cache is set; rebuild_cache discards it first.
+    
+    Parsed students are spooled to <result_dir>/.cache as they finish and
+    made durable every checkpoint_every files (see record_spool.py), so
+    memory does not grow with the cohort and an interrupted run resumes
+    from its last checkpoint unless restart is set.
+    
+    resume=True (or retry_failed=True) runs as a batch job against the job
+    manifest instead; see process_pdf_batch. consolidated=True reads PDFs
+    holding many students, one sheet per page; see process_consolidated_pdfs.
+    limits (WorkerLimits) recycles the parser processes to cap their memory.
+    
+    By default all_students.json is replaced with exactly the students found
+    in the PDFs, streamed from the spool. With incremental=True those
+    students are upserted into the existing file instead, and only records
+    that actually changed are re-serialized. Either way the file is written
+    atomically.
+    
+    Per-file and per-stage timings are recorded in `report` (a RunReport).
+    crop=True extracts only the header and subject table of each sheet;
+    backend selects the text extraction backend (see text_backends.py).
+    
+    Returns the number of students written.
     """
+    report = report or RunReport("extract_pdf_data")
+    if resume or retry_failed:
+        return process_pdf_batch(result_dir, workers, incremental, report, crop, backend,
+                                 restart, retry_failed, limits)
+    if consolidated:
+        return process_consolidated_pdfs(result_dir, workers, incremental, report, crop, backend, limits)
+    
     result_path = Path(result_dir)
-    pdf_files = list(result_path.glob("*.pdf"))
+    pdf_files = sorted(result_path.glob("*.pdf"))
+    total = len(pdf_files)
     
-    print(f"Found {len(pdf_files)} PDF files to process")
+    print(f"Found {total} PDF files to process")
     
-    all_students_data = []
+    spool = RecordSpool(
+        result_path / CACHE_DIR_NAME, "all_students", {"parser_version": PARSER_VERSION},
+        checkpoint_every, resume=not restart
+    )
+    pending = spool.pending(pdf_files)
+    resumed = total - len(pending)
+    if resumed:
+        print(f"✓ Resuming interrupted run: {resumed} PDFs already parsed")
+        report.count("resumed", resumed)
     
-    for pdf_file in pdf_files:
-        print(f"\nProcessing: {pdf_file.name}")
+    cache = open_cache(result_path, PARSER_VERSION, no_cache, rebuild_cache)
+    
+    # Resumed PDFs are not hashed again, so keep their cache entries
+    marksheets = iter_marksheets(pending, workers, cache, report, crop, backend, evict=not resumed,
+                                 limits=limits)
+    
+    with spool:
+        with report.stage("extract"):
+            for done, (pdf_file, marksheet, error) in enumerate(marksheets, resumed + 1):
+                print(f"\n[{done}/{total}] Processing: {pdf_file.name}")
+                # Spooled only once its file is written, so a resume never skips it
+                if save_marksheet(result_path, pdf_file, marksheet, error, report):
+                    spool.append(pdf_file, marksheet.roll_number, marksheet.to_dict())
+        
+        if cache is not None:
+            cache.close()
+            report.count("cache_hits", cache.hits)
+            print(f"\n✓ {cache.summary()}")
+        
+        # Write combined data file, reading the spool back in roll order
+        updated = _write_combined_output(result_path, spool.records(), incremental, report)
+        spool.discard()
+    
+    count = len(spool)
+    report.count("students", count)
+    
+    print(f"\n✓ Processed {count} students ({updated} changed in combined data)")
+    print(f"✓ Combined data saved to {result_path / COMBINED_FILE_NAME}")
+    
+    return count
+
+
+def process_consolidated_pdfs(result_dir="result", workers=None, incremental=False, report=None, crop=False,
+                              backend=None, limits=None):
+    """
+    Process the PDFs in result_dir as consolidated result PDFs, where a
+    file may hold hundreds of students, one sheet per page (see
+    iter_consolidated_marksheets). Every sheet gets its <roll>.json and a
+    student in all_students.json, written as in process_all_pdfs.
+    
+    Pages are streamed and split across worker processes; only the parsed
+    records are kept until all_students.json is written. There is no
+    extraction cache or resume: a consolidated file is parsed again in full
+    whenever it is processed.
+    
+    Returns the number of students written.
+    """
+    report = report or RunReport("extract_pdf_data")
+    result_path = Path(result_dir)
+    pdf_files = sorted(result_path.glob("*.pdf"))
+    
+    print(f"Found {len(pdf_files)} PDF files to process, one student per sheet")
+    
+    students = {}
+    with report.stage("extract"):
+        marksheets = iter_consolidated_marksheets(pdf_files, workers, report, crop, backend, limits=limits)
+        for done, (pdf_file, marksheet, error) in enumerate(marksheets, 1):
+            sheet = f" (roll {marksheet.roll_number})" if marksheet else ""
+            print(f"\n[{done}] Processing: {pdf_file.name}{sheet}")
+            if save_marksheet(result_path, pdf_file, marksheet, error, report):
+                if marksheet.roll_number in students:
+                    print(f"  ⚠ Roll {marksheet.roll_number} appears on more than one sheet; keeping this one")
+                students[marksheet.roll_number] = marksheet
+    
+    records = (students[roll_number].to_dict() for roll_number in sorted(students))
+    updated = _write_combined_output(result_path, records, incremental, report)
+    count = len(students)
+    report.count("students", count)
+    
+    print(f"\n✓ Processed {count} students ({updated} changed in combined data)")
+    print(f"✓ Combined data saved to {result_path / COMBINED_FILE_NAME}")
+    
+    return count
+
+
+def process_pdf_batch(result_dir="result", workers=None, incremental=False, report=None, crop=False,
+                      backend=None, restart=False, retry_failed=False, limits=None):
+    """
+    Process the PDFs in result_dir as a resumable batch job.
+    
+    Every PDF's status, hash, attempts and parse time are tracked in
+    <result_dir>/.cache/all_students.manifest.sqlite (see job_manifest.py).
+    Files already done with unchanged content are skipped, files that
+    failed stay failed unless retry_failed is set, and restart puts every
+    file back in the queue. Several processes may run this at once: each
+    claims a few files at a time, so every PDF is parsed by exactly one.
+    The worker that finds the queue empty writes all_students.json from the
+    manifest's records; the others leave it to that worker.
+    
+    The extraction cache is not used; the manifest records each parsed
+    sheet itself. Returns the number of students written (0 if another
+    worker still has files in progress).
+    """
+    report = report or RunReport("extract_pdf_data")
+    result_path = Path(result_dir)
+    pdf_files = sorted(result_path.glob("*.pdf"))
+    
+    print(f"Found {len(pdf_files)} PDF files to process")
+    
+    with open_manifest(result_path) as manifest:
+        with report.stage("hash"):
+            changed = manifest.sync(pdf_files)
+        if restart:
+            manifest.reset()
+        elif retry_failed:
+            manifest.reset([FAILED])
+        released = manifest.release_dead_claims()
+        if released:
+            print(f"✓ Released {released} files claimed by workers that are no longer running")
+        print(f"✓ {manifest.summary()} ({changed} new or changed)")
         
-        # Extract student info
-        student_info = extract_student_info_from_pdf(pdf_file)
+        with report.stage("extract"):
+            marksheets = iter_claimed_marksheets(manifest, result_path, workers, report, crop, backend, limits)
+            for done, (pdf_file, marksheet, error, seconds) in enumerate(marksheets, 1):
+                print(f"\n[{done}] Processing: {pdf_file.name}")
+                if save_marksheet(result_path, pdf_file, marksheet, error, report):
+                    manifest.done(pdf_file, marksheet.roll_number, marksheet.to_dict(), seconds)
+                else:
+                    manifest.failed(pdf_file, error or "no subjects found", seconds)
         
-        # Extract subjects
-        subjects = extract_subjects_from_pdf(pdf_file)
+        print()
+        manifest.print_status()
+        if not manifest.is_complete():
+            print("✓ Other workers still have files in progress; the last one to finish "
+                  "writes all_students.json")
+            return 0
         
-        if subjects:
-            roll_number = student_info.get('roll_number', pdf_file.stem)
-            
-            # Create data structure
-            student_data = {
-                "roll_number": roll_number,
-                "registration_number": student_info.get('registration_number', ''),
-                "name": student_info.get('name', ''),
-                "subjects": subjects
-            }
-            
-            all_students_data.append(student_data)
-            
-            # Write individual JSON file
-            json_filename = result_path / f"{roll_number}.json"
-            with open(json_filename, 'w', encoding='utf-8') as f:
-                json.dump(subjects, f, indent=2, ensure_ascii=False)
-            
-            print(f"  ✓ Extracted {len(subjects)} subjects")
-            print(f"  ✓ Saved to {json_filename}")
-        else:
-            print(f"  ✗ No subjects found")
+        updated = _write_combined_output(result_path, manifest.records(), incremental, report)
+        count = manifest.counts()[DONE]
     
-    # Write combined data file
-    combined_file = result_path / "all_students.json"
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(all_students_data, f, indent=2, ensure_ascii=False)
+    report.count("students", count)
     
-    print(f"\n✓ Processed {len(all_students_data)} students")
-    print(f"✓ Combined data saved to {combined_file}")
+    print(f"\n✓ Processed {count} students ({updated} changed in combined data)")
+    print(f"✓ Combined data saved to {result_path / COMBINED_FILE_NAME}")
     
-    return all_students_data
+    return count
 
 
-if __name__ == "__main__":
-    students_data = process_all_pdfs()
+def main():
+    parser = argparse.ArgumentParser(
+        description='Extract subject-wise data from PDF mark sheets'
+    )
+    parser.add_argument(
+        '--result_dir',
+        default='result',
+        help='Directory containing PDF files (default: result)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of parser processes (default: CPU count, 1 = serial)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Upsert parsed students into the existing all_students.json instead of replacing it'
+    )
+    parser.add_argument(
+        '--crop',
+        action='store_true',
+        help='Extract only the header block and subject table, reusing their '
+             'position across sheets of the same layout'
+    )
+    parser.add_argument(
+        '--consolidated',
+        action='store_true',
+        help='PDFs may hold many students, one sheet per page: stream their pages and '
+             'split them across the workers (no extraction cache or resume)'
+    )
+    add_backend_arguments(parser)
+    add_cache_arguments(parser)
+    add_checkpoint_arguments(parser)
+    add_manifest_arguments(parser)
+    add_worker_limit_arguments(parser)
+    add_report_arguments(parser)
+    
+    args = parser.parse_args()
+    validate_backend_argument(parser, args)
+    limits = worker_limits(parser, args)
+    if args.consolidated and (args.resume or args.retry_failed):
+        parser.error("--consolidated cannot be combined with --resume or --retry-failed")
+    
+    if args.status:
+        with open_manifest(args.result_dir) as manifest:
+            manifest.print_status()
+        return
+    
+    with instrumented_run("extract_pdf_data", args) as report:
+        count = process_all_pdfs(
+            args.result_dir,
+            workers=args.workers,
+            no_cache=args.no_cache,
+            rebuild_cache=args.rebuild_cache,
+            incremental=args.incremental,
+            report=report,
+            crop=args.crop,
+            backend=args.backend,
+            checkpoint_every=args.checkpoint_every,
+            restart=args.restart,
+            resume=args.resume,
+            retry_failed=args.retry_failed,
+            consolidated=args.consolidated,
+            limits=limits
+        )
     
     # Print sample data for verification
-    if students_data:
+    if count:
         print("\n=== Sample Data (First Student) ===")
-        print(json.dumps(students_data[0], indent=2))
+        first = next(iter_records(Path(args.result_dir) / COMBINED_FILE_NAME))
+        print(json.dumps(first, indent=2))
+
+
+if __name__ == "__main__":
+    main()
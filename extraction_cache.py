@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of parsed mark sheets.
+Entries are keyed by the SHA-256 of the PDF bytes plus the parser version,
+so unchanged sheets are never parsed twice and parser changes invalidate
+everything automatically.
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+
+CACHE_DIR_NAME = ".cache"
+CACHE_FILE_NAME = "extraction.sqlite"
+
+
+def file_digest(path, chunk_size=1 << 16):
+    """Return the hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    SQLite-backed cache mapping (content hash, parser version) to a parsed
+    record in the all_students.json layout.
+    
+    Only the parent process touches the database; workers never see it.
+    """
+    
+    COMMIT_EVERY = 50
+    
+    def __init__(self, cache_dir, parser_version):
+        self.parser_version = parser_version
+        self.path = Path(cache_dir) / CACHE_FILE_NAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._uncommitted = 0
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS marksheets (
+                sha256 TEXT NOT NULL,
+                parser_version TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                record TEXT NOT NULL,
+                PRIMARY KEY (sha256, parser_version)
+            )
+            """
+        )
+        self._conn.commit()
+    
+    def get(self, digest):
+        """Return the cached record for a content hash, or None."""
+        row = self._conn.execute(
+            "SELECT record FROM marksheets WHERE sha256 = ? AND parser_version = ?",
+            (digest, self.parser_version)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+    
+    def put(self, digest, file_name, record):
+        """Store a parsed record for a content hash."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO marksheets VALUES (?, ?, ?, ?)",
+            (digest, self.parser_version, file_name, json.dumps(record, ensure_ascii=False))
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= self.COMMIT_EVERY:
+            self.commit()
+    
+    def evict_except(self, live_digests):
+        """
+        Drop entries whose PDF no longer exists (or has changed), plus any
+        entries written by other parser versions. Returns the number removed.
+        """
+        live_digests = set(live_digests)
+        stale = [
+            (digest, version)
+            for digest, version in self._conn.execute(
+                "SELECT sha256, parser_version FROM marksheets"
+            )
+            if digest not in live_digests or version != self.parser_version
+        ]
+        self._conn.executemany(
+            "DELETE FROM marksheets WHERE sha256 = ? AND parser_version = ?", stale
+        )
+        self.commit()
+        self.evicted += len(stale)
+        return len(stale)
+    
+    def clear(self):
+        """Remove every entry."""
+        self._conn.execute("DELETE FROM marksheets")
+        self.commit()
+    
+    def commit(self):
+        self._conn.commit()
+        self._uncommitted = 0
+    
+    def close(self):
+        self.commit()
+        self._conn.close()
+    
+    def summary(self):
+        return f"Cache: {self.hits} hits, {self.misses} parsed, {self.evicted} evicted"
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_cache(pdf_dir, parser_version, no_cache=False, rebuild_cache=False):
+    """
+    Open the cache that lives next to the PDFs (<pdf_dir>/.cache).
+    Returns None when caching is disabled; empties the cache when rebuilding.
+    """
+    if no_cache:
+        return None
+    cache = ExtractionCache(Path(pdf_dir) / CACHE_DIR_NAME, parser_version)
+    if rebuild_cache:
+        cache.clear()
+    return cache
+
+
+def add_cache_arguments(parser):
+    """Register the --no-cache / --rebuild-cache switches on an argparse parser."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Parse every PDF and do not read or write the extraction cache'
+    )
+    group.add_argument(
+        '--rebuild-cache',
+        action='store_true',
+        help='Discard the extraction cache and re-parse every PDF'
+    )
@@ -0,0 +1,5 @@
+// Auto-generated from PDF data - DO NOT EDIT MANUALLY
+// Lookup index over GENERATED_STUDENTS, built by search_index.py
+import { SearchIndex } from './types';
+
+export const SEARCH_INDEX: SearchIndex = {"version":2,"count":101,"hash":2500239242,"ngram":3,"suffixLength":4,"rolls":{"211271524001":0,"211271524002":1,"211271524003":2,"211271524004":3,"211271524005":4,"211271524006":5,"211271524007":6,"211271524008":7,"211271524009":8,"211271524010":9,"211271524012":10,"211271524014":11,"211271524015":12,"211271524016":13,"211271524017":14,"211271524018":15,"211271524019":16,"211271524020":17,"211271524021":18,"211271524022":19,"211271524023":20,"211271524024":21,"211271524025":22,"211271524027":23,"211271524029":24,"211271524031":25,"211271524032":26,"211271524033":27,"211271524035":28,"211271524036":29,"211271524037":30,"211271524038":31,"211271524039":32,"211271524040":33,"211271524041":34,"211271524042":35,"211271524043":36,"211271524044":37,"211271524045":38,"211271524046":39,"211271524047":40,"211271524048":41,"211271524049":42,"211271524050":43,"211271524051":44,"211271524053":45,"211271524054":46,"211271524055":47,"211271524056":48,"211271524057":49,"211271524061":50,"211271524062":51,"211271524063":52,"211271524064":53,"211271524065":54,"211271524066":55,"211271524067":56,"211271524068":57,"211271524069":58,"211271524070":59,"211271524071":60,"211271524072":61,"211271524073":62,"211271524074":63,"211271524075":64,"211271524076":65,"211271524077":66,"211271524079":67,"211271524080":68,"211271524083":69,"211271524084":70,"211271524086":71,"211271524087":72,"211271524088":73,"211271524089":74,"211271524090":75,"211271524091":76,"211271524092":77,"211271524093":78,"211271524094":79,"211271524095":80,"211271524096":81,"211271524098":82,"211271524099":83,"211271524100":84,"211271524101":85,"211271524103":86,"211271524104":87,"211271524105":88,"211271524106":89,"211271524107":90,"211271524108":91,"211271524110":92,"211271524111":93,"211271524112":94,"211271524113":95,"211271524114":96,"211271524116":97,"211271524118":98,"211271524119":99,"211271524120":100},"suffixFirst":{"0":9,"00":84,"001":0,"002":1,"003":2,"004":3,"005":4,"006":5,"007":6,"008":7,"009":8,"01":0,"010":9,"012":10,"014":11,"015":12,"016":13,"017":14,"018":15,"019":16,"02":1,"020":17,"021":18,"022":19,"023":20,"024":21,"025":22,"027":23,"029":24,"03":2,"031":25,"032":26,"033":27,"035":28,"036":29,"037":30,"038":31,"039":32,"04":3,"040":33,"041":34,"042":35,"043":36,"044":37,"045":38,"046":39,"047":40,"048":41,"049":42,"05":4,"050":43,"051":44,"053":45,"054":46,"055":47,"056":48,"057":49,"06":5,"061":50,"062":51,"063":52,"064":53,"065":54,"066":55,"067":56,"068":57,"069":58,"07":6,"070":59,"071":60,"072":61,"073":62,"074":63,"075":64,"076":65,"077":66,"079":67,"08":7,"080":68,"083":69,"084":70,"086":71,"087":72,"088":73,"089":74,"09":8,"090":75,"091":76,"092":77,"093":78,"094":79,"095":80,"096":81,"098":82,"099":83,"1":0,"10":9,"100":84,"101":85,"103":86,"104":87,"105":88,"106":89,"107":90,"108":91,"11":93,"110":92,"111":93,"112":94,"113":95,"114":96,"116":97,"118":98,"119":99,"12":10,"120":100,"13":95,"14":11,"15":12,"16":13,"17":14,"18":15,"19":16,"2":1,"20":17,"21":18,"22":19,"23":20,"24":21,"25":22,"27":23,"29":24,"3":2,"31":25,"32":26,"33":27,"35":28,"36":29,"37":30,"38":31,"39":32,"4":3,"40":33,"41":34,"42":35,"43":36,"44":37,"45":38,"46":39,"47":40,"48":41,"49":42,"5":4,"50":43,"51":44,"53":45,"54":46,"55":47,"56":48,"57":49,"6":5,"61":50,"62":51,"63":52,"64":53,"65":54,"66":55,"67":56,"68":57,"69":58,"7":6,"70":59,"71":60,"72":61,"73":62,"74":63,"75":64,"76":65,"77":66,"79":67,"8":7,"80":68,"83":69,"84":70,"86":71,"87":72,"88":73,"89":74,"9":8,"90":75,"91":76,"92":77,"93":78,"94":79,"95":80,"96":81,"98":82,"99":83},"suffixes":{"4001":[0],"4002":[1],"4003":[2],"4004":[3],"4005":[4],"4006":[5],"4007":[6],"4008":[7],"4009":[8],"4010":[9],"4012":[10],"4014":[11],"4015":[12],"4016":[13],"4017":[14],"4018":[15],"4019":[16],"4020":[17],"4021":[18],"4022":[19],"4023":[20],"4024":[21],"4025":[22],"4027":[23],"4029":[24],"4031":[25],"4032":[26],"4033":[27],"4035":[28],"4036":[29],"4037":[30],"4038":[31],"4039":[32],"4040":[33],"4041":[34],"4042":[35],"4043":[36],"4044":[37],"4045":[38],"4046":[39],"4047":[40],"4048":[41],"4049":[42],"4050":[43],"4051":[44],"4053":[45],"4054":[46],"4055":[47],"4056":[48],"4057":[49],"4061":[50],"4062":[51],"4063":[52],"4064":[53],"4065":[54],"4066":[55],"4067":[56],"4068":[57],"4069":[58],"4070":[59],"4071":[60],"4072":[61],"4073":[62],"4074":[63],"4075":[64],"4076":[65],"4077":[66],"4079":[67],"4080":[68],"4083":[69],"4084":[70],"4086":[71],"4087":[72],"4088":[73],"4089":[74],"4090":[75],"4091":[76],"4092":[77],"4093":[78],"4094":[79],"4095":[80],"4096":[81],"4098":[82],"4099":[83],"4100":[84],"4101":[85],"4103":[86],"4104":[87],"4105":[88],"4106":[89],"4107":[90],"4108":[91],"4110":[92],"4111":[93],"4112":[94],"4113":[95],"4114":[96],"4116":[97],"4118":[98],"4119":[99],"4120":[100]},"names":{" aj":[91]," ak":[60]," an":[27,14,26]," ga":[3]," gu":[4]," ha":[81]," hi":[81]," ku":[0,1,1,3,1,2,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,2,1,2,1,1,1,1,1,1,1,1,1,1,1,1,2,1,1,1,1,2,1,1,1,2,1,1,1,2,1,2,1,1,1,1,1,2,2,1,2,1,1,1,1,2,1,2,1,1,1,1,1,1,1,1,2,1,1,1,1,1,1,1,1]," ma":[39]," pa":[30]," pr":[72]," ra":[7,17,28,5,26,2]," sa":[69,9,18]," sh":[3,24]," si":[9]," su":[47]," vi":[0]," ya":[36],"a a":[41],"a k":[20,2,1,22,19,12,10],"a s":[47],"aar":[37],"aas":[41],"abh":[5,2,17,6,69],"aby":[18],"ada":[36],"adi":[64],"ag ":[67],"aga":[55,23],"ahn":[69],"ahu":[31],"aiy":[76],"aj ":[9,10,65,3,5],"aja":[35],"aju":[12,79],"ak ":[98],"aka":[15,24,33],"ake":[85],"akm":[60],"aks":[74],"al ":[35,9,47],"ala":[39],"alo":[10,82],"alv":[13],"am ":[3,65,27],"ama":[63],"amb":[3],"ami":[17,10],"amr":[60],"an ":[25,7,4,3,14,1,2,4,3,2,18,2,5],"ana":[47,20,11],"anc":[79],"and":[1,52,12,2,11],"ang":[73],"anh":[76],"ani":[1,33,4,7,2],"anj":[7,29,5,6,36],"ank":[8,25,19,10,24],"ann":[71],"ans":[2,4,20,1,15,15,24],"ant":[49,9],"anu":[28,39],"ar ":[0,9,21,6,3,16,41],"ari":[1,9,3,5,2,1,1,1,4,8,2,1,2,5,3,18,4,1,8,2,5,2,7],"arm":[3],"ars":[81,1],"art":[37],"ash":[15,26,31],"ath":[30],"ati":[69],"atr":[88],"aun":[98],"aur":[24],"aus":[25,29,31],"aut":[3],"avi":[83],"awa":[32,24,34,1],"ay ":[5,69],"aya":[8,80],"bab":[18],"bh ":[24],"bha":[5,63],"bhi":[3,4,23,69],"bit":[29],"bu ":[21],"by ":[18],"ce ":[51,10],"cha":[53,12],"chh":[100],"chi":[79],"cky":[0,11],"d s":[27,51],"dan":[1,52,12],"dav":[36],"ddu":[14],"dha":[26],"dhi":[19,65],"dip":[16],"dit":[64],"du ":[14],"e k":[51,10],"eha":[23],"ek ":[4,3,23,69],"eka":[78],"ero":[96],"esh":[75,10],"eta":[20],"g a":[67],"gam":[3],"gan":[73],"gar":[55,23],"gau":[3],"gay":[88],"gud":[14],"gul":[73],"gup":[4],"h k":[15,19,25,16,7,7,4],"h r":[24,28,33],"ha ":[23,22],"hai":[76],"hak":[30],"hal":[44],"ham":[27,41],"han":[25,1,2,10,1,8,2,4,1,4,7,20],"har":[3,63,15],"hay":[5,69],"hbu":[21],"hek":[7,23,69],"her":[96],"hho":[100],"hi ":[79],"hil":[46],"him":[2,4,51,24],"hir":[3,16,65],"his":[7,23,69],"hit":[80],"hiy":[41],"hni":[69],"hot":[100],"hu ":[2,4,20,16,15,24],"hub":[68],"hul":[31],"hus":[21],"hwe":[20],"i h":[81],"i k":[1,9,3,24,1,10,22,3,6,9],"i r":[83],"ick":[0,11],"ik ":[69,8],"iki":[70],"il ":[46],"im ":[27],"ima":[2,4,51,24],"inc":[51,10],"ing":[9],"ini":[0],"ink":[48],"iom":[66],"ipu":[16],"ir ":[3],"ira":[19,65],"ish":[7,23,4,10,1,13,1,30,10],"it ":[0,17,16,29,18,17],"ite":[75],"iti":[77,12],"itt":[29,14],"ity":[64],"ive":[4,74],"iya":[22,19,1,34,10],"iyu":[93],"j k":[9,10,65,3,5],"jal":[35],"jan":[7,29,11,36],"jaw":[91],"jja":[91],"ju ":[12],"jub":[91],"jum":[41],"k g":[4],"k k":[8,22,47,21,1],"k r":[7],"k s":[69],"ka ":[86],"kaj":[35],"kam":[60],"kan":[76,2],"kar":[39,43],"kas":[15,57],"kes":[85],"khu":[21],"ki ":[48,22],"kit":[33,29],"kma":[60],"kra":[92],"kri":[59],"ksh":[74],"kum":[0,1,1,3,1,2,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,2,1,2,1,1,1,1,1,1,1,1,1,1,1,1,2,1,1,1,1,2,1,1,1,2,1,1,1,2,1,2,1,1,1,1,1,2,2,1,2,1,1,1,1,2,1,1,1,1,1,1,1,1,1,1,1,2,1,1,1,1,1,1,1,1],"kus":[52],"ky ":[11],"l a":[91],"l k":[31,4,9,2],"lak":[39],"li ":[73],"lok":[92],"lon":[10],"lvi":[13],"m a":[27],"m g":[3],"m k":[40,26,2,27],"m p":[72],"mal":[39,21],"man":[2,4,51,6,18],"mar":[0,1,1,3,1,2,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,2,1,2,1,1,1,1,1,1,1,1,1,1,1,1,2,1,1,1,1,2,1,1,1,2,1,1,1,2,1,2,1,1,1,1,1,2,2,1,2,1,1,1,1,2,1,1,1,1,1,1,1,1,1,1,1,2,1,1,1,1,1,1,1,1],"may":[8],"mbh":[3],"md ":[27],"mim":[27],"mit":[17,80],"mku":[40],"mra":[60],"n a":[60],"n k":[25,7,4,3,14,1,2,7,2,18,2,5],"na ":[47],"nak":[98],"nam":[95],"nan":[1,66,11],"nce":[51,10],"nch":[79],"nd ":[78],"nda":[1,52,12],"neh":[23],"ngh":[9],"ngu":[73],"nha":[76],"ni ":[1,9,28],"nik":[70],"nis":[34,11,13],"nit":[0,89],"nja":[7,29,11,36],"nju":[41],"nk ":[8],"nka":[86],"nki":[33,15,14],"nku":[52],"nnu":[71],"nny":[94],"nsa":[27],"nsh":[2,4,20,16,15,24],"nt ":[49,9],"nu ":[28,22,21],"nur":[67],"ny ":[94],"o k":[96],"oha":[39],"ohi":[80],"okr":[92],"om ":[66,6],"ona":[95],"oni":[10],"onu":[50],"otu":[100],"pat":[30],"paw":[32,24,34],"pin":[48],"piy":[93],"pra":[15,54,3,7],"pri":[22,20,9,10,25],"pta":[4],"pu ":[16],"r k":[55],"r m":[39],"r p":[30],"r s":[3,6,87],"r v":[0],"r y":[36],"rab":[24],"rag":[67],"rah":[31],"rai":[24],"raj":[9,3,7,33,5,27,3,5],"rak":[15,57,13],"ran":[7,29,24,19,4],"rat":[69],"rau":[25,29,31,13],"rav":[83],"ri ":[81,7],"rin":[51,10],"rio":[66],"ris":[59],"rit":[75,2],"riy":[22,20,44],"rma":[3],"ro ":[96],"roh":[39,41],"rsh":[81,1],"rti":[37],"sag":[55,23],"sah":[69,27],"sal":[10,3],"san":[47],"sar":[27],"sau":[24],"sh ":[15,19,18,7,16,7,3,4,4],"sha":[3,22,2,1,16,1,4,5,4,16,7,4],"shb":[21],"she":[7,23,69],"shi":[41,5],"shu":[2,4,20,16,15,11,13],"shw":[20],"sin":[9],"son":[50,45],"sud":[26],"suh":[38,9],"sum":[97],"sun":[94],"sup":[22],"sur":[87],"sus":[46,3],"t k":[0,17,16,16,9,4,18,17],"ta ":[20],"tam":[3],"tan":[71],"tes":[75],"tha":[30],"ti ":[37],"tik":[69,8],"tis":[89],"tka":[82],"tri":[88],"ttu":[29,14],"tu ":[29,14,57],"tya":[64],"u h":[81],"u k":[2,4,6,2,2,5,5,2,1,13,1,7,21,29],"u r":[57],"uba":[91],"ubh":[68],"udd":[14],"udh":[26],"uha":[38,9],"ujj":[91],"ul ":[31],"uli":[73],"um ":[40],"uma":[0,1,1,3,1,2,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,2,1,2,1,1,1,1,1,1,1,1,1,1,1,1,2,1,1,1,1,2,1,1,1,2,1,1,1,2,1,2,1,1,1,1,1,2,2,1,2,1,1,1,1,2,1,1,1,1,1,1,1,1,1,1,1,2,1,1,1,1,1,1,1,1],"umi":[97],"umk":[40],"una":[98],"unn":[94],"upr":[22],"upt":[4],"ura":[24,43,20],"ush":[21,4,21,3,3,2,31,8],"uta":[3],"utk":[82],"vek":[4,74],"vi ":[13,70],"vic":[0,11],"vin":[0],"vis":[44],"vit":[43],"viv":[4,74],"wal":[91],"wan":[32,24,34],"wet":[20],"y k":[5,6,7,56,20],"ya ":[22,19,23,12],"yad":[36],"yan":[8,34,44],"yat":[88],"yus":[93]},"numbers":{"001":[0],"002":[1],"003":[2],"004":[3],"005":[4],"006":[5],"007":[6],"008":[7],"009":[8],"010":[9],"012":[10],"014":[11],"015":[12],"016":[13],"017":[14],"018":[15],"019":[16],"020":[17],"021":[18],"022":[19],"023":[20],"024":[21],"025":[22],"027":[23],"029":[24],"031":[25],"032":[26],"033":[27],"035":[28],"036":[29],"037":[30],"038":[31],"039":[32],"040":[33],"041":[34],"042":[35],"043":[36],"044":[37],"045":[38],"046":[39],"047":[40],"048":[41],"049":[42],"050":[43],"051":[44],"053":[45],"054":[46],"055":[47],"056":[48],"057":[49],"061":[50],"062":[51],"063":[52],"064":[53],"065":[54],"066":[55],"067":[56],"068":[57],"069":[58],"070":[59],"071":[60],"072":[61],"073":[62],"074":[63],"075":[64],"076":[65],"077":[66],"079":[67],"080":[68],"083":[69],"084":[70],"086":[71],"087":[72],"088":[73],"089":[74],"090":[75],"091":[76],"092":[77],"093":[78],"094":[79],"095":[80],"096":[81],"098":[82],"099":[83],"100":[84],"101":[85],"103":[86],"104":[87],"105":[88],"106":[89],"107":[90],"108":[91],"110":[92],"111":[93],"112":[0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],"113":[95],"114":[96],"116":[97],"118":[98],"119":[99],"120":[100],"127":[0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],"152":[0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],"211":[0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],"240":[0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],"241":[84,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],"271":[0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],"400":[0,1,1,1,1,1,1,1,1],"401":[9,1,1,1,1,1,1,1],"402":[17,1,1,1,1,1,1,1],"403":[25,1,1,1,1,1,1,1],"404":[33,1,1,1,1,1,1,1,1,1],"405":[43,1,1,1,1,1,1],"406":[50,1,1,1,1,1,1,1,1],"407":[59,1,1,1,1,1,1,1,1],"408":[68,1,1,1,1,1,1],"409":[75,1,1,1,1,1,1,1,1],"410":[84,1,1,1,1,1,1,1],"411":[92,1,1,1,1,1,1,1],"412":[100],"524":[0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],"715":[0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1]}};
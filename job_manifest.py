@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+SQLite job manifest for long-running, resumable batch extraction.
+
+Every PDF in the input directory gets one row recording its status
+(pending, running, done or failed), content hash, attempts, parse time,
+last error and, once done, the parsed record. Any number of processes,
+on this machine or another one sharing the directory, can work through
+the same manifest: each claims a small batch of pending files in a single
+write transaction, so no file is handed to two workers at once.
+
+Claims held by a process that has died are released automatically: at
+once when the process ran on this host, otherwise after
+STALE_CLAIM_SECONDS. Whichever worker finds nothing left to claim or
+running writes the final output from the done records.
+"""
+
+import contextlib
+import json
+import os
+import socket
+import sqlite3
+import time
+from pathlib import Path
+
+from combined_students import file_stamp
+from extraction_cache import file_digest
+
+
+MANIFEST_SUFFIX = ".manifest.sqlite"
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+STATUSES = (PENDING, RUNNING, DONE, FAILED)
+
+# A claim older than this is assumed to belong to a dead worker on another host
+STALE_CLAIM_SECONDS = 1800
+# sqlite busy timeout; claims and updates are short transactions
+LOCK_TIMEOUT_SECONDS = 60
+
+
+def worker_id():
+    """Identify this process as host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _local_worker_alive(worker):
+    """False if worker is a process on this host that no longer exists."""
+    host, _, pid = worker.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # A killed worker lingers as a zombie until its parent reaps it
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            return f.read().rpartition(")")[2].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
+
+
+class JobManifest:
+    """
+    Per-file job state for one batch job, shared safely between processes.
+    
+    `settings` describes what the records depend on (parser version, input
+    directory, ...); opening the manifest with different settings resets
+    every file to pending.
+    """
+    
+    def __init__(self, manifest_dir, name, settings):
+        self.path = Path(manifest_dir) / f"{name}{MANIFEST_SUFFIX}"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.worker = worker_id()
+        self._conn = sqlite3.connect(str(self.path), timeout=LOCK_TIMEOUT_SECONDS, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._transaction():
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    file_name TEXT PRIMARY KEY,
+                    sha256 TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    worker TEXT,
+                    claimed_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    seconds REAL,
+                    error TEXT,
+                    sort_key TEXT,
+                    record TEXT
+                )
+                """
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            settings = json.dumps(settings, sort_keys=True)
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'settings'").fetchone()
+            if row is None or row[0] != settings:
+                self._reset_all()
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('settings', ?)", (settings,))
+    
+    @contextlib.contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT, taking the write lock up front."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+    
+    def _reset_all(self):
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, claimed_at = NULL, attempts = 0, "
+            "seconds = NULL, error = NULL, sort_key = NULL, record = NULL", (PENDING,)
+        )
+    
+    def sync(self, pdf_files):
+        """
+        Bring the manifest in line with the PDFs on disk: new files are
+        added as pending, files whose content changed go back to pending
+        and rows for deleted files are dropped. Unchanged files keep their
+        state. Returns the number of files added or reset.
+        """
+        known = {
+            name: (mtime_ns, size, digest)
+            for name, mtime_ns, size, digest in self._conn.execute(
+                "SELECT file_name, mtime_ns, size, sha256 FROM jobs"
+            )
+        }
+        
+        # Hash outside the write lock; only files whose stamp moved are re-hashed
+        changes = []
+        for pdf_file in pdf_files:
+            stamp = file_stamp(pdf_file)
+            previous = known.pop(pdf_file.name, None)
+            if previous is not None and previous[:2] == (stamp["mtime_ns"], stamp["size"]):
+                continue
+            digest = file_digest(pdf_file)
+            content_changed = previous is None or previous[2] != digest
+            changes.append((pdf_file.name, digest, stamp, content_changed))
+        
+        with self._transaction():
+            for name, digest, stamp, content_changed in changes:
+                if content_changed:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO jobs (file_name, sha256, mtime_ns, size, status) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (name, digest, stamp["mtime_ns"], stamp["size"], PENDING)
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE jobs SET mtime_ns = ?, size = ? WHERE file_name = ?",
+                        (stamp["mtime_ns"], stamp["size"], name)
+                    )
+            self._conn.executemany("DELETE FROM jobs WHERE file_name = ?", [(name,) for name in known])
+        return sum(1 for change in changes if change[3])
+    
+    def reset(self, statuses=None):
+        """Put files with the given statuses (default: every file) back to pending."""
+        with self._transaction():
+            if statuses is None:
+                self._reset_all()
+                return
+            self._conn.executemany(
+                "UPDATE jobs SET status = ?, worker = NULL, claimed_at = NULL, error = NULL "
+                "WHERE status = ?", [(PENDING, status) for status in statuses]
+            )
+    
+    def release_dead_claims(self, stale_after=STALE_CLAIM_SECONDS):
+        """Return files claimed by dead workers to pending. Returns the count."""
+        cutoff = time.time() - stale_after
+        with self._transaction():
+            dead = [
+                name for name, worker, claimed_at in self._conn.execute(
+                    "SELECT file_name, worker, claimed_at FROM jobs WHERE status = ?", (RUNNING,)
+                )
+                if worker != self.worker and (claimed_at < cutoff or not _local_worker_alive(worker))
+            ]
+            self._conn.executemany(
+                "UPDATE jobs SET status = ?, worker = NULL, claimed_at = NULL WHERE file_name = ?",
+                [(PENDING, name) for name in dead]
+            )
+        return len(dead)
+    
+    def claim(self, limit):
+        """Atomically claim up to limit pending files; returns their names."""
+        with self._transaction():
+            names = [
+                row[0] for row in self._conn.execute(
+                    "SELECT file_name FROM jobs WHERE status = ? ORDER BY file_name LIMIT ?",
+                    (PENDING, limit)
+                )
+            ]
+            self._conn.executemany(
+                "UPDATE jobs SET status = ?, worker = ?, claimed_at = ?, attempts = attempts + 1 "
+                "WHERE file_name = ?",
+                [(RUNNING, self.worker, time.time(), name) for name in names]
+            )
+        return names
+    
+    def done(self, pdf_file, sort_key, record, seconds):
+        """Record a parsed file and its output record."""
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, claimed_at = NULL, seconds = ?, "
+                "error = NULL, sort_key = ?, record = ? WHERE file_name = ?",
+                (DONE, round(seconds, 4), sort_key, json.dumps(record, ensure_ascii=False),
+                 Path(pdf_file).name)
+            )
+    
+    def failed(self, pdf_file, error, seconds):
+        """Record a file that could not be parsed."""
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, claimed_at = NULL, seconds = ?, "
+                "error = ?, sort_key = NULL, record = NULL WHERE file_name = ?",
+                (FAILED, round(seconds, 4), str(error), Path(pdf_file).name)
+            )
+    
+    def counts(self):
+        """{status: number of files} for every status."""
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+        return counts
+    
+    def is_complete(self):
+        """True once no file is pending or claimed."""
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[RUNNING] == 0
+    
+    def failures(self):
+        """(file name, attempts, error) for every failed file."""
+        return self._conn.execute(
+            "SELECT file_name, attempts, error FROM jobs WHERE status = ? ORDER BY file_name", (FAILED,)
+        ).fetchall()
+    
+    def records(self):
+        """Yield the done records ordered by (sort key, file name), one at a time."""
+        cursor = self._conn.execute(
+            "SELECT record FROM jobs WHERE status = ? ORDER BY sort_key, file_name", (DONE,)
+        )
+        for (record,) in cursor:
+            yield json.loads(record)
+    
+    def summary(self):
+        counts = self.counts()
+        return "Manifest: " + ", ".join(f"{counts[status]} {status}" for status in STATUSES)
+    
+    def print_status(self):
+        """Print per-status counts and the failed files."""
+        print(f"✓ {self.summary()} ({self.path})")
+        for name, attempts, error in self.failures():
+            print(f"  ✗ {name} (attempt {attempts}): {error}")
+    
+    def close(self):
+        self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def add_manifest_arguments(parser):
+    """Register the --resume / --retry-failed / --status switches on an argparse parser."""
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Run as a resumable batch job: track every PDF in a job manifest, '
+             'skip files already done and let several processes share the work'
+    )
+    parser.add_argument(
+        '--retry-failed',
+        action='store_true',
+        help='With --resume, put files that failed in earlier runs back in the queue (implies --resume)'
+    )
+    parser.add_argument(
+        '--status',
+        action='store_true',
+        help='Print the job manifest status and failed files, then exit'
+    )
@@ -0,0 +1,10 @@
+/**
+ * Normalize a roll number to the form stored in the Student collection:
+ * no whitespace, upper case. Must match normalize_roll_number in
+ * load_mongodb.py, which bulk-loads students in this form.
+ * @param rollNumber - The roll number as typed or extracted
+ * @returns The stored form, usable for exact-match indexed lookups
+ */
+export function normalizeRollNumber(rollNumber: string): string {
+  return rollNumber.replace(/\s+/g, '').toUpperCase();
+}
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Bulk-load extracted results into the MongoDB Student collection.
+
+POST /api/students stores one student per request; loading a whole
+release that way costs one HTTP round trip and one findOneAndUpdate per
+student. This command upserts the students straight into the collection
+behind models/Student.ts in batched, unordered bulk_write calls: a batch
+is one round trip, and one bad document does not stop the rest of it.
+
+Input is either result/all_students.json (the default) or a results.json
+written by scripts/pdf_extractor.py, as a JSON array or JSON lines:
+
+  all_students.json  goes through build_app_data, so semester, SGPA and
+                     CGPA, credits and marks match the app's data exactly
+  results.json       carries no credits, semester or course: credits are
+                     stored as 0, SGPA is the unweighted mean of the grade
+                     points, and semester and branch come from --semester
+                     and --branch
+
+Roll numbers are stored normalized (see normalize_roll_number, mirrored by
+lib/rollNumber.ts), so the API can find a student with an exact match on
+the unique rollNumber index instead of a case-insensitive $regex scan.
+Documents stored before that (by an older POST /api/students or loader)
+are normalized in place before every load, or alone with --migrate-only;
+see migrate_roll_numbers.
+The mark sheets print no subject codes, so each subject's code is its name.
+
+Needs the optional pymongo package (pip install pymongo). load_students()
+takes any object with pymongo's bulk_write, so it can be pointed at a local
+mongod or at an in-process stand-in such as mongomock.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from cohort_stats import GRADE_POINTS
+from combined_students import iter_records
+from convert_to_app_format import build_app_data
+from records import Student
+from run_report import RunReport, add_report_arguments, instrumented_run
+
+try:
+    import pymongo
+    from pymongo import UpdateOne
+    from pymongo.errors import BulkWriteError, OperationFailure, PyMongoError
+except ImportError:  # optional: only needed to talk to MongoDB
+    pymongo = None
+
+
+DEFAULT_INPUT = "result/all_students.json"
+# Mongoose's collection for the Student model, and its default database
+DEFAULT_COLLECTION = "students"
+DEFAULT_DATABASE = "test"
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_SEMESTER = 2
+DEFAULT_BRANCH = "Diploma in Civil Engineering"
+
+
+def normalize_roll_number(roll_number):
+    """The stored form of a roll number: no whitespace, upper case."""
+    return "".join(str(roll_number).split()).upper()
+
+
+def _student_document(roll_number, name, semester, branch, subjects, sgpa, cgpa):
+    return {
+        "rollNumber": normalize_roll_number(roll_number),
+        "name": name.strip(),
+        "semester": semester,
+        "branch": branch.strip(),
+        "subjects": subjects,
+        "sgpa": sgpa,
+        "cgpa": cgpa
+    }
+
+
+def documents_from_combined(records):
+    """Student documents for all_students.json records, via build_app_data."""
+    app_students, _, _ = build_app_data([Student.from_dict(record) for record in records])
+    for student in app_students:
+        result = student["results"][-1]
+        subjects = [
+            {"code": s["name"], "name": s["name"], "marks": s["obtainedMarks"], "credits": s["credits"]}
+            for s in result["subjects"]
+        ]
+        yield _student_document(
+            student["rollNumber"], student["name"], result["semester"], student["course"],
+            subjects, result["sgpa"], result["cgpa"]
+        )
+
+
+def documents_from_results(entries, semester=DEFAULT_SEMESTER, branch=DEFAULT_BRANCH):
+    """Student documents for results.json entries (see the module docstring)."""
+    for entry in entries:
+        subjects = entry["subjects"]
+        points = [GRADE_POINTS.get(s["grade"], 0) for s in subjects]
+        sgpa = round(sum(points) / len(points), 2) if points else 0
+        yield _student_document(
+            entry["roll"], entry["name"], semester, branch,
+            [{"code": s["name"], "name": s["name"], "marks": s["marks_total"] or 0, "credits": 0}
+             for s in subjects],
+            sgpa, sgpa
+        )
+
+
+def read_documents(input_file, semester=DEFAULT_SEMESTER, branch=DEFAULT_BRANCH):
+    """
+    Student documents for input_file, an all_students.json or a results.json
+    (told apart by their roll-number key).
+    """
+    records = list(iter_records(input_file))
+    if records and "roll" in records[0]:
+        return list(documents_from_results(records, semester, branch))
+    return list(documents_from_combined(records))
+
+
+def upsert_operations(documents, now=None):
+    """One upsert per document, keyed by rollNumber, keeping Mongoose's timestamps."""
+    now = now or datetime.now(timezone.utc)
+    return [
+        UpdateOne(
+            {"rollNumber": document["rollNumber"]},
+            {"$set": {**document, "updatedAt": now}, "$setOnInsert": {"createdAt": now, "__v": 0}},
+            upsert=True
+        )
+        for document in documents
+    ]
+
+
+def ensure_indexes(collection):
+    """Create the unique rollNumber index the exact-match lookups rely on."""
+    try:
+        collection.create_index([("rollNumber", pymongo.ASCENDING)], unique=True)
+    except OperationFailure as e:
+        # Already created by Mongoose with other options: leave it alone
+        print(f"⚠ Could not create the rollNumber index: {e}")
+
+
+def migrate_roll_numbers(collection, batch_size=DEFAULT_BATCH_SIZE, report=None):
+    """
+    Normalize rollNumber on documents stored before roll numbers were, so
+    the API's exact-match lookups find them and a load updates them instead
+    of inserting a second copy. A document whose normalized roll number
+    already belongs to another document is left alone and reported, to be
+    merged by hand. Returns {"migrated", "conflicts"}.
+    """
+    if pymongo is None:
+        raise RuntimeError("Migrating MongoDB documents needs pymongo (pip install pymongo)")
+    report = report or RunReport("load_mongodb")
+    taken, stale = set(), []
+    with report.stage("migrate_scan"):
+        for document in collection.find({}, {"rollNumber": 1}):
+            roll_number = document.get("rollNumber")
+            if roll_number is None:
+                continue
+            normalized = normalize_roll_number(roll_number)
+            if roll_number == normalized:
+                taken.add(normalized)
+            else:
+                stale.append((document["_id"], roll_number, normalized))
+    
+    totals = {"migrated": 0, "conflicts": 0}
+    operations, rolls = [], []
+    for _id, roll_number, normalized in stale:
+        if normalized in taken:
+            print(f"  ⚠ {roll_number!r} not renamed: {normalized} is already stored")
+            totals["conflicts"] += 1
+            continue
+        taken.add(normalized)
+        # Matching the old value too skips documents changed since the scan
+        operations.append(UpdateOne({"_id": _id, "rollNumber": roll_number}, {"$set": {"rollNumber": normalized}}))
+        rolls.append(roll_number)
+    
+    for start in range(0, len(operations), batch_size):
+        with report.stage("migrate_write"):
+            try:
+                result = collection.bulk_write(operations[start:start + batch_size], ordered=False).bulk_api_result
+            except BulkWriteError as e:
+                result = e.details
+                for error in result["writeErrors"]:
+                    print(f"  ⚠ {rolls[start + error['index']]!r} not renamed: {error['errmsg']}")
+        totals["migrated"] += result["nModified"]
+        totals["conflicts"] += len(result.get("writeErrors", []))
+    
+    for name, value in totals.items():
+        report.count(f"roll_{name}", value)
+    if stale:
+        print(f"✓ Normalized {totals['migrated']} stored roll numbers ({totals['conflicts']} conflicts)")
+    return totals
+
+
+def load_students(collection, documents, batch_size=DEFAULT_BATCH_SIZE, report=None):
+    """
+    Upsert documents into collection in unordered bulk_write batches.
+    Returns {"inserted", "updated", "errors"}; documents a batch rejects
+    are counted as errors and the remaining batches still run.
+    """
+    if pymongo is None:
+        raise RuntimeError("Loading into MongoDB needs pymongo (pip install pymongo)")
+    report = report or RunReport("load_mongodb")
+    totals = {"inserted": 0, "updated": 0, "errors": 0}
+    operations = upsert_operations(documents)
+    
+    for start in range(0, len(operations), batch_size):
+        batch = operations[start:start + batch_size]
+        with report.stage("bulk_write"):
+            try:
+                result = collection.bulk_write(batch, ordered=False).bulk_api_result
+            except BulkWriteError as e:
+                result = e.details
+                for error in result["writeErrors"]:
+                    print(f"  ✗ {documents[start + error['index']]['rollNumber']}: {error['errmsg']}")
+        totals["inserted"] += result["nUpserted"]
+        totals["updated"] += result["nMatched"]
+        totals["errors"] += len(result.get("writeErrors", []))
+        print(f"✓ Batch {start // batch_size + 1}: {start + len(batch)}/{len(operations)} students")
+    
+    for name, value in totals.items():
+        report.count(name, value)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Bulk-upsert extracted students into the MongoDB Student collection'
+    )
+    parser.add_argument(
+        '--input',
+        default=DEFAULT_INPUT,
+        help=f'all_students.json or results.json to load, JSON array or JSON lines (default: {DEFAULT_INPUT})'
+    )
+    parser.add_argument(
+        '--uri',
+        default=os.environ.get("MONGODB_URI"),
+        help='MongoDB connection string (default: $MONGODB_URI)'
+    )
+    parser.add_argument(
+        '--database',
+        default=None,
+        help=f'Database name (default: the one in the URI, else {DEFAULT_DATABASE})'
+    )
+    parser.add_argument(
+        '--collection',
+        default=DEFAULT_COLLECTION,
+        help=f'Collection name (default: {DEFAULT_COLLECTION})'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f'Upserts per bulk_write call (default: {DEFAULT_BATCH_SIZE})'
+    )
+    parser.add_argument(
+        '--semester',
+        type=int,
+        default=DEFAULT_SEMESTER,
+        help=f'Semester for results.json input, which does not record it (default: {DEFAULT_SEMESTER})'
+    )
+    parser.add_argument(
+        '--branch',
+        default=DEFAULT_BRANCH,
+        help=f'Branch for results.json input (default: {DEFAULT_BRANCH})'
+    )
+    parser.add_argument(
+        '--migrate-only',
+        action='store_true',
+        help='Only normalize the roll numbers already stored, then exit (no --input is read)'
+    )
+    add_report_arguments(parser)
+    
+    args = parser.parse_args()
+    if pymongo is None:
+        parser.error("loading into MongoDB needs pymongo (pip install pymongo)")
+    if not args.uri:
+        parser.error("no MongoDB URI: pass --uri or set MONGODB_URI")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if not args.migrate_only and not Path(args.input).exists():
+        print(f"✗ {args.input} not found")
+        sys.exit(1)
+    
+    with instrumented_run("load_mongodb", args) as report:
+        documents = []
+        if not args.migrate_only:
+            with report.stage("read"):
+                documents = read_documents(args.input, args.semester, args.branch)
+            print(f"✓ Read {len(documents)} students from {args.input}")
+        
+        client = pymongo.MongoClient(args.uri)
+        try:
+            if args.database:
+                database = client[args.database]
+            else:
+                database = client.get_default_database(default=DEFAULT_DATABASE)
+            collection = database[args.collection]
+            # Before the index and the load, so neither trips over old forms
+            migrated = migrate_roll_numbers(collection, args.batch_size, report)
+            ensure_indexes(collection)
+            if args.migrate_only:
+                print(f"✓ {migrated['migrated']} roll numbers normalized in {database.name}.{args.collection}")
+                if migrated["conflicts"]:
+                    print(f"⚠ {migrated['conflicts']} documents need merging by hand")
+                    sys.exit(1)
+                return
+            
+            start = time.perf_counter()
+            totals = load_students(collection, documents, args.batch_size, report)
+            elapsed = time.perf_counter() - start
+        except PyMongoError as e:
+            print(f"✗ MongoDB error: {e}")
+            sys.exit(1)
+        finally:
+            client.close()
+        
+        rate = len(documents) / elapsed if elapsed > 0 else 0
+        report.count("docs_per_second", round(rate))
+        print(f"✓ {totals['inserted']} inserted, {totals['updated']} updated in "
+              f"{database.name}.{args.collection}")
+        print(f"✓ {len(documents)} students in {elapsed:.2f}s ({rate:,.0f} docs/sec)")
+        if totals["errors"]:
+            print(f"⚠ {totals['errors']} students were rejected")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
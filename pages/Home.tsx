@@ -2,9 +2,9 @@ import React, { useState } from 'react';
 import { Search, Wand2, RefreshCw } from 'lucide-react';
 import { GlassCard, GlassInput } from '../components/GlassComponents';
 import { StudentCreditCard } from '../components/StudentCreditCard';
-import { GENERATED_STUDENTS } from '../generatedData';
 import { Student } from '../types';
 import { generateStudentAvatar } from '../services/geminiService';
+import { searchStudents } from '../services/studentDataHelper';
 
 interface HomeProps {
     onSearch: (roll: string) => void;
@@ -16,11 +16,7 @@ const Home: React.FC<HomeProps> = ({ onSearch }) => {
     const [isGeneratingBg, setIsGeneratingBg] = useState(false);
 
     // Filter students based on search
-    const filteredStudents = GENERATED_STUDENTS.filter(s => 
-        s.name.toLowerCase().includes(searchText.toLowerCase()) || 
-        s.rollNumber.includes(searchText) ||
-        s.regNumber.includes(searchText)
-    );
+    const filteredStudents = searchStudents(searchText);
 
     const handleGenerateBackground = async () => {
         setIsGeneratingBg(true);
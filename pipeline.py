@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Run the whole result pipeline in one process.
+
+Replaces running extract_pdf_data.py, rebuild_all_students.py,
+update_student_names_from_pdfs.py and convert_to_app_format.py one after
+the other, each of which reloads everything the previous one just wrote.
+Here the steps are stages of a small DAG that hand their records to each
+other in memory:
+
+  extract   parse the PDFs (through the extraction cache) and write the
+            per-roll result/<roll>.json files
+  merge     combine the per-roll files into all_students.json; students
+            with a PDF take it from the parsed records, the others are
+            read from their per-roll file
+  names     fill in placeholder names from the PDF headers
+  stats     build the app-format students, cohort and subject statistics
+  emit      write generatedData.ts (plus the shards) and the statistics;
+            for a --result_dir other than result/ the app files go to
+            that directory, not the repository root (see --app-dir)
+  columnar  with --columnar, write the flat subjects/students tables
+
+so every PDF is parsed and every artifact read at most once per run.
+
+Each stage has a fingerprint of its own inputs (file stamps, options)
+combined with the results of the stages it depends on. A stage's result
+is a digest of what it produced where that is cheap to compute (so
+re-parsing a touched but unchanged PDF does not re-run everything after
+extract), else its fingerprint. Fingerprints, results and the stamps of
+every file the stages wrote are kept in result/.cache/pipeline.state.json;
+a stage whose fingerprint is unchanged and whose outputs are untouched
+since the last run is skipped. A skipped
+stage's result is only loaded (e.g. all_students.json read) when a later
+stage that does have to run asks for it.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from combined_students import (CACHE_DIR_NAME, CombinedStudents, atomic_write_json, file_stamp,
+                               student_json_files)
+from columnar_export import (COLUMNAR_DIR_NAME, add_columnar_arguments, columnar_files,
+                             validate_columnar_argument, write_columnar)
+from convert_to_app_format import (DEFAULT_SHARD_DIR, DEFAULT_SHARD_SIZE, add_app_dir_argument, app_output_files,
+                                   app_output_paths, build_app_data, resolve_app_dir, write_app_outputs)
+from extract_pdf_data import PARSER_VERSION, iter_marksheets, save_marksheet
+from extraction_cache import add_cache_arguments, open_cache
+from rebuild_all_students import is_placeholder_name, load_existing_student_info, placeholder_identity
+from run_report import add_report_arguments, instrumented_run
+from text_backends import add_backend_arguments, validate_backend_argument
+
+
+STATE_FILE_NAME = "pipeline.state.json"
+
+
+def fingerprint(data):
+    """Stable short hash of any JSON-serialisable value."""
+    text = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def stamps(paths):
+    """{path: (mtime_ns, size)} for paths, None for missing files."""
+    result = {}
+    for path in paths:
+        try:
+            stamp = file_stamp(path)
+        except FileNotFoundError:
+            result[str(path)] = None
+            continue
+        result[str(path)] = [stamp["mtime_ns"], stamp["size"]]
+    return result
+
+
+@dataclass
+class Stage:
+    """
+    One node of the pipeline DAG.
+    
+    run(pipeline, *dependency values) does the work and returns the value
+    handed to later stages. inputs(pipeline) describes what the stage reads
+    besides its dependencies; outputs(pipeline, value) lists the files it
+    wrote. digest(pipeline, value) summarises the value for the stages
+    that depend on it. load(pipeline) rebuilds the value of a skipped stage
+    from its artifacts; without it a skipped stage is simply run when needed.
+    """
+    name: str
+    deps: tuple
+    run: object
+    inputs: object = None
+    outputs: object = None
+    digest: object = None
+    load: object = None
+
+
+@dataclass
+class Extracted:
+    """What the extract stage hands on: per-roll records and header info."""
+    records: dict = field(default_factory=dict)
+    info: dict = field(default_factory=dict)
+
+
+def extract_stage(pipeline):
+    """Parse every PDF and write the per-roll JSON files."""
+    pdf_files = pipeline.pdf_files()
+    print(f"Found {len(pdf_files)} PDF files")
+    extracted = Extracted()
+    cache = open_cache(pipeline.result_path, PARSER_VERSION, pipeline.no_cache, pipeline.rebuild_cache)
+    marksheets = iter_marksheets(pdf_files, pipeline.workers, cache, pipeline.report, pipeline.crop,
+                                 pipeline.backend)
+    for pdf_file, marksheet, error in marksheets:
+        print(f"  {pdf_file.name}")
+        if save_marksheet(pipeline.result_path, pdf_file, marksheet, error, pipeline.report):
+            extracted.records[marksheet.roll_number] = marksheet.to_dict()
+        if not error:
+            extracted.info[marksheet.roll_number] = {
+                "name": marksheet.name, "registration_number": marksheet.registration_number
+            }
+    if cache is not None:
+        cache.close()
+        print(f"✓ {cache.summary()}")
+    pipeline.report.count("students", len(extracted.records))
+    return extracted
+
+
+def extract_inputs(pipeline):
+    return {"parser_version": PARSER_VERSION, "pdfs": stamps(pipeline.pdf_files())}
+
+
+def extract_outputs(pipeline, extracted):
+    return [pipeline.result_path / f"{roll_number}.json" for roll_number in extracted.records]
+
+
+def extract_digest(pipeline, extracted):
+    return fingerprint({"records": extracted.records, "info": extracted.info})
+
+
+def merge_stage(pipeline, extracted):
+    """
+    Bring all_students.json in line with the per-roll files. Students
+    parsed from a PDF in this run are taken as parsed; the rest are re-read
+    only if their per-roll file changed, keeping their known name.
+    """
+    store = CombinedStudents(pipeline.result_path)
+    json_files = student_json_files(pipeline.result_path)
+    current_rolls = {f.stem for f in json_files}
+    for roll_number in store.rolls():
+        if roll_number not in current_rolls:
+            store.remove(roll_number)
+    
+    # Only needed for students we have no name for yet
+    existing_students = None
+    for json_file in json_files:
+        roll_number = json_file.stem
+        changed = store.source_changed(json_file)
+        record = extracted.records.get(roll_number)
+        if record is None:
+            if roll_number in store and not changed:
+                continue
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    subjects = json.load(f)
+            except (OSError, ValueError) as e:
+                # Not merged: make the next run try this file again
+                store.forget_source(roll_number)
+                print(f"  ✗ Error processing {json_file}: {e}")
+                continue
+            
+            current = store.get(roll_number)
+            if current is not None:
+                name, reg_number = current['name'], current['registration_number']
+            else:
+                if existing_students is None:
+                    existing_students = load_existing_student_info(pipeline.result_path)
+                if roll_number in existing_students:
+                    name = existing_students[roll_number]['name']
+                    reg_number = existing_students[roll_number]['regNumber']
+                else:
+                    name, reg_number = placeholder_identity(roll_number)
+            record = {
+                "roll_number": roll_number,
+                "registration_number": reg_number,
+                "name": name,
+                "subjects": subjects
+            }
+        store.upsert(record)
+    
+    upserted, removed = len(store.upserted), len(store.removed)
+    store.save()
+    print(f"✓ all_students.json: {upserted} updated, {removed} removed ({len(store)} students)")
+    return store
+
+
+def merge_inputs(pipeline):
+    return {"sources": stamps(student_json_files(pipeline.result_path))}
+
+
+def combined_outputs(pipeline, store):
+    return [store.path]
+
+
+def combined_digest(pipeline, store):
+    return fingerprint(store.fragments)
+
+
+def load_combined(pipeline):
+    return CombinedStudents(pipeline.result_path)
+
+
+def names_stage(pipeline, store, extracted):
+    """Replace placeholder names with the ones printed on the PDFs."""
+    updated = 0
+    for roll_number, info in extracted.info.items():
+        student = store.get(roll_number)
+        if student is not None and is_placeholder_name(student['name']):
+            student['name'] = info['name'] or student['name']
+            student['registration_number'] = info['registration_number'] or student['registration_number']
+            store.upsert(student)
+            updated += 1
+    store.save()
+    print(f"✓ Updated {updated} student names")
+    return store
+
+
+def stats_stage(pipeline, store):
+    """Returns (records, students, cohort, subject_stats)."""
+    records = store.students()
+    students, cohort, subject_stats = build_app_data(records)
+    print(f"✓ Built app data for {len(students)} students")
+    return records, students, cohort, subject_stats
+
+
+def emit_stage(pipeline, app_data):
+    write_app_outputs(*app_data[1:], **pipeline.app_options)
+    pipeline.report.count("emitted", len(app_data[1]))
+
+
+def emit_inputs(pipeline):
+    return pipeline.app_options
+
+
+def emit_outputs(pipeline, value):
+    return app_output_files(**pipeline.app_options)
+
+
+def columnar_stage(pipeline, app_data):
+    records, students = app_data[:2]
+    write_columnar(records, students, **pipeline.columnar_options)
+
+
+def columnar_inputs(pipeline):
+    return pipeline.columnar_options
+
+
+def columnar_outputs(pipeline, value):
+    return columnar_files(**pipeline.columnar_options).values()
+
+
+STAGES = (
+    Stage("extract", (), extract_stage, extract_inputs, extract_outputs, extract_digest),
+    Stage("merge", ("extract",), merge_stage, merge_inputs, combined_outputs, combined_digest, load_combined),
+    Stage("names", ("merge", "extract"), names_stage, None, combined_outputs, combined_digest,
+          lambda pipeline: pipeline.value("merge")),
+    Stage("stats", ("names",), stats_stage),
+    Stage("emit", ("stats",), emit_stage, emit_inputs, emit_outputs),
+)
+# Only part of the DAG when columnar output is asked for
+COLUMNAR_STAGE = Stage("columnar", ("stats",), columnar_stage, columnar_inputs, columnar_outputs)
+
+
+class Pipeline:
+    """
+    Runs STAGES in dependency order for one result directory, skipping
+    stages that are up to date.
+    """
+    
+    def __init__(self, result_dir="result", workers=None, no_cache=False, rebuild_cache=False, crop=False,
+                 backend=None, sharded=False, shard_dir=None, shard_size=DEFAULT_SHARD_SIZE, compact=False,
+                 columnar=None, columnar_dir=None, report=None, stages=None, app_dir=None):
+        self.result_path = Path(result_dir)
+        self.workers = workers
+        self.no_cache = no_cache
+        self.rebuild_cache = rebuild_cache
+        self.crop = crop
+        self.backend = backend
+        # Resolved output locations are part of the emit and columnar
+        # fingerprints, so writing somewhere else re-runs those stages
+        app_dir = resolve_app_dir(result_dir, app_dir)
+        self.app_options = {
+            "sharded": sharded, "shard_size": shard_size, "compact": compact,
+            "result_dir": str(self.result_path), "app_dir": str(app_dir),
+            "shard_dir": str(app_output_paths(result_dir, app_dir, shard_dir)["shard_dir"])
+        }
+        if columnar_dir is None:
+            columnar_dir = self.result_path / COLUMNAR_DIR_NAME
+        self.columnar_options = {"output_dir": str(columnar_dir), "fmt": columnar}
+        self.report = report
+        if stages is None:
+            stages = STAGES + ((COLUMNAR_STAGE,) if columnar else ())
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = self.result_path / CACHE_DIR_NAME / STATE_FILE_NAME
+        self.values = {}
+        self._pdf_files = None
+        for stage in stages:
+            unknown = [dep for dep in stage.deps if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {', '.join(unknown)}")
+    
+    def pdf_files(self):
+        if self._pdf_files is None:
+            self._pdf_files = sorted(self.result_path.glob("*.pdf"))
+        return self._pdf_files
+    
+    def order(self):
+        """Stage names in dependency order (declaration order among equals)."""
+        ordered, visiting = [], set()
+        
+        def visit(name):
+            if name in ordered:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline stages form a cycle through '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            ordered.append(name)
+        
+        for name in self.stages:
+            visit(name)
+        return ordered
+    
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return state.get("stages", {}) if isinstance(state, dict) else {}
+    
+    def value(self, name):
+        """The value of a stage: computed this run, loaded, or computed now."""
+        if name not in self.values:
+            stage = self.stages[name]
+            if stage.load is not None:
+                self.values[name] = stage.load(self)
+            else:
+                self._execute(stage)
+        return self.values[name]
+    
+    def _execute(self, stage):
+        args = [self.value(dep) for dep in stage.deps]
+        print(f"\n▶ {stage.name}")
+        with self.report.stage(stage.name):
+            self.values[stage.name] = stage.run(self, *args)
+    
+    def run(self, force=False):
+        """
+        Run every stage that is out of date (all of them with force) and
+        record the new state. Returns the names of the stages that ran.
+        """
+        previous = self._load_state()
+        fingerprints, results, outputs, ran = {}, {}, {}, []
+        for name in self.order():
+            stage = self.stages[name]
+            inputs = stage.inputs(self) if stage.inputs is not None else None
+            fingerprints[name] = fingerprint({
+                "inputs": inputs, "deps": [results[dep] for dep in stage.deps]
+            })
+            recorded = previous.get(name, {})
+            up_to_date = (
+                not force
+                and recorded.get("fingerprint") == fingerprints[name]
+                and recorded.get("outputs") == stamps(recorded.get("outputs", {}))
+            )
+            if up_to_date:
+                print(f"✓ {name}: up to date")
+                self.report.count("skipped_stages")
+                outputs[name] = list(recorded.get("outputs", {}))
+                results[name] = recorded.get("result", fingerprints[name])
+                continue
+            if name not in self.values:
+                self._execute(stage)
+            ran.append(name)
+            outputs[name] = (
+                [str(path) for path in stage.outputs(self, self.values[name])]
+                if stage.outputs is not None else []
+            )
+            results[name] = (
+                stage.digest(self, self.values[name]) if stage.digest is not None else fingerprints[name]
+            )
+        
+        # Stamped last: later stages may rewrite what an earlier one wrote
+        state = {
+            name: {"fingerprint": fingerprints[name], "result": results[name], "outputs": stamps(outputs[name])}
+            for name in fingerprints
+        }
+        atomic_write_json(self.state_path, {"stages": state}, indent=2)
+        return ran
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Extract, combine, fix names and convert in one run, skipping up-to-date stages'
+    )
+    parser.add_argument(
+        '--result_dir',
+        default='result',
+        help='Directory containing PDF files (default: result)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of parser processes (default: CPU count, 1 = serial)'
+    )
+    parser.add_argument(
+        '--crop',
+        action='store_true',
+        help='Extract only the header block and subject table (see extract_pdf_data.py)'
+    )
+    add_backend_arguments(parser)
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Run every stage even if its inputs are unchanged'
+    )
+    parser.add_argument(
+        '--sharded',
+        action='store_true',
+        help='Also write roll-number shards next to generatedData.ts (see convert_to_app_format.py)'
+    )
+    add_app_dir_argument(parser)
+    parser.add_argument(
+        '--shard-dir',
+        default=None,
+        help=f'Output directory for shards (default: <app dir>/{DEFAULT_SHARD_DIR})'
+    )
+    parser.add_argument(
+        '--shard-size',
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help=f'Students per shard (default: {DEFAULT_SHARD_SIZE})'
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Minify the app data and write .gz/.br siblings for sharded files'
+    )
+    add_columnar_arguments(parser)
+    add_cache_arguments(parser)
+    add_report_arguments(parser)
+    
+    args = parser.parse_args()
+    validate_backend_argument(parser, args)
+    validate_columnar_argument(parser, args)
+    
+    if not Path(args.result_dir).is_dir():
+        print(f"✗ {args.result_dir} is not a directory")
+        sys.exit(1)
+    
+    with instrumented_run("pipeline", args) as report:
+        pipeline = Pipeline(
+            args.result_dir,
+            workers=args.workers,
+            no_cache=args.no_cache,
+            rebuild_cache=args.rebuild_cache,
+            crop=args.crop,
+            backend=args.backend,
+            sharded=args.sharded,
+            shard_dir=args.shard_dir,
+            shard_size=args.shard_size,
+            compact=args.compact,
+            columnar=args.columnar,
+            columnar_dir=args.columnar_dir,
+            report=report,
+            app_dir=args.app_dir
+        )
+        ran = pipeline.run(force=args.force)
+    
+    if ran:
+        print(f"\n✓ Pipeline finished: ran {', '.join(ran)}")
+    else:
+        print("\n✓ Pipeline finished: everything up to date")
+
+
+if __name__ == "__main__":
+    main()
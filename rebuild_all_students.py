@@ -3,18 +3,30 @@
 Rebuild all_students.json from individual student JSON files and existing app format data.
 """
 
+import argparse
 import json
 from pathlib import Path
 
+from combined_students import CombinedStudents, student_json_files
 
-def rebuild_all_students_json(result_dir="result"):
+
+PLACEHOLDER_NAME_PREFIX = "STUDENT "
+
+
+def placeholder_identity(roll_number):
     """
-    Rebuild all_students.json from all individual JSON files.
-    Uses existing students_app_format.json for student names and registration numbers.
+    Name and registration number for a student whose PDF has not been
+    read yet; convert_to_app_format / update_student_names replace them.
     """
-    result_path = Path(result_dir)
-    
-    # Load existing student info from students_app_format.json
+    return f"{PLACEHOLDER_NAME_PREFIX}{roll_number[-3:]}", roll_number.replace("21127152", "127152")
+
+
+def is_placeholder_name(name):
+    return name.startswith(PLACEHOLDER_NAME_PREFIX)
+
+
+def load_existing_student_info(result_path):
+    """Load name and registration number per roll from students_app_format.json."""
     app_format_file = result_path / "students_app_format.json"
     existing_students = {}
     
@@ -28,15 +40,49 @@ def rebuild_all_students_json(result_dir="result"):
                 }
         print(f"Loaded info for {len(existing_students)} existing students")
     
+    return existing_students
+
+
+def rebuild_all_students_json(result_dir="result", incremental=False):
+    """
+    Rebuild all_students.json from all individual JSON files.
+    Uses existing students_app_format.json for student names and registration numbers.
+    
+    With incremental=True only per-roll files whose mtime/hash changed since
+    the last run are re-read and upserted, students whose file was deleted are
+    dropped, and everyone else is left untouched (including names fixed by
+    update_student_names_from_pdfs.py). Falls back to a full rebuild when no
+    up-to-date state is recorded for the current all_students.json.
+    
+    Returns the CombinedStudents store that was written.
+    """
+    result_path = Path(result_dir)
+    store = CombinedStudents(result_path)
+    
     # Get all JSON files except all_students.json and students_app_format.json
-    json_files = [f for f in result_path.glob("*.json") 
-                  if f.stem not in ['all_students', 'students_app_format']]
+    json_files = student_json_files(result_path)
     
     print(f"Found {len(json_files)} student JSON files")
     
-    all_students_data = []
+    if incremental and store.state_is_current:
+        current_rolls = {f.stem for f in json_files}
+        for roll_number in store.rolls():
+            if roll_number not in current_rolls:
+                store.remove(roll_number)
+        changed_files = [f for f in json_files if store.source_changed(f)]
+        print(f"Incremental mode: {len(changed_files)} changed, {len(store.removed)} removed")
+    else:
+        if incremental:
+            print("Incremental mode: no up-to-date state recorded, doing a full rebuild")
+        store.clear()
+        for json_file in json_files:
+            store.source_changed(json_file)
+        changed_files = json_files
     
-    for json_file in sorted(json_files):
+    # Only needed for students we have no name for yet
+    existing_students = None
+    
+    for json_file in changed_files:
         try:
             with open(json_file, 'r', encoding='utf-8') as f:
                 subjects = json.load(f)
@@ -44,14 +90,21 @@ def rebuild_all_students_json(result_dir="result"):
             # Extract roll number from filename
             roll_number = json_file.stem
             
-            # Get student info from existing data or generate placeholder
-            if roll_number in existing_students:
-                name = existing_students[roll_number]['name']
-                reg_number = existing_students[roll_number]['regNumber']
+            current = store.get(roll_number)
+            if current is not None:
+                name = current['name']
+                reg_number = current['registration_number']
             else:
-                # For new students, generate placeholder that convert script will update
-                name = f"STUDENT {roll_number[-3:]}"
-                reg_number = roll_number.replace("21127152", "127152")
+                if existing_students is None:
+                    existing_students = load_existing_student_info(result_path)
+                
+                # Get student info from existing data or generate placeholder
+                if roll_number in existing_students:
+                    name = existing_students[roll_number]['name']
+                    reg_number = existing_students[roll_number]['regNumber']
+                else:
+                    # For new students, generate placeholder that convert script will update
+                    name, reg_number = placeholder_identity(roll_number)
             
             # Create data structure
             student_data = {
@@ -61,25 +114,50 @@ def rebuild_all_students_json(result_dir="result"):
                 "subjects": subjects
             }
             
-            all_students_data.append(student_data)
-            
+            store.upsert(student_data)
+        
         except Exception as e:
+            # Not merged: make the next incremental run try this file again
+            store.forget_source(json_file.stem)
             print(f"Error processing {json_file}: {e}")
     
+    upserted, removed = len(store.upserted), len(store.removed)
+    
     # Write combined data file
-    combined_file = result_path / "all_students.json"
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(all_students_data, f, indent=2, ensure_ascii=False)
+    if store.save(force=not incremental):
+        print(f"\n✓ Rebuilt all_students.json with {len(store)} students "
+              f"({upserted} updated, {removed} removed)")
+        print(f"✓ Combined data saved to {store.path}")
+    else:
+        print(f"\n✓ all_students.json already up to date ({len(store)} students)")
     
-    print(f"\n✓ Rebuilt all_students.json with {len(all_students_data)} students")
-    print(f"✓ Combined data saved to {combined_file}")
+    # Print roll number range (a stray non-roll JSON file must not crash the summary)
+    roll_numbers = [int(roll) for roll in store.rolls() if roll.isdigit()]
+    if roll_numbers:
+        print(f"✓ Roll numbers range: {min(roll_numbers)} to {max(roll_numbers)}")
+    
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Rebuild all_students.json from per-roll JSON files'
+    )
+    parser.add_argument(
+        '--result_dir',
+        default='result',
+        help='Directory containing the per-roll JSON files (default: result)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only re-read per-roll files that changed since the last run'
+    )
     
-    # Print roll number range
-    roll_numbers = sorted([int(s['roll_number']) for s in all_students_data])
-    print(f"✓ Roll numbers range: {min(roll_numbers)} to {max(roll_numbers)}")
+    args = parser.parse_args()
     
-    return all_students_data
+    rebuild_all_students_json(args.result_dir, incremental=args.incremental)
 
 
 if __name__ == "__main__":
-    students_data = rebuild_all_students_json()
+    main()
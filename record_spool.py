@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Crash-safe staging of parsed records for the extraction scripts.
+
+Instead of collecting every student in a list and writing the output at
+the very end, each parsed record is appended to a JSON-lines spool file as
+soon as its PDF finishes. Every CHECKPOINT_EVERY records the spool is
+fsynced and its length recorded in a checkpoint file. When the run
+completes, the records are read back one at a time in sort-key order and
+streamed to the real output, and the spool is deleted.
+
+If a run dies, the spool and checkpoint stay behind. The next run with the
+same settings truncates the spool to the last checkpoint and skips every
+PDF recorded there whose size and mtime are unchanged, so only the files
+after the last checkpoint are parsed again.
+
+Only the sort key and byte offset of each record are kept in memory.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from combined_students import atomic_write_json, file_stamp
+
+
+CHECKPOINT_EVERY = 50
+SPOOL_SUFFIX = ".partial.jsonl"
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+
+class RecordSpool:
+    """
+    Append-only spool of (source file, sort key, record) entries with
+    periodic checkpoints.
+    
+    `settings` describes everything that determines the records (parser
+    version, output layout, ...); a checkpoint written under different
+    settings is discarded rather than resumed.
+    """
+    
+    def __init__(self, spool_dir, name, settings, checkpoint_every=CHECKPOINT_EVERY, resume=True):
+        spool_dir = Path(spool_dir)
+        spool_dir.mkdir(parents=True, exist_ok=True)
+        self.path = spool_dir / f"{name}{SPOOL_SUFFIX}"
+        self.checkpoint_path = spool_dir / f"{name}{CHECKPOINT_SUFFIX}"
+        self.settings = settings
+        self.checkpoint_every = max(1, checkpoint_every)
+        # file name -> (sort key, byte offset, stamp) of its latest entry
+        self._index = {}
+        self._since_checkpoint = 0
+        
+        offset = self._load_checkpoint() if resume else 0
+        self._file = open(self.path, 'a+b')
+        self._file.truncate(offset)
+        self._file.seek(offset)
+    
+    def _load_checkpoint(self):
+        """Index the checkpointed part of an earlier spool; returns its length."""
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return 0
+        if checkpoint.get("settings") != self.settings or not self.path.exists():
+            return 0
+        
+        length = checkpoint.get("offset", 0)
+        if self.path.stat().st_size < length:
+            return 0
+        
+        try:
+            with open(self.path, 'rb') as f:
+                offset = 0
+                while offset < length:
+                    line = f.readline()
+                    entry = json.loads(line)
+                    self._index[entry["file"]] = (entry["key"], offset, entry["stamp"])
+                    offset += len(line)
+        except (ValueError, KeyError):
+            self._index.clear()
+            return 0
+        return length
+    
+    def __len__(self):
+        return len(self._index)
+    
+    def is_done(self, pdf_file):
+        """True if pdf_file was spooled by an earlier run and has not changed since."""
+        entry = self._index.get(Path(pdf_file).name)
+        if entry is None:
+            return False
+        try:
+            return entry[2] == file_stamp(pdf_file)
+        except FileNotFoundError:
+            return False
+    
+    def pending(self, pdf_files):
+        """
+        Return the pdf_files that still need parsing, i.e. all but those
+        spooled unchanged by an earlier run. Entries for PDFs that changed
+        or disappeared since are forgotten.
+        """
+        done = {}
+        pending = []
+        for pdf_file in pdf_files:
+            if self.is_done(pdf_file):
+                name = Path(pdf_file).name
+                done[name] = self._index[name]
+            else:
+                pending.append(pdf_file)
+        self._index = done
+        return pending
+    
+    def append(self, pdf_file, key, record):
+        """Spool one record; checkpoints every checkpoint_every appends."""
+        pdf_file = Path(pdf_file)
+        entry = {"file": pdf_file.name, "key": key, "stamp": file_stamp(pdf_file), "record": record}
+        offset = self._file.tell()
+        self._file.write(json.dumps(entry, ensure_ascii=False).encode('utf-8') + b"\n")
+        self._index[pdf_file.name] = (key, offset, entry["stamp"])
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+    
+    def checkpoint(self):
+        """Make everything spooled so far durable and resumable."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        atomic_write_json(self.checkpoint_path, {"settings": self.settings, "offset": self._file.tell()})
+        self._since_checkpoint = 0
+    
+    def records(self):
+        """
+        Yield spooled records ordered by (sort key, file name), reading each
+        from disk only when it is needed.
+        """
+        self._file.flush()
+        order = sorted((key, name, offset) for name, (key, offset, _) in self._index.items())
+        with open(self.path, 'rb') as f:
+            for _, _, offset in order:
+                f.seek(offset)
+                yield json.loads(f.readline())["record"]
+    
+    def close(self):
+        """Close the spool, leaving it and its checkpoint for a later resume."""
+        if not self._file.closed:
+            self.checkpoint()
+            self._file.close()
+    
+    def discard(self):
+        """Delete the spool and checkpoint once the output has been written."""
+        self._file.close()
+        for path in (self.checkpoint_path, self.path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def add_checkpoint_arguments(parser):
+    """Register the --checkpoint-every / --restart switches on an argparse parser."""
+    parser.add_argument(
+        '--checkpoint-every',
+        type=int,
+        default=CHECKPOINT_EVERY,
+        help=f'Make parsed records durable every N files so an interrupted run '
+             f'resumes from there (default: {CHECKPOINT_EVERY})'
+    )
+    parser.add_argument(
+        '--restart',
+        action='store_true',
+        help='Ignore the checkpoint left by an interrupted run and parse every PDF '
+             '(with --resume: put every file in the job manifest back in the queue)'
+    )
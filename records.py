@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Typed, compact records for students and their subjects.
+
+The JSON files keep every number as the text printed on the mark sheet
+("credits": "1.0", "total_marks": "015"). Subject parses those once into
+ints and floats and keeps the zero-padding width needed to write the same
+text back, so to_dict() round-trips every per-roll and all_students.json
+file byte for byte. A number printed some other way ("7.50", "+5") is
+parsed all the same and its text kept next to it for writing back. A
+token that is not a number at all is kept as its (interned) text rather
+than guessed at.
+
+Subjects and students are slotted dataclasses. Subject names, categories
+and unknown grades are interned and known grades are Grade members, so the
+tens of thousands of subject rows in a large cohort share their strings.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from enum import Enum
+
+
+class Grade(str, Enum):
+    """Letter grades printed on the mark sheets, best first."""
+    A_PLUS = "A+"
+    A = "A"
+    B_PLUS = "B+"
+    B = "B"
+    C = "C"
+    D = "D"
+    E = "E"
+    F = "F"
+    
+    def __str__(self):
+        return self.value
+    
+    @property
+    def points(self):
+        return _GRADE_POINTS[self]
+    
+    @classmethod
+    def parse(cls, text):
+        """The Grade for text, or the interned text itself if it is not a known grade."""
+        grade = cls._value2member_map_.get(text)
+        return grade if grade is not None else sys.intern(text)
+
+
+_GRADE_POINTS = {
+    Grade.A_PLUS: 10, Grade.A: 9, Grade.B_PLUS: 8, Grade.B: 7,
+    Grade.C: 6, Grade.D: 5, Grade.E: 4, Grade.F: 0
+}
+
+# One shared tuple per distinct combination of column widths
+_WIDTHS = {}
+# "THEORY" -> "Theory", computed once per category
+_TITLES = {}
+
+
+def _parse_int(text):
+    """
+    (value, width, exact): an int and the width it was printed with, None
+    for "", or the interned text. exact is False when _int_text cannot
+    rebuild text from value and width (e.g. "+5").
+    """
+    if not text:
+        return None, 0, True
+    try:
+        value = int(text)
+    except ValueError:
+        return sys.intern(text), 0, True
+    if f"{value:0{len(text)}d}" != text:
+        return value, 0, False
+    return value, len(text), True
+
+
+def _parse_float(text):
+    """(value, exact): like _parse_int, without a width ("7.50" is not exact)."""
+    if not text:
+        return None, True
+    try:
+        value = float(text)
+    except ValueError:
+        return sys.intern(text), True
+    return value, repr(value) == text
+
+
+def _int_text(value, width):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return f"{value:0{width}d}"
+
+
+def _float_text(value):
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else repr(value)
+
+
+def _as_int(value):
+    """Like int() on the original text: None stays None, unparsed text raises ValueError."""
+    if isinstance(value, str):
+        raise ValueError(f"invalid literal for int(): {value!r}")
+    return value
+
+
+@dataclass(slots=True)
+class Subject:
+    """
+    One row of a mark sheet's subject table.
+    
+    Numeric fields are int (float for credits), None when the column was
+    empty, or the original text when it was not a number. widths holds the
+    printed widths of total_marks, marks_internal, marks_final and
+    marks_total. texts holds the printed text of credits and those four
+    columns when one of them cannot be rebuilt from its value, else None.
+    """
+    name: str
+    category: str
+    credits: object
+    total_marks: object
+    marks_internal: object
+    marks_final: object
+    marks_total: object
+    grade: object
+    widths: tuple = (0, 0, 0, 0)
+    texts: tuple = None
+    
+    @classmethod
+    def from_text(cls, name, category, credits, total_marks, marks_internal, marks_final, marks_total, grade):
+        """Build a subject from the text of each column."""
+        printed = (credits, total_marks, marks_internal, marks_final, marks_total)
+        credits, credits_exact = _parse_float(credits)
+        total_marks, total_width, total_exact = _parse_int(total_marks)
+        marks_internal, internal_width, internal_exact = _parse_int(marks_internal)
+        marks_final, final_width, final_exact = _parse_int(marks_final)
+        marks_total, obtained_width, obtained_exact = _parse_int(marks_total)
+        widths = (total_width, internal_width, final_width, obtained_width)
+        exact = credits_exact and total_exact and internal_exact and final_exact and obtained_exact
+        return cls(
+            sys.intern(name),
+            sys.intern(category),
+            credits,
+            total_marks,
+            marks_internal,
+            marks_final,
+            marks_total,
+            Grade.parse(grade),
+            _WIDTHS.setdefault(widths, widths),
+            None if exact else tuple(sys.intern(text) for text in printed)
+        )
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a subject from the per-roll / all_students.json layout."""
+        return cls.from_text(
+            data["subject_name"], data["category"], data["credits"], data["total_marks"],
+            data["marks_internal"], data["marks_final"], data["marks_total"], data["grade"]
+        )
+    
+    def to_dict(self):
+        """Return the subject in the per-roll / all_students.json layout."""
+        if self.texts is not None:
+            credits, total_marks, marks_internal, marks_final, marks_total = self.texts
+        else:
+            total_width, internal_width, final_width, obtained_width = self.widths
+            credits = _float_text(self.credits)
+            total_marks = _int_text(self.total_marks, total_width)
+            marks_internal = _int_text(self.marks_internal, internal_width)
+            marks_final = _int_text(self.marks_final, final_width)
+            marks_total = _int_text(self.marks_total, obtained_width)
+        return {
+            "subject_name": self.name,
+            "credits": credits,
+            "total_marks": total_marks,
+            "marks_internal": marks_internal,
+            "marks_final": marks_final,
+            "marks_total": marks_total,
+            "grade": str(self.grade),
+            "category": self.category
+        }
+    
+    def to_app_dict(self):
+        """
+        Return the subject in the application format. Raises ValueError if
+        the marks or credits were not numbers.
+        """
+        title = _TITLES.get(self.category)
+        if title is None:
+            title = _TITLES[self.category] = self.category.title()
+        credits = self.credits
+        if isinstance(credits, str):
+            raise ValueError(f"could not convert credits to float: {credits!r}")
+        return {
+            "name": self.name,
+            "category": title,
+            "maxMarks": _as_int(self.total_marks) or 0,
+            "obtainedMarks": _as_int(self.marks_total) or 0,
+            "credits": credits or 0.0,
+            "grade": str(self.grade),
+            "isBacklog": False  # Default to False, can be updated based on grade or pass marks
+        }
+    
+    def to_results_dict(self):
+        """
+        Return the subject in the results.json layout (marks as ints or
+        None). Raises ValueError if the marks were not numbers.
+        """
+        return {
+            "name": self.name,
+            "marks_internal": _as_int(self.marks_internal),
+            "marks_final": _as_int(self.marks_final),
+            "marks_total": _as_int(self.marks_total),
+            "max_marks": _as_int(self.total_marks),
+            "grade": str(self.grade)
+        }
+    
+    def __reduce__(self):
+        # Re-intern the strings when a subject comes back from a worker process
+        return _restore_subject, (
+            self.name, self.category, self.credits, self.total_marks, self.marks_internal,
+            self.marks_final, self.marks_total, self.grade, self.widths, self.texts
+        )
+
+
+def _restore_subject(name, category, credits, total_marks, marks_internal, marks_final, marks_total, grade,
+                     widths, texts=None):
+    intern = lambda value: sys.intern(value) if type(value) is str else value
+    if texts is not None:
+        texts = tuple(sys.intern(text) for text in texts)
+    return Subject(
+        sys.intern(name), sys.intern(category), intern(credits), intern(total_marks), intern(marks_internal),
+        intern(marks_final), intern(marks_total), intern(grade), _WIDTHS.setdefault(widths, widths), texts
+    )
+
+
+@dataclass(slots=True)
+class Student:
+    """Everything parsed from a single mark sheet PDF."""
+    roll_number: str
+    registration_number: str
+    name: str
+    subjects: list = field(default_factory=list)
+    
+    def subject_dicts(self):
+        """The subjects in the per-roll <roll>.json layout."""
+        return [subject.to_dict() for subject in self.subjects]
+    
+    def to_dict(self):
+        """Return the record in the all_students.json layout."""
+        return {
+            "roll_number": self.roll_number,
+            "registration_number": self.registration_number,
+            "name": self.name,
+            "subjects": self.subject_dicts()
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from the all_students.json layout."""
+        return cls(
+            roll_number=data["roll_number"],
+            registration_number=data.get("registration_number", ""),
+            name=data.get("name", ""),
+            subjects=[Subject.from_dict(subject) for subject in data.get("subjects", [])]
+        )
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Timing and profiling hooks for the extraction scripts.
+
+A RunReport collects per-stage durations (context-manager timers that
+accumulate across calls), per-file timings for parsed PDFs and a few
+counters, and writes them as a machine-readable JSON run report. With
+--profile the run is also wrapped in cProfile and tracemalloc, and the
+hottest functions and allocation sites are added to the report.
+"""
+
+import contextlib
+import cProfile
+import io
+import pstats
+import resource
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from combined_students import atomic_write_json
+
+
+DEFAULT_REPORT_FILE = "run_report.json"
+DEFAULT_SLOWEST = 10
+PROFILE_TOP_FUNCTIONS = 25
+PROFILE_TOP_ALLOCATIONS = 15
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def children_peak_rss_mb():
+    """Peak resident set size of the largest finished child process, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _mb(size):
+    return round(size / (1 << 20), 2)
+
+
+class _Frame:
+    __slots__ = ("child_peak",)
+    
+    def __init__(self):
+        self.child_peak = 0
+
+
+class RunReport:
+    """
+    Per-stage and per-file measurements for one script run.
+    
+    Stages may be entered repeatedly (their time and call count add up) and
+    may nest. Memory is recorded as the process's peak RSS after each stage
+    and, while tracemalloc is tracing, as the peak Python allocation within
+    the stage.
+    """
+    
+    def __init__(self, command, slowest=DEFAULT_SLOWEST):
+        self.command = command
+        self.slowest = slowest
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.stages = {}
+        self.files = []
+        self.counters = {}
+        self.profile = None
+        self._profiler = None
+        self._frames = []
+    
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a block and add it to the named stage."""
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            if self._frames:
+                parent = self._frames[-1]
+                parent.child_peak = max(parent.child_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = _Frame()
+        self._frames.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._frames.pop()
+            entry = self.add_time(name, time.perf_counter() - start)
+            if tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], frame.child_peak)
+                entry["alloc_peak_mb"] = max(entry.get("alloc_peak_mb", 0), _mb(peak))
+                if self._frames:
+                    parent = self._frames[-1]
+                    parent.child_peak = max(parent.child_peak, peak)
+    
+    def add_time(self, name, seconds):
+        """Add seconds measured elsewhere to the named stage; returns its entry."""
+        entry = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += 1
+        entry["peak_rss_mb"] = round(peak_rss_mb(), 1)
+        return entry
+    
+    def add_file(self, path, status, seconds=0.0, **details):
+        """Record one input file (status is 'parsed', 'cached' or 'error')."""
+        entry = {"file": str(path), "status": status, "seconds": round(seconds, 4)}
+        entry.update(details)
+        self.files.append(entry)
+    
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+    
+    def worker_peak_rss_mb(self):
+        """
+        Peak RSS of the largest parser process: reported by the workers with
+        each file, or measured by the OS for workers that have exited.
+        None when no file was parsed, since the OS figure then comes from
+        unrelated child processes.
+        """
+        reported = [f["worker_peak_rss_mb"] for f in self.files if "worker_peak_rss_mb" in f]
+        if not reported:
+            return None
+        return round(max(max(reported), children_peak_rss_mb()), 1)
+    
+    def memory_summary(self):
+        """One line with the run's peak memory use."""
+        summary = f"Peak RSS: {peak_rss_mb():.1f} MB main process"
+        worker_peak = self.worker_peak_rss_mb()
+        if worker_peak is not None:
+            summary += f", {worker_peak:.1f} MB largest worker"
+        return summary
+    
+    def slowest_files(self, n=None):
+        n = self.slowest if n is None else n
+        parsed = [f for f in self.files if f["status"] != "cached"]
+        return sorted(parsed, key=lambda f: f["seconds"], reverse=True)[:n]
+    
+    @contextlib.contextmanager
+    def profiling(self, enabled=True):
+        """Run the block under cProfile and tracemalloc when enabled."""
+        if not enabled:
+            yield
+            return
+        
+        tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._profiler = profiler
+            self.profile = {
+                "functions": _top_functions(profiler),
+                "allocations": [
+                    {"location": str(stat.traceback), "size_mb": _mb(stat.size), "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:PROFILE_TOP_ALLOCATIONS]
+                ],
+                "alloc_current_mb": _mb(current),
+                "alloc_peak_mb": _mb(peak),
+            }
+    
+    def to_dict(self):
+        return {
+            "command": self.command,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "seconds": round(time.perf_counter() - self._start, 4),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "worker_peak_rss_mb": self.worker_peak_rss_mb(),
+            "counters": self.counters,
+            "stages": {
+                name: dict(s, seconds=round(s["seconds"], 4)) for name, s in self.stages.items()
+            },
+            "slowest_files": self.slowest_files(),
+            "files": self.files,
+            "profile": self.profile,
+        }
+    
+    def save(self, path):
+        """
+        Write the JSON report; with profiling on, the raw cProfile stats go
+        next to it as <report>.prof for snakeviz/pstats.
+        """
+        path = Path(path)
+        atomic_write_json(path, self.to_dict(), indent=2)
+        if self.profile is not None:
+            self._profiler.dump_stats(str(path.with_suffix(".prof")))
+    
+    def print_summary(self):
+        """Print the stage breakdown and the slowest files."""
+        if not self.stages:
+            return
+        print("\nTiming by stage:")
+        for name, s in self.stages.items():
+            print(f"  {name:<12} {s['seconds']:>9.3f}s  ({s['calls']} calls)")
+        slowest = self.slowest_files()
+        if slowest:
+            print(f"Slowest {len(slowest)} files:")
+            for f in slowest:
+                print(f"  {f['seconds']:>8.3f}s  {Path(f['file']).name}")
+
+
+def _top_functions(profiler, limit=PROFILE_TOP_FUNCTIONS):
+    """Top functions by cumulative time as JSON-ready dicts."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, function), (_, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            "function": f"{Path(filename).name}:{line}({function})",
+            "calls": calls,
+            "total_seconds": round(total, 4),
+            "cumulative_seconds": round(cumulative, 4),
+        })
+    rows.sort(key=lambda r: r["cumulative_seconds"], reverse=True)
+    return rows[:limit]
+
+
+def add_report_arguments(parser):
+    """Register the --report / --profile / --slowest switches on an argparse parser."""
+    parser.add_argument(
+        '--report',
+        default=None,
+        help='Write a JSON run report with per-stage and per-file timings to this file'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Also run under cProfile and tracemalloc and include the hottest '
+             'functions in the report; only the main process is profiled, so use '
+             f'--workers 1 to profile parsing (default report file: {DEFAULT_REPORT_FILE})'
+    )
+    parser.add_argument(
+        '--slowest',
+        type=int,
+        default=DEFAULT_SLOWEST,
+        help=f'Number of slowest files to list in the report (default: {DEFAULT_SLOWEST})'
+    )
+
+
+def report_path(args):
+    """Where to write the report for parsed arguments, or None."""
+    return args.report or (DEFAULT_REPORT_FILE if args.profile else None)
+
+
+@contextlib.contextmanager
+def instrumented_run(command, args):
+    """
+    Create a RunReport for a script's main(), profile the block if asked,
+    print the run's peak memory and save and summarise the report afterwards.
+    """
+    report = RunReport(command, slowest=args.slowest)
+    output = report_path(args)
+    try:
+        with report.profiling(args.profile):
+            yield report
+    finally:
+        print(f"✓ {report.memory_summary()}")
+        if output:
+            report.print_summary()
+            report.save(output)
+            print(f"✓ Run report saved to {output}")
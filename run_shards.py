@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Split an extraction run across machines and merge the partial outputs.
+
+`--shard K/N` makes scripts/pdf_extractor.py parse only the PDFs that fall
+in shard K of N, so N independent runs, on as many machines, each write a
+partial results.json. A PDF's shard comes from the SHA-256 of its file
+name (the roll number for <roll>.pdf). The assignment is the same on every
+machine and Python version, and does not depend on which other files are
+present.
+
+merge_partials combines the partials, which are written in roll-number
+order, with a streaming k-way merge. The merged file is byte-identical to
+the output of an unsharded run over the same PDFs, for any N. A roll
+number that appears more than once is reported the way
+scripts/validate_results.py reports it, and no output is written.
+"""
+
+import argparse
+import hashlib
+import heapq
+from pathlib import Path
+
+from combined_students import iter_records, write_records
+
+
+class DuplicateRollError(ValueError):
+    """Raised by merge_partials; duplicates maps each repeated roll to its count."""
+    
+    def __init__(self, duplicates):
+        self.duplicates = duplicates
+        super().__init__(f"{len(duplicates)} duplicate roll numbers")
+
+
+def parse_shard(text):
+    """argparse type for K/N: returns (K, N) with 1 <= K <= N."""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected K/N, e.g. 1/4, not '{text}'")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {index} does not exist in {count} shards")
+    return index, count
+
+
+def format_shard(shard):
+    return f"{shard[0]}/{shard[1]}"
+
+
+def shard_of(pdf_file, count):
+    """The 1-based shard (out of count) that pdf_file belongs to."""
+    digest = hashlib.sha256(Path(pdf_file).name.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
+
+
+def select_shard(pdf_files, shard=None):
+    """The pdf_files in shard (K, N), in their original order; all of them for None."""
+    if shard is None:
+        return list(pdf_files)
+    index, count = shard
+    return [pdf_file for pdf_file in pdf_files if shard_of(pdf_file, count) == index]
+
+
+def _in_roll_order(path, records):
+    previous = None
+    for record in records:
+        roll = record["roll"]
+        if previous is not None and roll < previous:
+            raise ValueError(f"{path} is not in roll-number order (was it written by pdf_extractor.py?)")
+        previous = roll
+        yield record
+
+
+def merge_partials(partial_files, output_file):
+    """
+    Merge partial results files (JSON arrays or JSON lines, as written by
+    pdf_extractor.py) into output_file, in the format its suffix selects.
+    Records are streamed, so memory does not grow with the cohort.
+    Returns the number of students written. Raises DuplicateRollError,
+    leaving output_file untouched, if any roll number appears twice.
+    """
+    streams = [_in_roll_order(path, iter_records(path)) for path in partial_files]
+    duplicates = {}
+    
+    def merged():
+        previous = None
+        for record in heapq.merge(*streams, key=lambda record: record["roll"]):
+            roll = record["roll"]
+            if roll == previous:
+                duplicates[roll] = duplicates.get(roll, 1) + 1
+                continue
+            previous = roll
+            yield record
+        if duplicates:
+            # Raised inside the write, so the atomic writer discards the output
+            raise DuplicateRollError(duplicates)
+    
+    return write_records(output_file, merged())
+
+
+def add_shard_arguments(parser):
+    """Register the --shard switch on an argparse parser."""
+    parser.add_argument(
+        '--shard',
+        type=parse_shard,
+        default=None,
+        metavar='K/N',
+        help='Process only shard K of N (files assigned by a stable hash of their name); '
+             'merge the N outputs with scripts/merge_results.py'
+    )
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the mark sheet text parser.
+
+Extracts page text from every PDF once, then times parse_subjects_text and
+parse_student_info_text against the previous regex/eval implementation on
+the same text, checking that both produce identical output.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import pdfplumber
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from extract_pdf_data import parse_student_info_text, parse_subjects_text
+
+
+def legacy_parse_subject_line(line, category):
+    """The per-line parser as it was before the table-driven rewrite."""
+    parts = [p.strip() for p in line.split() if p.strip()]
+    
+    if len(parts) < 5:
+        return None
+    
+    try:
+        grade = parts[-1]
+        marks_total = parts[-2]
+        marks_final = parts[-3] if parts[-3] != "-" else ""
+        marks_internal = parts[-4]
+        
+        total_marks = ""
+        for i in range(len(parts) - 8, len(parts) - 5):
+            if i >= 0 and i < len(parts):
+                val = parts[i]
+                if re.match(r'^\d{3}$', val):
+                    total_marks = val
+                    break
+        
+        credits = ""
+        subject_name_parts = []
+        for part in parts:
+            if re.match(r'^\d+\.\d$', part):
+                credits = part
+                break
+            subject_name_parts.append(part)
+        
+        if marks_internal == "-":
+            marks_internal = ""
+        
+        if marks_internal and re.search(r'[\+\-]', marks_internal):
+            try:
+                marks_internal = str(eval(marks_internal))
+            except:
+                pass
+        
+        if marks_final and re.search(r'[\+\-]', marks_final):
+            try:
+                marks_final = str(eval(marks_final))
+            except:
+                pass
+        
+        return {
+            "subject_name": " ".join(subject_name_parts),
+            "credits": credits,
+            "total_marks": total_marks,
+            "marks_internal": marks_internal,
+            "marks_final": marks_final,
+            "marks_total": marks_total,
+            "grade": grade,
+            "category": category
+        }
+    except (IndexError, ValueError):
+        return None
+
+
+def legacy_parse_subjects_text(text):
+    subjects = []
+    current_category = None
+    
+    for line in text.split('\n'):
+        line = line.strip()
+        
+        if "THEORY PAPERS" in line:
+            current_category = "THEORY"
+            continue
+        elif "PRACTICAL PAPERS" in line:
+            current_category = "PRACTICAL"
+            continue
+        elif "TERM WORK PAPERS" in line:
+            current_category = "TERM WORK"
+            continue
+        elif line.startswith("---") or not line:
+            continue
+        elif "SUBJECT" in line and "CREDITS" in line:
+            continue
+        elif "GRAND TOTAL" in line or "SGPA" in line or "REMARKS" in line:
+            break
+        
+        if current_category and line:
+            if re.search(r'[A-E]\+?$', line):
+                subject = legacy_parse_subject_line(line, current_category)
+                if subject:
+                    subjects.append(subject)
+    
+    return subjects
+
+
+def legacy_parse_student_info_text(text):
+    info = {}
+    
+    reg_match = re.search(r'Registration No\s*:\s*(\d+)', text)
+    if reg_match:
+        info['registration_number'] = reg_match.group(1)
+    
+    roll_match = re.search(r'Roll No\s*:\s*(\d+)', text)
+    if roll_match:
+        info['roll_number'] = roll_match.group(1)
+    
+    name_match = re.search(r'obtained by\s+([A-Z\s]+)\s+of', text)
+    if name_match:
+        info['name'] = name_match.group(1).strip()
+    
+    return info
+
+
+def load_page_texts(input_dir):
+    """Extract the first page's text from every PDF in input_dir."""
+    texts = []
+    for pdf_file in sorted(Path(input_dir).glob("*.pdf")):
+        with pdfplumber.open(pdf_file) as pdf:
+            if pdf.pages:
+                texts.append(pdf.pages[0].extract_text() or "")
+    return texts
+
+
+def time_parser(parse_subjects, parse_info, texts, iterations):
+    """Run both parsers over every text `iterations` times; return seconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            parse_subjects(text)
+            parse_info(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the mark sheet text parser against the legacy regex/eval version'
+    )
+    parser.add_argument(
+        '--input_dir',
+        default='result',
+        help='Directory containing PDF files (default: result)'
+    )
+    parser.add_argument(
+        '--iterations',
+        type=int,
+        default=200,
+        help='Passes over the extracted text per parser (default: 200)'
+    )
+    
+    args = parser.parse_args()
+    
+    texts = load_page_texts(args.input_dir)
+    if not texts:
+        print(f"✗ No PDF files found in {args.input_dir}")
+        sys.exit(1)
+    
+    mismatches = 0
+    for text in texts:
+        # The current parser returns Subject records; the legacy one plain dicts
+        if ([subject.to_dict() for subject in parse_subjects_text(text)] != legacy_parse_subjects_text(text)
+                or parse_student_info_text(text) != legacy_parse_student_info_text(text)):
+            mismatches += 1
+    if mismatches:
+        print(f"✗ {mismatches} of {len(texts)} sheets parse differently")
+        sys.exit(1)
+    print(f"✓ Both parsers agree on {len(texts)} sheets")
+    
+    lines = sum(text.count('\n') + 1 for text in texts) * args.iterations
+    legacy = time_parser(legacy_parse_subjects_text, legacy_parse_student_info_text,
+                         texts, args.iterations)
+    current = time_parser(parse_subjects_text, parse_student_info_text,
+                          texts, args.iterations)
+    
+    print(f"Legacy parser:  {legacy:.3f}s ({lines / legacy:,.0f} lines/sec)")
+    print(f"Current parser: {current:.3f}s ({lines / current:,.0f} lines/sec)")
+    print(f"Speedup: {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the PDF ingestion pipeline.
+
+For each cohort size a synthetic cohort is generated (see
+synthetic_cohort.py) and every stage is timed on it:
+
+  open       opening the PDF and its first page, per PDF
+  extract    page text extraction, per PDF (--backend picks the text
+             backend; --crop: pdfplumber on the header and table only)
+  parse      parse_student_info_text + parse_subjects_text (items are lines)
+  stats      build_app_data (app format, cohort and subject statistics)
+  serialize  all_students.json fragments + students_app_format.json text
+  validate   validate_results on the equivalent results.json
+
+Each cohort runs in a fresh process so its peak RSS is reported on its own.
+PDF stages can be skipped above a size with --pdf-limit; the JSON stages
+then run on the generated records directly.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from combined_students import format_fragment, join_fragments
+from convert_to_app_format import build_app_data
+from extract_pdf_data import parse_student_info_text, parse_subjects_text
+from records import Student
+from run_report import peak_rss_mb
+from synthetic_cohort import to_results_entry, write_cohort
+from text_backends import DEFAULT_BACKEND, FALLBACK_BACKEND, add_backend_arguments, get_backend
+from validate_results import validate_results
+
+DEFAULT_SIZES = "100,1000,10000"
+
+
+class StageTimer:
+    """Collects (stage, seconds, items, peak RSS) rows for one cohort."""
+    
+    def __init__(self):
+        self.stages = []
+    
+    def record(self, name, seconds, items):
+        self.stages.append({
+            "stage": name,
+            "seconds": round(seconds, 4),
+            "items": items,
+            "per_second": round(items / seconds, 1) if seconds > 0 else None,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+        })
+    
+    @contextlib.contextmanager
+    def stage(self, name, items):
+        start = time.perf_counter()
+        yield
+        self.record(name, time.perf_counter() - start, items)
+
+
+def bench_pdf_stages(pdf_files, timer, crop=False, backend=None):
+    """Time open, text extraction and parsing; returns the parsed records."""
+    extract_text = get_backend(backend)
+    open_seconds = extract_seconds = 0.0
+    texts = []
+    for pdf_file in pdf_files:
+        timings = {}
+        texts.append(extract_text(pdf_file, crop, timings))
+        open_seconds += timings["open"]
+        extract_seconds += timings["extract"]
+    timer.record("open", open_seconds, len(pdf_files))
+    timer.record("extract", extract_seconds, len(pdf_files))
+    
+    records = []
+    with timer.stage("parse", sum(table.count('\n') + 1 for _, table in texts)):
+        for header_text, table_text in texts:
+            info = parse_student_info_text(header_text)
+            records.append(Student(
+                roll_number=info.get("roll_number", ""),
+                registration_number=info.get("registration_number", ""),
+                name=info.get("name", ""),
+                subjects=parse_subjects_text(table_text)
+            ))
+    return records
+
+
+def run_cohort(size, workdir, seed, with_pdfs, crop=False, backend=None):
+    """Generate and benchmark one cohort. Runs in its own process."""
+    cohort_dir = Path(workdir) / f"cohort-{size}"
+    timer = StageTimer()
+    
+    start = time.perf_counter()
+    expected = write_cohort(cohort_dir, size, seed, pdfs=with_pdfs)
+    generate_seconds = time.perf_counter() - start
+    
+    if with_pdfs:
+        records = bench_pdf_stages(sorted(cohort_dir.glob("*.pdf")), timer, crop, backend)
+        if [record.to_dict() for record in records] != expected:
+            raise RuntimeError(f"Parsed records differ from the synthetic cohort of {size}")
+    records = expected
+    
+    with timer.stage("stats", size):
+        students, _, _ = build_app_data([Student.from_dict(record) for record in records])
+    
+    with timer.stage("serialize", size):
+        combined = join_fragments([format_fragment(record) for record in records])
+        app_json = json.dumps(students, indent=2)
+    
+    results_file = cohort_dir / "results.json"
+    with open(results_file, 'w', encoding='utf-8') as f:
+        json.dump([to_results_entry(record) for record in records], f, indent=2)
+    
+    with timer.stage("validate", size), contextlib.redirect_stdout(io.StringIO()):
+        is_valid, messages = validate_results(str(results_file))
+    if not is_valid:
+        raise RuntimeError(f"Synthetic results failed validation: {messages[:3]}")
+    
+    return {
+        "students": size,
+        "pdfs": with_pdfs,
+        "crop": crop,
+        "backend": backend,
+        "generate_seconds": round(generate_seconds, 4),
+        "output_bytes": len(combined.encode('utf-8')) + len(app_json.encode('utf-8')),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "stages": timer.stages,
+    }
+
+
+def print_report(report):
+    print(f"\n{report['students']:,} students"
+          f"{'' if report['pdfs'] else ' (JSON only, PDF stages skipped)'}"
+          f"{' (' + report['backend'] + ' backend)' if report['pdfs'] else ''}"
+          f"{' (crop mode)' if report['pdfs'] and report['crop'] else ''}"
+          f" - generated in {report['generate_seconds']:.2f}s, peak RSS {report['peak_rss_mb']:.1f} MiB")
+    print(f"  {'stage':<10} {'seconds':>9} {'items':>9} {'items/sec':>12} {'peak RSS':>10}")
+    for s in report["stages"]:
+        rate = f"{s['per_second']:,.0f}" if s["per_second"] is not None else "-"
+        print(f"  {s['stage']:<10} {s['seconds']:>9.3f} {s['items']:>9,} {rate:>12} {s['peak_rss_mb']:>8.1f}Mi")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the PDF ingestion pipeline on synthetic cohorts'
+    )
+    parser.add_argument(
+        '--sizes',
+        default=DEFAULT_SIZES,
+        help=f'Comma-separated cohort sizes (default: {DEFAULT_SIZES})'
+    )
+    parser.add_argument(
+        '--pdf-limit',
+        type=int,
+        default=None,
+        help='Skip the PDF stages for cohorts larger than this (default: never skip)'
+    )
+    parser.add_argument(
+        '--crop',
+        action='store_true',
+        help='Extract only the header and subject table regions (extract_pdf_data.py --crop)'
+    )
+    add_backend_arguments(parser)
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Random seed for the synthetic cohorts (default: 0)'
+    )
+    parser.add_argument(
+        '--workdir',
+        default=None,
+        help='Keep generated cohorts in this directory (default: a temporary directory)'
+    )
+    parser.add_argument(
+        '--output',
+        default=None,
+        help='Also write the report as JSON to this file'
+    )
+    
+    args = parser.parse_args()
+    
+    try:
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    except ValueError:
+        parser.error(f"--sizes must be comma-separated integers, got '{args.sizes}'")
+    
+    # Crop mode is a pdfplumber feature; otherwise time the default backend
+    backend = args.backend or (FALLBACK_BACKEND if args.crop else DEFAULT_BACKEND)
+    try:
+        get_backend(backend)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    with contextlib.ExitStack() as stack:
+        workdir = args.workdir or stack.enter_context(tempfile.TemporaryDirectory(prefix="bench-"))
+        reports = []
+        for size in sizes:
+            with_pdfs = args.pdf_limit is None or size <= args.pdf_limit
+            # A fresh process per cohort keeps peak RSS figures independent
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                report = executor.submit(run_cohort, size, workdir, args.seed, with_pdfs,
+                                         args.crop, backend).result()
+            print_report(report)
+            reports.append(report)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"seed": args.seed, "cohorts": reports}, f, indent=2)
+        print(f"\n✓ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
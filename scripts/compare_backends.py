@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Compare text extraction backends over a directory of mark sheets.
+
+Every PDF is extracted with each available backend (plus pdfplumber in
+crop mode) and parsed. Each result is checked structurally and compared
+field by field with the full-page pdfplumber result, which is the
+reference. Reports throughput per backend, structural failures (sheets
+that would fall back to pdfplumber) and any sheet whose parsed record
+differs from the reference.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from extract_pdf_data import check_marksheet_text, marksheet_from_text
+from text_backends import FALLBACK_BACKEND, available_backends, get_backend
+
+REFERENCE = (FALLBACK_BACKEND, False)
+
+
+def backend_variants():
+    """(backend, crop) pairs to compare, reference first."""
+    variants = [REFERENCE, (FALLBACK_BACKEND, True)]
+    variants += [(name, False) for name in available_backends() if name != FALLBACK_BACKEND]
+    return variants
+
+
+def variant_label(variant):
+    name, crop = variant
+    return f"{name} (crop)" if crop else name
+
+
+def differing_fields(record, reference):
+    """Top-level fields (and subject indexes) where two records differ."""
+    fields = [key for key in ("roll_number", "registration_number", "name") if record[key] != reference[key]]
+    if len(record["subjects"]) != len(reference["subjects"]):
+        fields.append(f"subjects ({len(record['subjects'])} vs {len(reference['subjects'])})")
+    else:
+        fields += [
+            f"subjects[{idx}]"
+            for idx, (a, b) in enumerate(zip(record["subjects"], reference["subjects"])) if a != b
+        ]
+    return fields
+
+
+def compare_backends(input_dir):
+    """Run every variant over input_dir; returns the report dict."""
+    pdf_files = sorted(Path(input_dir).glob("*.pdf"))
+    variants = backend_variants()
+    stats = {
+        variant_label(v): {"sheets": 0, "seconds": 0.0, "errors": [], "structural_failures": [], "mismatches": []}
+        for v in variants
+    }
+    
+    for pdf_file in pdf_files:
+        reference = None
+        for variant in variants:
+            name, crop = variant
+            entry = stats[variant_label(variant)]
+            start = time.perf_counter()
+            try:
+                header_text, table_text = get_backend(name)(pdf_file, crop)
+                marksheet = marksheet_from_text(pdf_file, header_text, table_text)
+            except Exception as e:
+                entry["errors"].append({"file": pdf_file.name, "error": str(e)})
+                continue
+            entry["seconds"] += time.perf_counter() - start
+            entry["sheets"] += 1
+            
+            problems = check_marksheet_text(table_text, marksheet)
+            if problems:
+                entry["structural_failures"].append({"file": pdf_file.name, "problems": problems})
+            
+            record = marksheet.to_dict()
+            if variant == REFERENCE:
+                reference = record
+            elif reference is not None and record != reference:
+                entry["mismatches"].append({"file": pdf_file.name, "fields": differing_fields(record, reference)})
+    
+    reference_rate = None
+    for label, entry in stats.items():
+        entry["seconds"] = round(entry["seconds"], 4)
+        entry["sheets_per_second"] = round(entry["sheets"] / entry["seconds"], 1) if entry["seconds"] else None
+        if reference_rate is None:
+            reference_rate = entry["sheets_per_second"]
+        entry["speedup"] = (round(entry["sheets_per_second"] / reference_rate, 1)
+                            if reference_rate and entry["sheets_per_second"] else None)
+    
+    return {"input_dir": str(input_dir), "files": len(pdf_files), "reference": variant_label(REFERENCE),
+            "backends": stats}
+
+
+def print_report(report):
+    print(f"Compared {report['files']} sheets against {report['reference']}\n")
+    print(f"  {'backend':<18} {'sheets/sec':>11} {'speedup':>8} {'errors':>7} {'failed checks':>14} {'mismatches':>11}")
+    for label, entry in report["backends"].items():
+        rate = f"{entry['sheets_per_second']:,.1f}" if entry["sheets_per_second"] else "-"
+        speedup = f"{entry['speedup']}x" if entry["speedup"] else "-"
+        print(f"  {label:<18} {rate:>11} {speedup:>8} {len(entry['errors']):>7} "
+              f"{len(entry['structural_failures']):>14} {len(entry['mismatches']):>11}")
+    
+    for label, entry in report["backends"].items():
+        for failure in entry["structural_failures"]:
+            print(f"\n  ⚠ {label}: {failure['file']}: {'; '.join(failure['problems'])}")
+        for mismatch in entry["mismatches"]:
+            print(f"\n  ✗ {label}: {mismatch['file']} differs in {', '.join(mismatch['fields'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare text extraction backends against pdfplumber on a PDF corpus'
+    )
+    parser.add_argument(
+        '--input_dir',
+        default='result',
+        help='Directory containing PDF files (default: result)'
+    )
+    parser.add_argument(
+        '--output',
+        default=None,
+        help='Also write the report as JSON to this file'
+    )
+    
+    args = parser.parse_args()
+    
+    report = compare_backends(args.input_dir)
+    if not report["files"]:
+        print(f"✗ No PDF files found in {args.input_dir}")
+        sys.exit(1)
+    
+    print_report(report)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report saved to {args.output}")
+    
+    mismatched = any(entry["mismatches"] for entry in report["backends"].values())
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
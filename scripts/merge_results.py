@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Merge the partial results.json files of a sharded pdf_extractor.py run.
+Produces the same file, byte for byte, as one unsharded run.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from run_report import add_report_arguments, instrumented_run
+from run_shards import DuplicateRollError, merge_partials
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Merge partial results files from pdf_extractor.py --shard K/N runs'
+    )
+    parser.add_argument(
+        'partials',
+        nargs='+',
+        help='Partial results files (JSON array or JSON lines), one per shard'
+    )
+    parser.add_argument(
+        '--output_file',
+        required=True,
+        help='Merged output path (e.g., data/extracted/results.json); a .jsonl path writes JSON lines'
+    )
+    add_report_arguments(parser)
+    
+    args = parser.parse_args()
+    
+    missing = [path for path in args.partials if not Path(path).exists()]
+    if missing:
+        print(f"✗ Partial results not found: {', '.join(missing)}")
+        sys.exit(1)
+    
+    with instrumented_run("merge_results", args) as report:
+        try:
+            with report.stage("merge"):
+                count = merge_partials(args.partials, args.output_file)
+        except DuplicateRollError as e:
+            for roll, times in e.duplicates.items():
+                print(f"ERROR: Duplicate roll number found: {roll} (appears {times} times)")
+            print(f"✗ {args.output_file} not written")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        report.count("students", count)
+    
+    print(f"✓ Merged {count} students from {len(args.partials)} partial files into {args.output_file}")
+
+
+if __name__ == "__main__":
+    main()
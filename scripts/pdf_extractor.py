@@ -5,19 +5,103 @@ Extracts student data from PDFs and generates results.json in the expected forma
 """
 
 import argparse
-import json
 import os
 import sys
+import time
 from pathlib import Path
 
 # Import the existing extraction logic
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from extract_pdf_data import extract_student_info_from_pdf, extract_subjects_from_pdf
+from combined_students import write_records
+from extract_pdf_data import (
+    PARSER_VERSION, add_worker_limit_arguments, iter_claimed_marksheets, iter_marksheets, worker_limits
+)
+from extraction_cache import add_cache_arguments, open_cache
+from job_manifest import FAILED, JobManifest, add_manifest_arguments
+from record_spool import CHECKPOINT_EVERY, RecordSpool, add_checkpoint_arguments
+from run_report import RunReport, add_report_arguments, instrumented_run
+from run_shards import add_shard_arguments, format_shard, select_shard
+from text_backends import add_backend_arguments, validate_backend_argument
 
 
-def extract_to_results_json(input_dir, output_file):
+def to_results_entry(marksheet):
+    """
+    Convert a parsed Student to a results.json entry. Subjects whose marks
+    cannot be converted are skipped with a warning.
+    """
+    transformed_subjects = []
+    for subj in marksheet.subjects:
+        try:
+            # Marks were parsed to integers (or None) when the sheet was read
+            transformed_subjects.append(subj.to_results_dict())
+        except ValueError as e:
+            print(f"  Warning: Error processing subject {subj.name}: {e}")
+            continue
+    
+    return {
+        "roll": marksheet.roll_number,
+        "name": marksheet.name,
+        "subjects": transformed_subjects
+    }
+
+
+def _results_entry(pdf_file, marksheet, error):
+    """
+    Build the results entry for one parse outcome, printing progress.
+    Returns (entry, None) or (None, reason) when the file yields no entry.
+    """
+    try:
+        if error:
+            raise RuntimeError(error)
+        
+        if not marksheet.subjects:
+            print(f"  Warning: No subjects found in {pdf_file.name}")
+            return None, "no subjects found"
+        
+        result_entry = to_results_entry(marksheet)
+        print(f"  ✓ Processed {len(result_entry['subjects'])} subjects for roll {result_entry['roll']}")
+        return result_entry, None
+    
+    except Exception as e:
+        print(f"  Error processing {pdf_file.name}: {e}", file=sys.stderr)
+        return None, str(e)
+
+
+def _job_settings(input_path, shard=None):
+    settings = {"parser_version": PARSER_VERSION, "input_dir": str(Path(input_path).resolve())}
+    if shard is not None:
+        settings["shard"] = format_shard(shard)
+    return settings
+
+
+def open_manifest(input_dir, output_file, shard=None):
+    """The job manifest for --resume runs, kept next to output_file."""
+    output_path = Path(output_file)
+    return JobManifest(output_path.parent, f".{output_path.name}", _job_settings(input_dir, shard))
+
+
+def extract_to_results_json(input_dir, output_file, workers=None, no_cache=False, rebuild_cache=False,
+                            report=None, crop=False, backend=None,
+                            checkpoint_every=CHECKPOINT_EVERY, restart=False,
+                            resume=False, retry_failed=False, shard=None, limits=None):
     """
     Extract data from all PDFs in input_dir and write to output_file in results.json format.
+    PDFs are parsed by `workers` processes (default: CPU count); entries are
+    written in roll-number order regardless of which worker finishes first.
+    Unchanged PDFs are served from the extraction cache in <input_dir>/.cache.
+    An output_file ending in .jsonl is written as JSON lines, one student
+    per line; anything else gets the JSON array below.
+    Entries are spooled next to output_file as they are parsed and streamed
+    to it at the end, checkpointing every checkpoint_every files; an
+    interrupted run resumes from its last checkpoint unless restart is set.
+    resume=True (or retry_failed=True) runs as a batch job tracked in a job
+    manifest next to output_file instead (see extract_pdf_data.process_pdf_batch).
+    shard=(K, N) processes only the PDFs in shard K of N (see run_shards.py);
+    scripts/merge_results.py combines the N partial outputs.
+    limits (WorkerLimits) recycles the parser processes to cap their memory.
+    Per-file and per-stage timings are recorded in `report` (a RunReport).
+    crop=True extracts only the header and subject table of each sheet;
+    backend selects the text extraction backend (see text_backends.py).
     
     Format:
     [
@@ -37,110 +121,131 @@ def extract_to_results_json(input_dir, output_file):
         }
     ]
     """
+    report = report or RunReport("pdf_extractor")
     input_path = Path(input_dir)
     
     if not input_path.exists():
         print(f"Error: Input directory '{input_dir}' does not exist", file=sys.stderr)
         sys.exit(1)
     
-    pdf_files = list(input_path.glob("*.pdf"))
+    pdf_files = sorted(input_path.glob("*.pdf"))
+    if shard is not None:
+        all_count = len(pdf_files)
+        pdf_files = select_shard(pdf_files, shard)
+        print(f"Shard {format_shard(shard)}: {len(pdf_files)} of {all_count} PDF files")
+    
+    output_path = Path(output_file)
     
     if not pdf_files:
         print(f"Warning: No PDF files found in '{input_dir}'", file=sys.stderr)
         # Create empty results file
-        output_path = Path(output_file)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump([], f, indent=2)
+        write_records(output_path, [])
         return
     
-    print(f"Found {len(pdf_files)} PDF files to process")
+    total = len(pdf_files)
+    print(f"Found {total} PDF files to process")
+    
+    if resume or retry_failed:
+        return _extract_batch(input_path, output_path, pdf_files, workers, report, crop, backend,
+                              restart, retry_failed, shard, limits)
     
-    all_results = []
-    processed_count = 0
+    spool = RecordSpool(
+        output_path.parent, f".{output_path.name}", _job_settings(input_path, shard),
+        checkpoint_every, resume=not restart
+    )
+    pending = spool.pending(pdf_files)
+    resumed = total - len(pending)
+    if resumed:
+        print(f"✓ Resuming interrupted run: {resumed} PDFs already processed")
+        report.count("resumed", resumed)
+    
+    processed_count = resumed
     error_count = 0
+    cache = open_cache(input_path, PARSER_VERSION, no_cache, rebuild_cache)
+    # Resumed PDFs are not hashed again, and other shards' PDFs are not seen
+    # at all, so keep their cache entries
+    marksheets = iter_marksheets(pending, workers, cache, report, crop, backend,
+                                 evict=not resumed and shard is None, limits=limits)
+    extract_start = time.perf_counter()
     
-    for pdf_file in sorted(pdf_files):
-        try:
-            print(f"Processing: {pdf_file.name}")
-            
-            # Extract student info
-            student_info = extract_student_info_from_pdf(pdf_file)
-            
-            # Extract subjects
-            subjects = extract_subjects_from_pdf(pdf_file)
-            
-            if not subjects:
-                print(f"  Warning: No subjects found in {pdf_file.name}")
+    with spool:
+        for done, (pdf_file, marksheet, error) in enumerate(marksheets, resumed + 1):
+            print(f"[{done}/{total}] Processing: {pdf_file.name}")
+            result_entry, _ = _results_entry(pdf_file, marksheet, error)
+            if result_entry is None:
                 error_count += 1
                 continue
-            
-            roll_number = student_info.get('roll_number', '')
-            if not roll_number:
-                # Try to extract from filename
-                roll_number = pdf_file.stem
-            
-            # Transform subjects to expected format
-            transformed_subjects = []
-            for subj in subjects:
-                try:
-                    # Convert marks to integers or None
-                    marks_internal = None
-                    marks_final = None
-                    marks_total = None
-                    max_marks = None
-                    
-                    if subj.get('marks_internal'):
-                        marks_internal = int(subj['marks_internal'])
-                    
-                    if subj.get('marks_final'):
-                        marks_final = int(subj['marks_final'])
-                    
-                    if subj.get('marks_total'):
-                        marks_total = int(subj['marks_total'])
-                    
-                    if subj.get('total_marks'):
-                        max_marks = int(subj['total_marks'])
-                    
-                    transformed_subjects.append({
-                        "name": subj['subject_name'],
-                        "marks_internal": marks_internal,
-                        "marks_final": marks_final,
-                        "marks_total": marks_total,
-                        "max_marks": max_marks,
-                        "grade": subj['grade']
-                    })
-                except (ValueError, KeyError) as e:
-                    print(f"  Warning: Error processing subject {subj.get('subject_name', 'Unknown')}: {e}")
-                    continue
-            
-            # Create result entry
-            result_entry = {
-                "roll": roll_number,
-                "name": student_info.get('name', ''),
-                "subjects": transformed_subjects
-            }
-            
-            all_results.append(result_entry)
+            spool.append(pdf_file, result_entry["roll"], result_entry)
             processed_count += 1
-            print(f"  ✓ Processed {len(transformed_subjects)} subjects for roll {roll_number}")
-            
-        except Exception as e:
-            print(f"  Error processing {pdf_file.name}: {e}", file=sys.stderr)
-            error_count += 1
-            continue
+        
+        report.add_time("extract", time.perf_counter() - extract_start)
+        report.count("students", processed_count)
+        report.count("errors", error_count)
+        
+        if cache is not None:
+            cache.close()
+            report.count("cache_hits", cache.hits)
+            print(f"✓ {cache.summary()}")
+        
+        # Stream the spooled entries to the output file in roll order
+        with report.stage("write"):
+            write_records(output_path, spool.records())
+        spool.discard()
     
-    # Write output file
-    output_path = Path(output_file)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    print(f"\n✓ Successfully processed {processed_count} students")
+    if error_count > 0:
+        print(f"⚠ {error_count} files had errors")
+    print(f"✓ Results written to {output_file}")
+    
+    return processed_count
+
+
+def _extract_batch(input_path, output_path, pdf_files, workers, report, crop, backend, restart, retry_failed,
+                   shard=None, limits=None):
+    """
+    The --resume path of extract_to_results_json: claim files from the job
+    manifest, record each outcome there, and write output_path once no
+    file is left pending or in progress.
+    """
+    with open_manifest(input_path, output_path, shard) as manifest:
+        with report.stage("hash"):
+            changed = manifest.sync(pdf_files)
+        if restart:
+            manifest.reset()
+        elif retry_failed:
+            manifest.reset([FAILED])
+        released = manifest.release_dead_claims()
+        if released:
+            print(f"✓ Released {released} files claimed by workers that are no longer running")
+        print(f"✓ {manifest.summary()} ({changed} new or changed)")
+        
+        with report.stage("extract"):
+            marksheets = iter_claimed_marksheets(manifest, input_path, workers, report, crop, backend, limits)
+            for done, (pdf_file, marksheet, error, seconds) in enumerate(marksheets, 1):
+                print(f"[{done}] Processing: {pdf_file.name}")
+                result_entry, reason = _results_entry(pdf_file, marksheet, error)
+                if result_entry is None:
+                    manifest.failed(pdf_file, reason, seconds)
+                    report.count("errors")
+                else:
+                    manifest.done(pdf_file, result_entry["roll"], result_entry, seconds)
+        
+        manifest.print_status()
+        if not manifest.is_complete():
+            print(f"✓ Other workers still have files in progress; the last one to finish "
+                  f"writes {output_path}")
+            return 0
+        
+        with report.stage("write"):
+            processed_count = write_records(output_path, manifest.records())
+        error_count = manifest.counts()[FAILED]
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_results, f, indent=2, ensure_ascii=False)
+    report.count("students", processed_count)
     
     print(f"\n✓ Successfully processed {processed_count} students")
     if error_count > 0:
         print(f"⚠ {error_count} files had errors")
-    print(f"✓ Results written to {output_file}")
+    print(f"✓ Results written to {output_path}")
     
     return processed_count
 
@@ -157,13 +262,55 @@ def main():
     parser.add_argument(
         '--output_file',
         required=True,
-        help='Output JSON file path (e.g., data/extracted/results.json)'
+        help='Output JSON file path (e.g., data/extracted/results.json); a .jsonl path writes JSON lines'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of parser processes (default: CPU count, 1 = serial)'
+    )
+    parser.add_argument(
+        '--crop',
+        action='store_true',
+        help='Extract only the header block and subject table, reusing their '
+             'position across sheets of the same layout'
+    )
+    add_backend_arguments(parser)
+    add_cache_arguments(parser)
+    add_checkpoint_arguments(parser)
+    add_manifest_arguments(parser)
+    add_shard_arguments(parser)
+    add_worker_limit_arguments(parser)
+    add_report_arguments(parser)
     
     args = parser.parse_args()
+    validate_backend_argument(parser, args)
+    limits = worker_limits(parser, args)
+    
+    if args.status:
+        with open_manifest(args.input_dir, args.output_file, args.shard) as manifest:
+            manifest.print_status()
+        sys.exit(0)
     
     try:
-        count = extract_to_results_json(args.input_dir, args.output_file)
+        with instrumented_run("pdf_extractor", args) as report:
+            count = extract_to_results_json(
+                args.input_dir,
+                args.output_file,
+                workers=args.workers,
+                no_cache=args.no_cache,
+                rebuild_cache=args.rebuild_cache,
+                report=report,
+                crop=args.crop,
+                backend=args.backend,
+                checkpoint_every=args.checkpoint_every,
+                restart=args.restart,
+                resume=args.resume,
+                retry_failed=args.retry_failed,
+                shard=args.shard,
+                limits=limits
+            )
         sys.exit(0)
     except Exception as e:
         print(f"Fatal error: {e}", file=sys.stderr)
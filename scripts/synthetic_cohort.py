@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Synthetic mark sheet generator for benchmarks.
+
+Produces single-page PDFs laid out like the SBTE Bihar provisional mark
+sheets that extract_pdf_data.py parses, plus the records the extractor is
+expected to return for them (the all_students.json layout), so cohorts of
+any size can be built without real data. Output is deterministic for a
+given seed.
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+FONT_SIZE = 8
+LINE_HEIGHT = 11
+LEFT_MARGIN = 36
+TOP_MARGIN = 60
+
+RULE = "-" * 95
+ROLL_PREFIX = "2112715"
+
+# (name, credits, int max, fin max, pass fin, pass total) per section;
+# None marks a column printed as "-"
+SUBJECT_CATALOG = (
+    ("THEORY", (
+        ("ENVT. EDU. AND SUST. DEVELOP.", "1.0", 15, None, None, 6),
+        ("APPLIED PHYSICS -A", "3.0", 30, 70, 28, 40),
+        ("APPLIED MATHEMATICS -A", "3.0", 30, 70, 28, 40),
+        ("ESSEN OF IND KNOWL. AND TRADIT", "1.0", 25, None, None, 10),
+        ("PRINCIPLES OF MANAGEMENT", "1.0", 25, None, None, 10),
+        ("INDIAN CONSTITUTION", "0.5", 25, None, None, 10),
+        ("PYTHON PROGRAMMING", "3.0", 30, 70, 28, 40),
+        ("ENGG. MECHANICS", "3.0", 30, 70, 28, 40),
+    )),
+    ("PRACTICAL", (
+        ("ENVT. EDU. AND SUST. DEVELOP.", "0.5", 10, 15, None, 10),
+        ("APPLIED PHYSICS -A", "2.0", 20, 30, None, 20),
+        ("PYTHON PROGRAMMING", "2.0", 20, 30, None, 20),
+        ("ICT TOOLS", "2.0", 20, 30, None, 20),
+        ("ENGG. MECHANICS", "2.0", 20, 30, None, 20),
+    )),
+    ("TERM WORK", (
+        ("ENVT. EDU. AND SUST. DEVELOP.", "0.5", 10, None, None, 4),
+        ("APPLIED PHYSICS -A", "1.0", 20, 30, None, 20),
+        ("APPLIED MATHEMATICS -A", "1.0", 20, 30, None, 20),
+        ("INDIAN CONSTITUTION", "0.5", 25, None, None, 10),
+        ("PYTHON PROGRAMMING", "1.0", 20, 30, None, 20),
+        ("ICT TOOLS", "1.0", 20, 30, None, 20),
+        ("ENGG. MECHANICS", "1.0", 20, 30, None, 20),
+    )),
+)
+
+# (minimum percentage, grade), checked top to bottom
+GRADE_THRESHOLDS = (
+    (90, "A+"), (80, "A"), (75, "B+"), (70, "B"),
+    (60, "C"), (50, "D"), (40, "E"),
+)
+
+FIRST_NAMES = (
+    "AARAV", "ADITI", "AMAN", "ANJALI", "ANKIT", "DEEPAK", "DIVYA", "GAURAV",
+    "KUMARI", "MANISH", "NEHA", "NIKHIL", "PRIYA", "RAHUL", "RANJAN", "RITIKA",
+    "ROHIT", "SAURABH", "SHIVAM", "SNEHA", "SUMIT", "VIKASH",
+)
+LAST_NAMES = (
+    "ANAND", "CHAUHAN", "GUPTA", "JHA", "KUMAR", "MISHRA", "PANDEY", "PRASAD",
+    "RAJ", "RANJAN", "SHARMA", "SINGH", "SINHA", "TIWARI", "VERMA", "YADAV",
+)
+
+# Share of obtained marks printed with a moderation adjustment ("44-5")
+MODERATION_RATE = 0.02
+FAIL_RATE = 0.03
+
+
+def synthetic_roll(index):
+    """Roll number for the index-th synthetic student (1-based)."""
+    return f"{ROLL_PREFIX}{index:05d}"
+
+
+def _grade(obtained, maximum):
+    percent = obtained / maximum * 100
+    for threshold, grade in GRADE_THRESHOLDS:
+        if percent >= threshold:
+            return grade
+    return "E"
+
+
+def _dash(value, width=2):
+    return "-" if value is None else f"{value:0{width}d}"
+
+
+def _obtained_text(value, rng):
+    """Format obtained marks, occasionally as a moderation expression."""
+    if value > 5 and rng.random() < MODERATION_RATE:
+        adjustment = rng.randint(1, 5)
+        return f"{value + adjustment}-{adjustment}", str(value)
+    text = f"{value:02d}"
+    return text, text
+
+
+def synthesize_student(index, rng):
+    """
+    Build one student. Returns (page_lines, record) where page_lines is the
+    mark sheet text and record is what the extractor should parse from it.
+    """
+    roll = synthetic_roll(index)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    registration = roll[2:]
+    
+    lines = [
+        "STATE BOARD OF TECHNICAL EDUCATION",
+        "BIHAR",
+        "(PROVISIONAL)",
+        f"Registration No : {registration}",
+        f"Roll No : {roll}",
+        f"Following are the marks obtained by {name}",
+        "of Government Polytechnic, Synthetic",
+        "at Semester II of Diploma in Civil Engineering",
+        "Examination 2025 (EVEN) held in the month of MAY, 2025",
+        RULE,
+        "SUBJECT FULL MARKS PASS MARKS MARKS OBTAINED",
+        "NAME OF SUBJECTS CREDITS INT FIN TOTAL FIN TOTAL INT FIN TOTAL GRADE",
+        RULE,
+    ]
+    subjects = []
+    grand_max = grand_obtained = 0
+    
+    for category, papers in SUBJECT_CATALOG:
+        lines.append(f"{category} PAPERS")
+        for subject_name, credits, int_max, fin_max, pass_fin, pass_total in papers:
+            maximum = int_max + (fin_max or 0)
+            passed = rng.random() >= FAIL_RATE
+            if passed:
+                int_obtained = rng.randint(int_max * 6 // 10, int_max)
+                fin_obtained = rng.randint(fin_max * 4 // 10, fin_max) if fin_max else None
+            else:
+                int_obtained = rng.randint(0, int_max // 3)
+                fin_obtained = rng.randint(0, fin_max // 3) if fin_max else None
+            total = int_obtained + (fin_obtained or 0)
+            grade = _grade(total, maximum) if passed else "F"
+            
+            int_text, int_value = _obtained_text(int_obtained, rng)
+            if fin_obtained is None:
+                fin_text, fin_value = "-", ""
+            else:
+                fin_text, fin_value = _obtained_text(fin_obtained, rng)
+            total_text = f"{total:02d}"
+            
+            lines.append(" ".join((
+                subject_name, credits, str(int_max), _dash(fin_max), f"{maximum:03d}",
+                _dash(pass_fin), f"{pass_total:02d}", int_text, fin_text, total_text, grade
+            )))
+            grand_max += maximum
+            grand_obtained += total
+            
+            # Rows graded F do not end in A-E and are skipped by the parser
+            if passed:
+                subjects.append({
+                    "subject_name": subject_name,
+                    "credits": credits,
+                    "total_marks": f"{maximum:03d}",
+                    "marks_internal": int_value,
+                    "marks_final": fin_value,
+                    "marks_total": total_text,
+                    "grade": grade,
+                    "category": category
+                })
+        lines.append(RULE)
+    
+    lines += [
+        f"GRAND TOTAL 30 {grand_max} {grand_obtained}",
+        RULE,
+        "SGPA",
+        RULE,
+        "REMARKS : PASS",
+        "Result Published On: 10/06/2025",
+    ]
+    record = {
+        "roll_number": roll,
+        "registration_number": registration,
+        "name": name,
+        "subjects": subjects
+    }
+    return lines, record
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(lines):
+    """Render text lines onto a single A4 page in Courier; returns PDF bytes."""
+    ops = [f"BT /F1 {FONT_SIZE} Tf {LINE_HEIGHT} TL {LEFT_MARGIN} {PAGE_HEIGHT - TOP_MARGIN} Td"]
+    ops += [f"({_pdf_escape(line)}) Tj T*" for line in lines]
+    ops.append("ET")
+    stream = "\n".join(ops).encode("latin-1")
+    
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+         f"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>").encode("latin-1"),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+    ]
+    
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def iter_cohort(size, seed=0):
+    """Yield (page_lines, record) for `size` students."""
+    rng = random.Random(seed)
+    for index in range(1, size + 1):
+        yield synthesize_student(index, rng)
+
+
+def synthesize_records(size, seed=0):
+    """Records only, in the all_students.json layout (no PDFs rendered)."""
+    return [record for _, record in iter_cohort(size, seed)]
+
+
+def write_cohort(output_dir, size, seed=0, pdfs=True):
+    """
+    Write <roll>.pdf per student (unless pdfs=False) plus expected.json with
+    the records the extractor should produce. Returns the records.
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    records = []
+    for lines, record in iter_cohort(size, seed):
+        if pdfs:
+            (output_path / f"{record['roll_number']}.pdf").write_bytes(render_pdf(lines))
+        records.append(record)
+    with open(output_path / "expected.json", 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+    return records
+
+
+def to_results_entry(record):
+    """Convert a record to the results.json layout written by pdf_extractor.py."""
+    def as_int(value):
+        return int(value) if value else None
+    
+    return {
+        "roll": record["roll_number"],
+        "name": record["name"],
+        "subjects": [
+            {
+                "name": s["subject_name"],
+                "marks_internal": as_int(s["marks_internal"]),
+                "marks_final": as_int(s["marks_final"]),
+                "marks_total": as_int(s["marks_total"]),
+                "max_marks": as_int(s["total_marks"]),
+                "grade": s["grade"]
+            }
+            for s in record["subjects"]
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate synthetic mark sheet PDFs for benchmarking'
+    )
+    parser.add_argument(
+        'output_dir',
+        help='Directory to write <roll>.pdf files and expected.json into'
+    )
+    parser.add_argument(
+        '--size',
+        type=int,
+        default=100,
+        help='Number of students (default: 100)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Random seed (default: 0)'
+    )
+    
+    args = parser.parse_args()
+    
+    write_cohort(args.output_dir, args.size, args.seed)
+    print(f"✓ Wrote {args.size} synthetic mark sheets to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,251 @@ Validates extracted student results according to CI/CD requirements.
 
 import argparse
 import json
+import os
 import re
 import sys
 from pathlib import Path
-from collections import Counter
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from run_report import RunReport, add_report_arguments, instrumented_run
 
-def validate_results(results_file, roll_regex=None):
+STREAM_CHUNK_SIZE = 1 << 16
+# A decode error this close to the end of the buffered text may just be a
+# value cut off by the chunk boundary (e.g. "fals"); anything earlier is a
+# real syntax error
+TRUNCATION_MARGIN = 8
+# No student record comes near this; an unclosed string or bracket stops here
+MAX_RECORD_CHARS = 16 << 20
+MARK_FIELDS = ['marks_internal', 'marks_final', 'marks_total', 'max_marks']
+
+
+class _ErrorLimitReached(Exception):
+    """Raised internally once max_errors errors have been collected."""
+
+
+def iter_json_records(f, chunk_size=STREAM_CHUNK_SIZE, max_record_chars=MAX_RECORD_CHARS):
+    """
+    Yield records from an open text file one at a time without loading the
+    whole document. Accepts either a top-level JSON array or JSON lines
+    (one object per line). Raises json.JSONDecodeError at the first
+    malformed value, or once a single value exceeds max_record_chars, so
+    memory stays bounded on bad input too.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
+    
+    def skip(chars):
+        """Advance past chars, reading more input as needed; returns next char or ''."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if eof:
+                return ""
+            fill()
+    
+    whitespace = " \t\r\n"
+    
+    def read_value():
+        nonlocal pos
+        while True:
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # Read on only if more input could complete the value; stop
+                # at the first real error instead of buffering to EOF
+                truncated = e.msg.startswith("Unterminated string") or e.pos >= len(buffer) - TRUNCATION_MARGIN
+                if eof or not truncated:
+                    raise
+                if len(buffer) - pos > max_record_chars:
+                    raise json.JSONDecodeError(
+                        f"Record longer than {max_record_chars:,} characters", buffer, pos
+                    ) from e
+                fill()
+                continue
+            # A number at the buffer end may continue in the next chunk
+            if end == len(buffer) and not eof and not isinstance(record, (dict, list)):
+                fill()
+                continue
+            pos = end
+            return record
+    
+    first = skip(whitespace)
+    if first == "":
+        return
+    if first != "[":
+        # JSON lines: whitespace-separated values up to end of input
+        while skip(whitespace) != "":
+            yield read_value()
+        return
+    
+    # Array: exactly one comma between elements, nothing but whitespace after "]"
+    pos += 1
+    nxt = skip(whitespace)
+    while nxt != "]":
+        if nxt == "":
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+        yield read_value()
+        nxt = skip(whitespace)
+        if nxt == ",":
+            pos += 1
+            nxt = skip(whitespace)
+            if nxt == "]":
+                raise json.JSONDecodeError("Trailing comma before ']'", buffer, pos)
+        elif nxt not in ("]", ""):
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+    pos += 1
+    if skip(whitespace) != "":
+        raise json.JSONDecodeError("Extra data after the array", buffer, pos)
+
+
+def _compact_roll(roll):
+    """
+    Duplicate-detection key for a roll number. Digit-only strings are stored
+    as ints to keep the seen-set small; rolls of other JSON types are keyed
+    with their type, so 123 and "123" stay distinct.
+    """
+    if not isinstance(roll, str):
+        return (type(roll).__name__, str(roll))
+    return int(roll) if roll.isdigit() and not roll.startswith("0") else roll
+
+
+def _detect_roll_regex(first_roll):
+    """Derive the roll number pattern from the first record."""
+    first_roll = str(first_roll)
+    if first_roll.startswith('21') and len(first_roll) >= 11:
+        # Pattern: 21 followed by N digits
+        digit_count = len(first_roll) - 2
+        roll_regex = f'^21\\d{{{digit_count}}}$'
+        print(f"Auto-detected roll pattern: {roll_regex} (from sample: {first_roll})")
+    else:
+        # Default fallback
+        roll_regex = r'^21\d{9}$'
+        print(f"Using default roll pattern: {roll_regex}")
+    return roll_regex
+
+
+def _validate_entry(idx, entry, roll_pattern, roll_regex, errors, warnings):
+    """
+    Check one record (rules 1 and 3). Returns its roll number, or None if
+    the record has no 'roll' field.
+    """
+    entry_id = f"Entry #{idx + 1}"
+    
+    # Check required fields
+    if not isinstance(entry, dict) or 'roll' not in entry:
+        errors.append(f"ERROR: {entry_id} missing 'roll' field")
+        return None
+    
+    roll = entry['roll']
+    entry_id = f"Roll {roll}"
+    
+    # Rule 1: Validate roll number format
+    if not roll_pattern.match(str(roll)):
+        errors.append(f"ERROR: {entry_id} has invalid roll number format. Expected pattern: {roll_regex}")
+    
+    # Check subjects field
+    if 'subjects' not in entry:
+        warnings.append(f"WARNING: {entry_id} missing 'subjects' field")
+        return roll
+    
+    subjects = entry['subjects']
+    if not isinstance(subjects, list):
+        errors.append(f"ERROR: {entry_id} 'subjects' must be a list")
+        return roll
+    
+    # Rule 3: Validate marks in each subject
+    for subj_idx, subject in enumerate(subjects):
+        subj_name = subject.get('name', f'Subject #{subj_idx + 1}')
+        subj_id = f"{entry_id} - {subj_name}"
+        
+        # Check mark fields
+        for field in MARK_FIELDS:
+            if field in subject:
+                value = subject[field]
+                
+                # Value must be integer or None/null
+                if value is not None:
+                    if not isinstance(value, int):
+                        try:
+                            value = int(value)
+                        except (ValueError, TypeError):
+                            errors.append(
+                                f"ERROR: {subj_id} '{field}' must be an integer or null, got: {type(value).__name__}"
+                            )
+                            continue
+                    
+                    # Marks must be in range 0-100
+                    if field != 'max_marks' and (value < 0 or value > 100):
+                        errors.append(
+                            f"ERROR: {subj_id} '{field}' value {value} out of range [0-100]"
+                        )
+    
+    return roll
+
+
+def _validate_records(records, roll_regex, errors, warnings, max_errors=None):
+    """
+    Run the per-record rules and duplicate detection over an iterable of
+    records, keeping only a set of seen roll numbers in memory.
+    Returns (record_count, roll_regex, stopped_early).
+    """
+    roll_pattern = None
+    seen = set()
+    duplicate_counts = {}
+    count = 0
+    
+    def check_limit():
+        if max_errors is not None and len(errors) >= max_errors:
+            raise _ErrorLimitReached()
+    
+    try:
+        for idx, entry in enumerate(records):
+            count += 1
+            
+            if roll_pattern is None:
+                # Auto-detect roll pattern if not provided
+                if roll_regex is None:
+                    roll_regex = _detect_roll_regex(entry.get('roll', '') if isinstance(entry, dict) else '')
+                roll_pattern = re.compile(roll_regex)
+            
+            roll = _validate_entry(idx, entry, roll_pattern, roll_regex, errors, warnings)
+            
+            # Rule 2: Track roll numbers for duplicate detection
+            if roll is not None:
+                key = _compact_roll(roll)
+                if key in seen:
+                    duplicate_counts[roll] = duplicate_counts.get(roll, 1) + 1
+                else:
+                    seen.add(key)
+            
+            check_limit()
+        
+        for dup_roll, dup_count in duplicate_counts.items():
+            errors.append(f"ERROR: Duplicate roll number found: {dup_roll} (appears {dup_count} times)")
+            check_limit()
+    except _ErrorLimitReached:
+        return count, roll_regex, True
+    
+    if not duplicate_counts and count:
+        print(f"✓ All roll numbers are unique")
+    
+    return count, roll_regex, False
+
+
+def validate_results(results_file, roll_regex=None, stream=False, max_errors=None, report=None):
     """
     Validate results.json according to the following rules:
     1. Each entry must have a 'roll' matching the specified regex pattern
@@ -22,8 +260,15 @@ def validate_results(results_file, roll_regex=None):
     
     If roll_regex is None, auto-detects pattern from first roll number.
     
+    With stream=True (implied for .jsonl files) records are parsed and
+    checked one at a time, so memory stays bounded by the largest record
+    plus the set of seen roll numbers; both JSON arrays and JSON lines are
+    accepted. With max_errors set, validation stops after that many errors.
+    Load and check timings are recorded in `report` (a RunReport).
+    
     Returns: (is_valid, error_messages)
     """
+    report = report or RunReport("validate_results")
     errors = []
     warnings = []
     
@@ -31,110 +276,57 @@ def validate_results(results_file, roll_regex=None):
     if not Path(results_file).exists():
         return False, [f"ERROR: Results file '{results_file}' does not exist"]
     
-    # Load JSON
+    # Validate roll regex up front when one is given
+    if roll_regex is not None:
+        try:
+            re.compile(roll_regex)
+        except re.error as e:
+            return False, [f"ERROR: Invalid roll number regex pattern '{roll_regex}': {e}"]
+    
+    stream = stream or Path(results_file).suffix == ".jsonl"
+    
     try:
         with open(results_file, 'r', encoding='utf-8') as f:
-            results = json.load(f)
+            if stream:
+                print("Streaming mode: validating records as they are read")
+                with report.stage("validate"):
+                    count, roll_regex, stopped = _validate_records(
+                        iter_json_records(f), roll_regex, errors, warnings, max_errors
+                    )
+            else:
+                with report.stage("load"):
+                    results = json.load(f)
+                
+                # Rule 4: At least one record must exist
+                if not results or len(results) == 0:
+                    return False, ["ERROR: No records found in results.json. At least one parsed record is required."]
+                
+                print(f"✓ Found {len(results)} student records")
+                
+                with report.stage("validate"):
+                    count, roll_regex, stopped = _validate_records(
+                        results, roll_regex, errors, warnings, max_errors
+                    )
     except json.JSONDecodeError as e:
-        return False, [f"ERROR: Invalid JSON format: {e}"]
+        return False, errors + [f"ERROR: Invalid JSON format: {e}"]
     except Exception as e:
-        return False, [f"ERROR: Failed to read file: {e}"]
+        return False, errors + [f"ERROR: Failed to read file: {e}"]
+    
+    report.count("records", count)
+    report.count("errors", len(errors))
+    report.count("warnings", len(warnings))
     
     # Rule 4: At least one record must exist
-    if not results or len(results) == 0:
+    if count == 0:
         return False, ["ERROR: No records found in results.json. At least one parsed record is required."]
     
-    print(f"✓ Found {len(results)} student records")
-    
-    # Auto-detect roll pattern if not provided
-    if roll_regex is None:
-        # Get first roll number to detect pattern
-        first_roll = str(results[0].get('roll', ''))
-        if first_roll.startswith('21') and len(first_roll) >= 11:
-            # Pattern: 21 followed by N digits
-            digit_count = len(first_roll) - 2
-            roll_regex = f'^21\\d{{{digit_count}}}$'
-            print(f"Auto-detected roll pattern: {roll_regex} (from sample: {first_roll})")
-        else:
-            # Default fallback
-            roll_regex = r'^21\d{9}$'
-            print(f"Using default roll pattern: {roll_regex}")
-    
-    # Compile roll number regex
-    try:
-        roll_pattern = re.compile(roll_regex)
-    except re.error as e:
-        return False, [f"ERROR: Invalid roll number regex pattern '{roll_regex}': {e}"]
-    
-    # Track roll numbers for duplicate detection
-    roll_numbers = []
+    if stream:
+        print(f"✓ Checked {count} student records")
     
-    # Validate each entry
-    for idx, entry in enumerate(results):
-        entry_id = f"Entry #{idx + 1}"
-        
-        # Check required fields
-        if 'roll' not in entry:
-            errors.append(f"ERROR: {entry_id} missing 'roll' field")
-            continue
-        
-        roll = entry['roll']
-        roll_numbers.append(roll)
-        entry_id = f"Roll {roll}"
-        
-        # Rule 1: Validate roll number format
-        if not roll_pattern.match(str(roll)):
-            errors.append(f"ERROR: {entry_id} has invalid roll number format. Expected pattern: {roll_regex}")
-        
-        # Check subjects field
-        if 'subjects' not in entry:
-            warnings.append(f"WARNING: {entry_id} missing 'subjects' field")
-            continue
-        
-        subjects = entry['subjects']
-        if not isinstance(subjects, list):
-            errors.append(f"ERROR: {entry_id} 'subjects' must be a list")
-            continue
-        
-        # Rule 3: Validate marks in each subject
-        for subj_idx, subject in enumerate(subjects):
-            subj_name = subject.get('name', f'Subject #{subj_idx + 1}')
-            subj_id = f"{entry_id} - {subj_name}"
-            
-            # Check mark fields
-            mark_fields = ['marks_internal', 'marks_final', 'marks_total', 'max_marks']
-            for field in mark_fields:
-                if field in subject:
-                    value = subject[field]
-                    
-                    # Value must be integer or None/null
-                    if value is not None:
-                        if not isinstance(value, int):
-                            try:
-                                value = int(value)
-                            except (ValueError, TypeError):
-                                errors.append(
-                                    f"ERROR: {subj_id} '{field}' must be an integer or null, got: {type(value).__name__}"
-                                )
-                                continue
-                        
-                        # Marks must be in range 0-100
-                        if field != 'max_marks' and (value < 0 or value > 100):
-                            errors.append(
-                                f"ERROR: {subj_id} '{field}' value {value} out of range [0-100]"
-                            )
-    
-    # Rule 2: Check for duplicate roll numbers
-    roll_counter = Counter(roll_numbers)
-    duplicates = [roll for roll, count in roll_counter.items() if count > 1]
-    
-    if duplicates:
-        for dup_roll in duplicates:
-            errors.append(f"ERROR: Duplicate roll number found: {dup_roll} (appears {roll_counter[dup_roll]} times)")
+    if stopped:
+        errors.append(f"ERROR: Stopped after {max_errors} errors; remaining records were not checked")
     else:
-        print(f"✓ All roll numbers are unique")
-    
-    print(f"✓ Roll numbers match pattern: {roll_regex}")
+        print(f"✓ Roll numbers match pattern: {roll_regex}")
     
     # Print warnings
     if warnings:
@@ -179,6 +371,19 @@ def main():
         default=None,
         help='Regex pattern for valid roll numbers (default: auto-detect from first roll)'
     )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Validate records while reading instead of loading the whole file '
+             '(always on for .jsonl input)'
+    )
+    parser.add_argument(
+        '--max-errors',
+        type=int,
+        default=None,
+        help='Stop after this many errors (default: report all)'
+    )
+    add_report_arguments(parser)
     
     args = parser.parse_args()
     
@@ -189,7 +394,14 @@ def main():
         print("Roll number pattern: auto-detect")
     print("-" * 60)
     
-    is_valid, messages = validate_results(args.results_file, args.roll_regex)
+    with instrumented_run("validate_results", args) as report:
+        is_valid, messages = validate_results(
+            args.results_file,
+            args.roll_regex,
+            stream=args.stream,
+            max_errors=args.max_errors,
+            report=report
+        )
     
     print_validation_report(is_valid, messages)
     
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Build-time lookup index for roll-number and name searches.
+
+services/studentDataHelper.ts answers the chatbot's and the search box's
+lookups from this index instead of scanning GENERATED_STUDENTS on every
+message and keystroke. Students are referred to by their position in
+GENERATED_STUDENTS; every probe returns candidates that the frontend still
+checks against the real student, so the index only has to be complete,
+never exact.
+
+  rolls        lower-cased roll number -> first student with that roll
+  suffixFirst  every roll suffix shorter than suffixLength -> first
+               student whose roll ends with it
+  suffixes     each roll's last suffixLength characters -> postings
+  names        trigrams of the lower-cased names -> postings
+  numbers      trigrams of the roll and registration numbers -> postings
+
+Postings are ascending student positions, delta-encoded (first position,
+then gaps) to keep the file small. hash is a content hash of the roll
+numbers, names and registration numbers the index was built from; the
+frontend computes the same over GENERATED_STUDENTS and scans instead of
+probing when they differ. Queries shorter than a trigram fall back to a
+scan too.
+Names are matched with Python's lower(), which equals JavaScript's
+toLowerCase() for the ASCII capitals printed on the mark sheets.
+"""
+
+import json
+import struct
+from pathlib import Path
+
+from combined_students import write_text_if_changed
+
+
+SEARCH_INDEX_FILE = "generatedSearchIndex.ts"
+SEARCH_INDEX_VERSION = 2
+# Roll suffixes this long or longer are looked up through postings
+SUFFIX_LENGTH = 4
+NGRAM = 3
+COMPACT_SEPARATORS = (',', ':')
+# 32-bit FNV-1a
+FNV_OFFSET = 0x811c9dc5
+FNV_PRIME = 0x01000193
+
+
+def ngrams(text, n=NGRAM):
+    """Distinct n-character substrings of text."""
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def delta_encode(positions):
+    """[3, 7, 8] -> [3, 4, 1]; positions must be ascending."""
+    previous = 0
+    gaps = []
+    for position in positions:
+        gaps.append(position - previous)
+        previous = position
+    return gaps
+
+
+def content_hash(students):
+    """
+    FNV-1a over the UTF-16 code units of each student's roll number, name
+    and registration number. Must match contentHash() in
+    services/studentDataHelper.ts.
+    """
+    h = FNV_OFFSET
+    for student in students:
+        text = f"{student['rollNumber']}\n{student['name']}\n{student['regNumber']}\n"
+        for (unit,) in struct.iter_unpack('<H', text.encode('utf-16-le')):
+            h = ((h ^ unit) * FNV_PRIME) & 0xffffffff
+    return h
+
+
+def _postings(table):
+    return {key: delta_encode(positions) for key, positions in sorted(table.items())}
+
+
+def build_search_index(students):
+    """Build the index for app-format students (in GENERATED_STUDENTS order)."""
+    rolls = {}
+    suffix_first = {}
+    suffixes = {}
+    names = {}
+    numbers = {}
+    
+    for idx, student in enumerate(students):
+        roll_number = student["rollNumber"]
+        rolls.setdefault(roll_number.lower(), idx)
+        
+        for length in range(1, min(len(roll_number), SUFFIX_LENGTH - 1) + 1):
+            suffix_first.setdefault(roll_number[-length:], idx)
+        if len(roll_number) >= SUFFIX_LENGTH:
+            suffixes.setdefault(roll_number[-SUFFIX_LENGTH:], []).append(idx)
+        
+        for gram in ngrams(student["name"].lower()):
+            names.setdefault(gram, []).append(idx)
+        for gram in ngrams(roll_number) | ngrams(student["regNumber"]):
+            numbers.setdefault(gram, []).append(idx)
+    
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "count": len(students),
+        "hash": content_hash(students),
+        "ngram": NGRAM,
+        "suffixLength": SUFFIX_LENGTH,
+        "rolls": rolls,
+        "suffixFirst": dict(sorted(suffix_first.items())),
+        "suffixes": _postings(suffixes),
+        "names": _postings(names),
+        "numbers": _postings(numbers),
+    }
+
+
+def write_search_index(students, output_file=SEARCH_INDEX_FILE):
+    """Write the index as a TypeScript module next to generatedData.ts."""
+    index = build_search_index(students)
+    index_str = json.dumps(index, separators=COMPACT_SEPARATORS, ensure_ascii=False)
+    ts_content = f"""// Auto-generated from PDF data - DO NOT EDIT MANUALLY
+// Lookup index over GENERATED_STUDENTS, built by search_index.py
+import {{ SearchIndex }} from './types';
+
+export const SEARCH_INDEX: SearchIndex = {index_str};
+"""
+    write_text_if_changed(Path(output_file), ts_content)
+    print(f"✓ Generated {output_file} ({len(ts_content.encode('utf-8')):,} bytes, "
+          f"{len(index['names'])} name and {len(index['numbers'])} number trigrams)")
+    return index
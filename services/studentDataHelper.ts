@@ -1,5 +1,82 @@
 import { Student } from '../types';
 import { GENERATED_STUDENTS } from '../generatedData';
+import { SEARCH_INDEX } from '../generatedSearchIndex';
+
+// FNV-1a over the UTF-16 code units of the fields the index covers; must
+// match content_hash() in search_index.py
+const contentHash = (students: Student[]): number => {
+  let hash = 0x811c9dc5;
+  for (const s of students) {
+    const text = `${s.rollNumber}\n${s.name}\n${s.regNumber}\n`;
+    for (let i = 0; i < text.length; i++) {
+      hash = Math.imul(hash ^ text.charCodeAt(i), 0x01000193);
+    }
+  }
+  return hash >>> 0;
+};
+
+// Lookups probe the build-time index (see search_index.py) and only check
+// the candidates it returns. Short queries, and an index built for other
+// data, fall back to scanning GENERATED_STUDENTS.
+const indexUsable =
+  SEARCH_INDEX.count === GENERATED_STUDENTS.length &&
+  SEARCH_INDEX.hash === contentHash(GENERATED_STUDENTS);
+const decodedPostings = new Map<number[], number[]>();
+
+// Delta-encoded postings -> ascending student positions (decoded once)
+const decodePostings = (gaps: number[] | undefined): number[] => {
+  if (!gaps) {
+    return [];
+  }
+  let positions = decodedPostings.get(gaps);
+  if (!positions) {
+    let position = 0;
+    positions = gaps.map(gap => (position += gap));
+    decodedPostings.set(gaps, positions);
+  }
+  return positions;
+};
+
+// Positions of students that may contain text: those listed under its
+// rarest n-gram. null when text is too short to probe.
+const ngramCandidates = (postings: Record<string, number[]>, text: string): number[] | null => {
+  const n = SEARCH_INDEX.ngram;
+  if (text.length < n) {
+    return null;
+  }
+  let best: number[] | undefined;
+  for (let i = 0; i + n <= text.length; i++) {
+    const gaps = postings[text.slice(i, i + n)];
+    if (!gaps) {
+      return [];
+    }
+    if (!best || gaps.length < best.length) {
+      best = gaps;
+    }
+  }
+  return decodePostings(best);
+};
+
+// The student at an index position if it matches; a position that does
+// not means the index is stale, so scan instead
+const verified = (position: number | undefined, matches: (s: Student) => boolean): Student | undefined => {
+  if (position === undefined) {
+    return undefined;
+  }
+  const student = GENERATED_STUDENTS[position];
+  return student && matches(student) ? student : GENERATED_STUDENTS.find(matches);
+};
+
+const atPositions = (positions: Iterable<number>, matches: (s: Student) => boolean): Student[] => {
+  const result: Student[] = [];
+  for (const position of positions) {
+    const student = GENERATED_STUDENTS[position];
+    if (matches(student)) {
+      result.push(student);
+    }
+  }
+  return result;
+};
 
 // Get total number of students
 export const getTotalStudents = (): number => {
@@ -34,9 +111,25 @@ CLASS STATISTICS:
 // Find student by name - supports partial matching
 export const findStudentsByName = (name: string): Student[] => {
   const searchName = name.toLowerCase().trim();
-  return GENERATED_STUDENTS.filter(student => 
-    student.name.toLowerCase().includes(searchName)
-  );
+  const matches = (student: Student) => student.name.toLowerCase().includes(searchName);
+  const candidates = indexUsable ? ngramCandidates(SEARCH_INDEX.names, searchName) : null;
+  if (candidates) {
+    return atPositions(candidates, matches);
+  }
+  return GENERATED_STUDENTS.filter(matches);
+};
+
+// First student whose roll number ends with searchRoll
+const findByRollSuffix = (searchRoll: string): Student | undefined => {
+  const matches = (s: Student) => s.rollNumber.endsWith(searchRoll);
+  if (!indexUsable) {
+    return GENERATED_STUDENTS.find(matches);
+  }
+  if (searchRoll.length < SEARCH_INDEX.suffixLength) {
+    return verified(SEARCH_INDEX.suffixFirst[searchRoll], matches);
+  }
+  const postings = SEARCH_INDEX.suffixes[searchRoll.slice(-SEARCH_INDEX.suffixLength)];
+  return atPositions(decodePostings(postings), matches)[0];
 };
 
 // Find student by roll number - supports partial matching
@@ -44,24 +137,44 @@ export const findStudentByRollNumber = (rollNumber: string): Student | undefined
   const searchRoll = rollNumber.trim();
   
   // Try exact match first
-  let student = GENERATED_STUDENTS.find(s => 
-    s.rollNumber === searchRoll || 
-    s.rollNumber.toLowerCase() === searchRoll.toLowerCase()
-  );
+  const exact = (s: Student) =>
+    s.rollNumber === searchRoll ||
+    s.rollNumber.toLowerCase() === searchRoll.toLowerCase();
+  let student = indexUsable
+    ? verified(SEARCH_INDEX.rolls[searchRoll.toLowerCase()], exact)
+    : GENERATED_STUDENTS.find(exact);
   
   // Try ends with match (for queries like "roll 74" matching "211271524074")
-  if (!student) {
-    student = GENERATED_STUDENTS.find(s => s.rollNumber.endsWith(searchRoll));
+  if (!student && searchRoll) {
+    student = findByRollSuffix(searchRoll);
   }
   
   // Try contains match
   if (!student) {
-    student = GENERATED_STUDENTS.find(s => s.rollNumber.includes(searchRoll));
+    const matches = (s: Student) => s.rollNumber.includes(searchRoll);
+    const candidates = indexUsable ? ngramCandidates(SEARCH_INDEX.numbers, searchRoll) : null;
+    student = candidates ? atPositions(candidates, matches)[0] : GENERATED_STUDENTS.find(matches);
   }
   
   return student;
 };
 
+// Search box filter: name, roll number or registration number contains text
+export const searchStudents = (text: string): Student[] => {
+  const searchName = text.toLowerCase();
+  const matches = (s: Student) =>
+    s.name.toLowerCase().includes(searchName) ||
+    s.rollNumber.includes(text) ||
+    s.regNumber.includes(text);
+  const nameCandidates = indexUsable ? ngramCandidates(SEARCH_INDEX.names, searchName) : null;
+  const numberCandidates = indexUsable ? ngramCandidates(SEARCH_INDEX.numbers, text) : null;
+  if (!nameCandidates || !numberCandidates) {
+    return GENERATED_STUDENTS.filter(matches);
+  }
+  const positions = [...new Set([...nameCandidates, ...numberCandidates])].sort((a, b) => a - b);
+  return atPositions(positions, matches);
+};
+
 // Get complete details of a student formatted for AI
 export const getStudentFullDetails = (student: Student): string => {
   const latestResult = student.results[student.results.length - 1];
@@ -85,12 +198,18 @@ Session: ${latestResult?.session}
 SGPA: ${latestResult?.sgpa}
 CGPA: ${latestResult?.cgpa}
 Total Marks: ${latestResult?.totalMarks} / ${latestResult?.maxTotalMarks}
-Percentage: ${latestResult?.percentile}%
+Percentage: ${latestResult?.percentage ?? latestResult?.percentile}%
 Result: ${latestResult?.remarks}
 Backlog Count: ${latestResult?.backlogCount}
 Published Date: ${latestResult?.publishedDate}
 `;
 
+  if (latestResult?.classRank !== undefined) {
+    details += `Class Rank: ${latestResult.classRank} of ${latestResult.classSize}
+Percentile Rank: ${latestResult.percentileRank}
+`;
+  }
+
   if (latestResult?.subjects) {
     const theory = latestResult.subjects.filter(s => s.category === 'Theory');
     const practical = latestResult.subjects.filter(s => s.category === 'Practical');
@@ -0,0 +1,88 @@
+import { Student } from '../types';
+
+// Loader for the sharded student data emitted by
+// `python3 convert_to_app_format.py --sharded`. Opt-in: the pages read the
+// bundled GENERATED_STUDENTS, which sharded builds still write.
+// Only the small roll-number index is fetched up front; each lookup then
+// fetches at most one content-hashed shard, which is cached for the session.
+
+interface ShardInfo {
+  file: string;
+  first: string;
+  last: string;
+  count: number;
+}
+
+// Present when built with --compact: fields shared by the whole cohort
+interface CohortHeader {
+  student: Partial<Student>;
+  result: Record<string, unknown>;
+}
+
+interface ShardIndex {
+  version: number;
+  shards: ShardInfo[];
+  rolls: Record<string, number>;
+  cohort?: CohortHeader;
+}
+
+const SHARD_BASE_URL = `${import.meta.env.BASE_URL}data/students/`;
+
+let indexPromise: Promise<ShardIndex> | null = null;
+const shardPromises = new Map<number, Promise<Student[]>>();
+
+const fetchJson = async <T>(url: string): Promise<T> => {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${url}: ${response.status}`);
+  }
+  return response.json() as Promise<T>;
+};
+
+// Fetch (once) the roll-number -> shard index
+export const loadShardIndex = (): Promise<ShardIndex> => {
+  if (!indexPromise) {
+    indexPromise = fetchJson<ShardIndex>(`${SHARD_BASE_URL}index.json`).catch(error => {
+      indexPromise = null;
+      throw error;
+    });
+  }
+  return indexPromise;
+};
+
+// Re-attach hoisted cohort constants to compact shard records
+const expandCohort = (cohort: CohortHeader | undefined, students: any[]): Student[] => {
+  if (!cohort) {
+    return students;
+  }
+  return students.map(s => ({
+    ...cohort.student,
+    ...s,
+    results: s.results.map((r: any) => ({ ...cohort.result, ...r })),
+  }));
+};
+
+const loadShard = (index: ShardIndex, shardIdx: number): Promise<Student[]> => {
+  let promise = shardPromises.get(shardIdx);
+  if (!promise) {
+    promise = fetchJson<any[]>(`${SHARD_BASE_URL}${index.shards[shardIdx].file}`)
+      .then(students => expandCohort(index.cohort, students))
+      .catch(error => {
+        shardPromises.delete(shardIdx);
+        throw error;
+      });
+    shardPromises.set(shardIdx, promise);
+  }
+  return promise;
+};
+
+// Look up one student by exact roll number, fetching only its shard
+export const fetchStudentByRoll = async (rollNumber: string): Promise<Student | undefined> => {
+  const index = await loadShardIndex();
+  const shardIdx = index.rolls[rollNumber.trim()];
+  if (shardIdx === undefined) {
+    return undefined;
+  }
+  const students = await loadShard(index, shardIdx);
+  return students.find(s => s.rollNumber === rollNumber.trim());
+};
@@ -0,0 +1,74 @@
+import { Subject } from '../types';
+
+// Precomputed class-wide chart aggregates written by convert_to_app_format.py
+// (public/data/subject_stats.json), so charts can compare a student with the
+// class without scanning every student record in the browser.
+
+export interface HistogramBucket {
+  from: number;
+  to: number;
+  count: number;
+}
+
+export interface TopEntry {
+  rollNumber: string;
+  name: string;
+  score: number;
+}
+
+export type Quantiles = Record<'p10' | 'p25' | 'p50' | 'p75' | 'p90', number | null>;
+
+export interface SubjectAggregate {
+  name: string;
+  category: Subject['category'];
+  maxMarks: number;
+  students: number;
+  passRate: number | null;
+  mean: number | null;
+  histogram: HistogramBucket[]; // raw marks, 0..maxMarks
+  quantiles: Quantiles;
+  top: TopEntry[];
+}
+
+export interface CategoryAggregate {
+  category: Subject['category'];
+  subjects: number;
+  papers: number;
+  passRate: number | null;
+  meanPercent: number | null;
+  histogram: HistogramBucket[]; // percent of max marks, 0..100
+  quantiles: Quantiles;
+  top: TopEntry[];
+}
+
+export interface SubjectStats {
+  version: number;
+  classSize: number;
+  subjects: SubjectAggregate[];
+  categories: CategoryAggregate[];
+}
+
+let statsPromise: Promise<SubjectStats> | null = null;
+
+// Fetch (once) the precomputed subject statistics
+export const loadSubjectStats = (): Promise<SubjectStats> => {
+  if (!statsPromise) {
+    statsPromise = fetch(`${import.meta.env.BASE_URL}data/subject_stats.json`)
+      .then(response => {
+        if (!response.ok) {
+          throw new Error(`Failed to load subject stats: ${response.status}`);
+        }
+        return response.json() as Promise<SubjectStats>;
+      })
+      .catch(error => {
+        statsPromise = null;
+        throw error;
+      });
+  }
+  return statsPromise;
+};
+
+// Find the aggregate for one of a student's subjects
+export const findSubjectAggregate = (stats: SubjectStats, subject: Subject): SubjectAggregate | undefined => {
+  return stats.subjects.find(s => s.name === subject.name && s.category === subject.category);
+};
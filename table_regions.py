@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Layout-aware text extraction for mark sheets.
+
+pdfplumber turns every character on the page into a dict before any text
+is extracted, including the title block, footer and signatures that the
+parser never reads. In crop mode only two horizontal bands are extracted:
+the header block (from "Registration No" down to the subject table) and
+the subject table itself ("THEORY PAPERS" through "GRAND TOTAL").
+Characters outside those bands are dropped straight from pdfminer's
+layout, before pdfplumber's per-character conversion.
+
+Band geometry is learned once per template (page size) from a full-page
+extraction and reused for every later sheet in the same process. A sheet
+whose cropped text does not start and end at the expected anchors falls
+back to full-page extraction and re-learns the geometry, so a shifted or
+taller table never loses rows.
+"""
+
+from dataclasses import dataclass
+
+from pdfminer.layout import LTChar, LTContainer
+from pdfplumber.utils import chars_to_textmap
+
+
+HEADER_ANCHOR = "Registration No"
+TABLE_ANCHOR = "THEORY PAPERS"
+TABLE_END_ANCHOR = "GRAND TOTAL"
+# Text the header band must contain for parse_student_info_text
+HEADER_REQUIRED = ("Registration No", "Roll No", "obtained by", "\nof ")
+
+# Points added above and below each band; lines are ~15pt apart
+BAND_PADDING = 3
+
+# How a sheet's text was obtained
+CROPPED = "cropped"
+LEARNED = "learned"
+FULL_PAGE = "full"
+
+
+@dataclass(frozen=True)
+class SheetRegions:
+    """Top/bottom (pdfplumber coordinates) of the header and table bands."""
+    header_top: float
+    header_bottom: float
+    table_top: float
+    table_bottom: float
+
+
+# Region geometry per template, learned lazily in each process
+_TEMPLATE_REGIONS = {}
+
+
+def template_key(page):
+    """Sheets of one template share a page size."""
+    return (round(page.width), round(page.height))
+
+
+def learn_regions(page):
+    """
+    Locate the header block and subject table on a fully extracted page.
+    Returns SheetRegions, or None if the anchors are not all present.
+    """
+    lines = page.extract_text_lines(return_chars=False)
+    
+    def find(anchor, after=float("-inf")):
+        return next((line for line in lines
+                     if line["text"].startswith(anchor) and line["top"] > after), None)
+    
+    header = find(HEADER_ANCHOR)
+    table = find(TABLE_ANCHOR)
+    if header is None or table is None or table["top"] <= header["top"]:
+        return None
+    table_end = find(TABLE_END_ANCHOR, after=table["top"])
+    if table_end is None:
+        return None
+    
+    return SheetRegions(
+        header_top=header["top"] - BAND_PADDING,
+        header_bottom=table["top"] - BAND_PADDING,
+        table_top=table["top"] - BAND_PADDING,
+        table_bottom=table_end["bottom"] + BAND_PADDING,
+    )
+
+
+def _iter_layout_chars(objs):
+    for obj in objs:
+        if isinstance(obj, LTChar):
+            yield obj
+        elif isinstance(obj, LTContainer):
+            yield from _iter_layout_chars(obj)
+
+
+def _char_dict(char, top, bottom, x_offset):
+    """The subset of pdfplumber's char dict that text extraction reads."""
+    return {
+        "text": char.get_text(),
+        "x0": char.x0 + x_offset,
+        "x1": char.x1 + x_offset,
+        "top": top,
+        "bottom": bottom,
+        "doctop": top,
+        "upright": char.upright,
+        "width": char.x1 - char.x0,
+        "height": bottom - top,
+    }
+
+
+def band_chars(page, bands):
+    """
+    Collect pdfplumber-style char dicts for characters lying fully inside
+    each (top, bottom) band, reading pdfminer's layout directly so nothing
+    outside the bands is converted. Returns one list per band.
+    """
+    mb_x0, mb_top = page.mediabox[:2]
+    height = page.height
+    collected = [[] for _ in bands]
+    for char in _iter_layout_chars(page.layout):
+        top = height - char.y1 + mb_top
+        bottom = height - char.y0 + mb_top
+        for idx, (band_top, band_bottom) in enumerate(bands):
+            if band_top <= top and bottom <= band_bottom:
+                collected[idx].append(_char_dict(char, top, bottom, mb_x0))
+                break
+    return collected
+
+
+def _chars_text(page, chars):
+    """Text for a char list, laid out exactly as page.extract_text() would."""
+    if not chars:
+        return ""
+    return chars_to_textmap(
+        chars, layout_bbox=page.bbox, layout_width=page.width, layout_height=page.height
+    ).as_string
+
+
+def crop_sheet_text(page, regions):
+    """
+    Extract (header_text, table_text) from the cached bands, or None if the
+    cropped text is not bounded by the expected anchors.
+    """
+    header_chars, table_chars = band_chars(page, (
+        (regions.header_top, regions.header_bottom),
+        (regions.table_top, regions.table_bottom),
+    ))
+    header_text = _chars_text(page, header_chars)
+    table_text = _chars_text(page, table_chars)
+    
+    if not all(text in header_text for text in HEADER_REQUIRED):
+        return None
+    if not table_text.startswith(TABLE_ANCHOR) or TABLE_END_ANCHOR not in table_text:
+        return None
+    return header_text, table_text
+
+
+def extract_sheet_text(page):
+    """
+    Return (header_text, table_text, source) for the first page of a sheet.
+    
+    source is CROPPED when the cached bands were used, LEARNED when this
+    page taught (or re-taught) the template geometry and FULL_PAGE when it
+    matched no template. In the last two cases both texts are the full page
+    text, exactly as page.extract_text() returns it.
+    """
+    key = template_key(page)
+    regions = _TEMPLATE_REGIONS.get(key)
+    if regions is not None:
+        texts = crop_sheet_text(page, regions)
+        if texts is not None:
+            return texts[0], texts[1], CROPPED
+    
+    text = page.extract_text() or ""
+    regions = learn_regions(page)
+    if regions is None:
+        return text, text, FULL_PAGE
+    _TEMPLATE_REGIONS[key] = regions
+    return text, text, LEARNED
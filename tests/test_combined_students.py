@@ -0,0 +1,150 @@
+"""
+all_students.json maintenance: atomic writes, the fragment layout and
+incremental rebuilds (adds, removals and files that fail to load).
+"""
+
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from combined_students import (CombinedStudents, atomic_writer, iter_records, join_fragments, split_fragments,
+                               format_fragment, write_json_array)
+from rebuild_all_students import rebuild_all_students_json
+
+
+SUBJECTS = [
+    {"name": "MATHEMATICS-II", "category": "Theory", "max_marks": 70,
+     "marks_internal": "8", "marks_final": "40", "marks_total": "48", "credits": "3", "grade": "B"}
+]
+
+
+def record(roll, name=None):
+    return {"roll_number": roll, "registration_number": roll[2:], "name": name or f"STUDENT {roll[-3:]}",
+            "subjects": SUBJECTS}
+
+
+def write_roll_file(result_dir, roll, subjects=SUBJECTS):
+    path = result_dir / f"{roll}.json"
+    path.write_text(json.dumps(subjects, indent=2), encoding="utf-8")
+    return path
+
+
+def combined_rolls(result_dir):
+    return [r["roll_number"] for r in json.loads((result_dir / "all_students.json").read_text())]
+
+
+def test_atomic_writer_keeps_original_on_error(tmp_path):
+    target = tmp_path / "all_students.json"
+    target.write_text("original", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with atomic_writer(target) as f:
+            f.write("partial")
+            raise RuntimeError("interrupted")
+    assert target.read_text(encoding="utf-8") == "original"
+    assert os.listdir(tmp_path) == ["all_students.json"]
+
+
+def test_atomic_writer_keeps_target_permissions(tmp_path):
+    target = tmp_path / "generatedData.ts"
+    target.write_text("old", encoding="utf-8")
+    os.chmod(target, 0o640)
+    with atomic_writer(target) as f:
+        f.write("new")
+    assert target.stat().st_mode & 0o777 == 0o640
+    
+    fresh = tmp_path / "fresh.json"
+    with atomic_writer(fresh) as f:
+        f.write("{}")
+    umask = os.umask(0)
+    os.umask(umask)
+    assert fresh.stat().st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_fragments_match_json_dump(tmp_path):
+    records = [record("211271524001"), record("211271524002", "ÄRYA")]
+    path = tmp_path / "all_students.json"
+    write_json_array(path, records)
+    text = path.read_text(encoding="utf-8")
+    assert text == json.dumps(records, indent=2, ensure_ascii=False)
+    
+    fragments = split_fragments(text)
+    assert list(fragments) == ["211271524001", "211271524002"]
+    assert join_fragments(list(fragments.values())) == text
+    assert fragments["211271524002"] == format_fragment(records[1])
+    assert list(iter_records(path)) == records
+
+
+def test_split_fragments_rejects_other_layouts():
+    assert split_fragments(json.dumps([record("211271524001")])) is None
+    assert split_fragments("[]") == {}
+
+
+def test_store_upsert_remove_and_reload(tmp_path):
+    store = CombinedStudents(tmp_path)
+    store.upsert(record("211271524002"))
+    store.upsert(record("211271524001"))
+    assert store.save()
+    assert combined_rolls(tmp_path) == ["211271524001", "211271524002"]
+    
+    store = CombinedStudents(tmp_path)
+    assert not store.upsert(record("211271524001"))
+    store.remove("211271524001")
+    assert store.save()
+    assert combined_rolls(tmp_path) == ["211271524002"]
+    assert CombinedStudents(tmp_path).get("211271524002") == record("211271524002")
+
+
+def test_incremental_rebuild_adds_and_removes(tmp_path):
+    for roll in ("211271524001", "211271524002", "211271524003"):
+        write_roll_file(tmp_path, roll)
+    rebuild_all_students_json(tmp_path)
+    assert combined_rolls(tmp_path) == ["211271524001", "211271524002", "211271524003"]
+    
+    (tmp_path / "211271524002.json").unlink()
+    write_roll_file(tmp_path, "211271524004")
+    store = rebuild_all_students_json(tmp_path, incremental=True)
+    assert store.removed == set() and store.upserted == set()  # cleared by save()
+    assert combined_rolls(tmp_path) == ["211271524001", "211271524003", "211271524004"]
+
+
+def test_incremental_rebuild_keeps_known_names(tmp_path):
+    write_roll_file(tmp_path, "211271524001")
+    rebuild_all_students_json(tmp_path)
+    store = CombinedStudents(tmp_path)
+    store.upsert(record("211271524001", "ARYA KUMAR"))
+    store.save()
+    
+    write_roll_file(tmp_path, "211271524001", SUBJECTS * 2)
+    rebuild_all_students_json(tmp_path, incremental=True)
+    (student,) = json.loads((tmp_path / "all_students.json").read_text())
+    assert student["name"] == "ARYA KUMAR"
+    assert len(student["subjects"]) == 2
+
+
+def test_incremental_rebuild_retries_unreadable_file(tmp_path):
+    write_roll_file(tmp_path, "211271524001")
+    broken = tmp_path / "211271524002.json"
+    broken.write_text('[{"name": ', encoding="utf-8")
+    rebuild_all_students_json(tmp_path)
+    assert combined_rolls(tmp_path) == ["211271524001"]
+    
+    # The failed load leaves no stamp, so an unchanged file is read again
+    assert "211271524002" not in CombinedStudents(tmp_path).sources
+    rebuild_all_students_json(tmp_path, incremental=True)
+    assert "211271524002" not in CombinedStudents(tmp_path).sources
+    
+    shutil.copy(tmp_path / "211271524001.json", broken)
+    rebuild_all_students_json(tmp_path, incremental=True)
+    assert combined_rolls(tmp_path) == ["211271524001", "211271524002"]
+
+
+def test_non_student_files_are_ignored(tmp_path):
+    write_roll_file(tmp_path, "211271524001")
+    (tmp_path / "cohort_stats.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "students_app_format.json").write_text("[]", encoding="utf-8")
+    rebuild_all_students_json(tmp_path)
+    assert combined_rolls(tmp_path) == ["211271524001"]
@@ -0,0 +1,135 @@
+"""
+JobManifest: files are claimed by exactly one worker, state survives
+reopening, dead workers' claims are released and changed or deleted PDFs
+are picked up by sync().
+"""
+
+import multiprocessing
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from job_manifest import DONE, FAILED, PENDING, RUNNING, JobManifest
+
+
+SETTINGS = {"parser": 3, "input": "result"}
+
+
+def make_pdfs(tmp_path, count):
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir(exist_ok=True)
+    pdfs = []
+    for i in range(count):
+        pdf = pdf_dir / f"2112715240{i:02d}.pdf"
+        pdf.write_bytes(b"%PDF-1.4 " + str(i).encode())
+        pdfs.append(pdf)
+    return pdfs
+
+
+def open_manifest(tmp_path, settings=SETTINGS):
+    return JobManifest(tmp_path / "manifest", "run", settings)
+
+
+def _claim_all(manifest_dir, queue):
+    manifest = JobManifest(manifest_dir, "run", SETTINGS)
+    claimed = []
+    while True:
+        names = manifest.claim(2)
+        if not names:
+            break
+        claimed.extend(names)
+    manifest.close()
+    queue.put(claimed)
+
+
+def test_sync_adds_resets_and_drops_files(tmp_path):
+    pdfs = make_pdfs(tmp_path, 3)
+    with open_manifest(tmp_path) as manifest:
+        assert manifest.sync(pdfs) == 3
+        assert manifest.sync(pdfs) == 0
+        names = manifest.claim(3)
+        for name in names:
+            manifest.done(tmp_path / "pdfs" / name, name, {"roll": name}, 0.1)
+        
+        pdfs[0].write_bytes(b"%PDF-1.4 re-issued")
+        pdfs[2].unlink()
+        assert manifest.sync(pdfs[:2]) == 1
+        assert manifest.counts() == {PENDING: 1, RUNNING: 0, DONE: 1, FAILED: 0}
+
+
+def test_touched_but_unchanged_file_stays_done(tmp_path):
+    pdfs = make_pdfs(tmp_path, 1)
+    with open_manifest(tmp_path) as manifest:
+        manifest.sync(pdfs)
+        (name,) = manifest.claim(1)
+        manifest.done(pdfs[0], name, {"roll": name}, 0.1)
+        os.utime(pdfs[0], ns=(1, 1))
+        assert manifest.sync(pdfs) == 0
+        assert manifest.is_complete()
+
+
+def test_state_survives_reopening_and_settings_change_resets(tmp_path):
+    pdfs = make_pdfs(tmp_path, 2)
+    with open_manifest(tmp_path) as manifest:
+        manifest.sync(pdfs)
+        manifest.claim(1)
+        first, = manifest.claim(1)
+        manifest.failed(tmp_path / "pdfs" / first, "no subjects", 0.2)
+    
+    with open_manifest(tmp_path) as manifest:
+        assert manifest.counts()[FAILED] == 1
+        assert manifest.failures() == [(first, 1, "no subjects")]
+        manifest.reset([FAILED])
+        assert manifest.counts()[FAILED] == 0
+    
+    with open_manifest(tmp_path, dict(SETTINGS, parser=4)) as manifest:
+        assert manifest.counts() == {PENDING: 2, RUNNING: 0, DONE: 0, FAILED: 0}
+
+
+def test_records_in_sort_key_order(tmp_path):
+    pdfs = make_pdfs(tmp_path, 3)
+    with open_manifest(tmp_path) as manifest:
+        manifest.sync(pdfs)
+        for pdf, key in zip(pdfs, ["c", "a", "b"]):
+            manifest.claim(1)
+            manifest.done(pdf, key, {"key": key}, 0.1)
+        assert [r["key"] for r in manifest.records()] == ["a", "b", "c"]
+
+
+def test_concurrent_workers_never_share_a_file(tmp_path):
+    pdfs = make_pdfs(tmp_path, 40)
+    with open_manifest(tmp_path) as manifest:
+        manifest.sync(pdfs)
+    
+    queue = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_claim_all, args=(tmp_path / "manifest", queue))
+               for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    claimed = [name for _ in workers for name in queue.get(timeout=60)]
+    for worker in workers:
+        worker.join()
+    
+    assert sorted(claimed) == sorted(pdf.name for pdf in pdfs)
+
+
+def test_claims_of_dead_local_workers_are_released(tmp_path):
+    pdfs = make_pdfs(tmp_path, 2)
+    with open_manifest(tmp_path) as manifest:
+        manifest.sync(pdfs)
+        # Claimed by a process on this host that has exited
+        dead = multiprocessing.Process(target=int)
+        dead.start()
+        dead.join()
+        manifest.worker = f"{socket.gethostname()}:{dead.pid}"
+        manifest.claim(1)
+        # A live worker on another host keeps its claim until it goes stale
+        manifest.worker = "elsewhere:1"
+        manifest.claim(1)
+    
+    with open_manifest(tmp_path) as manifest:
+        assert manifest.release_dead_claims() == 1
+        assert manifest.counts()[RUNNING] == 1
+        assert manifest.release_dead_claims(stale_after=-1) == 1
+        assert manifest.counts()[PENDING] == 2
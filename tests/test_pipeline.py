@@ -0,0 +1,88 @@
+"""
+Pipeline: a second run over unchanged inputs skips every stage, a changed
+per-roll file re-runs only what depends on it, and the output locations
+are part of the emit fingerprint.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline import Pipeline
+from run_report import RunReport
+
+
+SUBJECTS = [
+    {"subject_name": "APPLIED PHYSICS -A", "credits": "3.0", "total_marks": "100", "marks_internal": "17",
+     "marks_final": "28", "marks_total": "45", "grade": "E", "category": "THEORY"},
+    {"subject_name": "APPLIED MATHEMATICS -A", "credits": "3.0", "total_marks": "100", "marks_internal": "22",
+     "marks_final": "28", "marks_total": "50", "grade": "D", "category": "THEORY"},
+]
+ROLLS = ("211271524001", "211271524002", "211271524003")
+DOWNSTREAM = ["merge", "names", "stats", "emit"]
+
+
+@pytest.fixture
+def result_dir(tmp_path, monkeypatch):
+    # Anything written relative to the working directory lands in tmp_path
+    monkeypatch.chdir(tmp_path)
+    result_dir = tmp_path / "batch"
+    result_dir.mkdir()
+    for roll in ROLLS:
+        write_roll_file(result_dir, roll)
+    return result_dir
+
+
+def write_roll_file(result_dir, roll, subjects=SUBJECTS):
+    (result_dir / f"{roll}.json").write_text(json.dumps(subjects, indent=2), encoding="utf-8")
+
+
+def run(result_dir, **options):
+    pipeline = Pipeline(result_dir, workers=1, no_cache=True, report=RunReport("pipeline"), **options)
+    return pipeline.run()
+
+
+def test_second_run_skips_every_stage(result_dir):
+    assert run(result_dir) == ["extract"] + DOWNSTREAM
+    assert run(result_dir) == []
+
+
+def test_changed_source_reruns_dependent_stages(result_dir):
+    run(result_dir)
+    write_roll_file(result_dir, ROLLS[1], SUBJECTS[:1])
+    assert run(result_dir) == DOWNSTREAM
+    students = json.loads((result_dir / "students_app_format.json").read_text(encoding="utf-8"))
+    assert len(students[1]["results"][0]["subjects"]) == 1
+
+
+def test_touched_but_unchanged_source_stops_at_merge(result_dir):
+    run(result_dir)
+    os.utime(result_dir / f"{ROLLS[0]}.json", ns=(1, 1))
+    assert run(result_dir) == ["merge"]
+
+
+def test_deleted_output_is_written_again(result_dir):
+    run(result_dir)
+    (result_dir / "generatedData.ts").unlink()
+    assert run(result_dir) == ["emit"]
+    assert (result_dir / "generatedData.ts").exists()
+
+
+def test_side_batch_does_not_touch_app_root(result_dir, tmp_path):
+    run(result_dir)
+    for name in ("generatedData.ts", "generatedSearchIndex.ts", "students_app_format.json",
+                 "cohort_stats.json", "public/data/subject_stats.json"):
+        assert (result_dir / name).exists()
+    assert sorted(os.listdir(tmp_path)) == ["batch"]
+
+
+def test_output_location_is_fingerprinted(result_dir, tmp_path):
+    run(result_dir)
+    assert run(result_dir, app_dir=tmp_path / "app") == ["emit"]
+    assert (tmp_path / "app" / "generatedData.ts").exists()
+    assert run(result_dir, app_dir=tmp_path / "app", sharded=True) == ["emit"]
+    assert (tmp_path / "app" / "public" / "data" / "students" / "index.json").exists()
+    assert run(result_dir, app_dir=tmp_path / "app", sharded=True) == []
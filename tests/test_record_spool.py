@@ -0,0 +1,121 @@
+"""
+RecordSpool: records survive an interrupted run up to the last checkpoint,
+torn writes after it are truncated away, and only unfinished or changed
+PDFs are parsed again.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from record_spool import RecordSpool
+
+
+SETTINGS = {"parser": 3, "output": "all_students.json"}
+
+
+def make_pdfs(tmp_path, count):
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    pdfs = []
+    for i in range(count):
+        pdf = pdf_dir / f"2112715240{i:02d}.pdf"
+        pdf.write_bytes(b"%PDF-1.4 " + bytes([i]))
+        pdfs.append(pdf)
+    return pdfs
+
+
+def record_for(pdf):
+    return {"roll_number": pdf.stem, "subjects": []}
+
+
+def crash(spool):
+    """Drop a spool the way a killed process would: no final checkpoint."""
+    spool._file.flush()
+    spool._file.close()
+
+
+def test_records_come_back_in_key_order(tmp_path):
+    pdfs = make_pdfs(tmp_path, 4)
+    spool = RecordSpool(tmp_path / "spool", "run", SETTINGS)
+    for pdf in reversed(pdfs):
+        spool.append(pdf, pdf.stem, record_for(pdf))
+    assert [r["roll_number"] for r in spool.records()] == [pdf.stem for pdf in pdfs]
+    spool.discard()
+    assert list((tmp_path / "spool").iterdir()) == []
+
+
+def test_resume_skips_checkpointed_files(tmp_path):
+    pdfs = make_pdfs(tmp_path, 5)
+    spool = RecordSpool(tmp_path / "spool", "run", SETTINGS, checkpoint_every=2)
+    for pdf in pdfs[:3]:
+        spool.append(pdf, pdf.stem, record_for(pdf))
+    crash(spool)  # the third record was never checkpointed
+    
+    spool = RecordSpool(tmp_path / "spool", "run", SETTINGS, checkpoint_every=2)
+    assert spool.pending(pdfs) == pdfs[2:]
+    for pdf in pdfs[2:]:
+        spool.append(pdf, pdf.stem, record_for(pdf))
+    assert [r["roll_number"] for r in spool.records()] == [pdf.stem for pdf in pdfs]
+
+
+def test_torn_write_after_checkpoint_is_truncated(tmp_path):
+    pdfs = make_pdfs(tmp_path, 3)
+    spool = RecordSpool(tmp_path / "spool", "run", SETTINGS, checkpoint_every=2)
+    for pdf in pdfs[:2]:
+        spool.append(pdf, pdf.stem, record_for(pdf))
+    crash(spool)
+    checkpointed = spool.path.stat().st_size
+    with open(spool.path, 'ab') as f:
+        f.write(b'{"file": "2112715240')  # killed mid-line
+    
+    spool = RecordSpool(tmp_path / "spool", "run", SETTINGS)
+    assert spool.path.stat().st_size == checkpointed
+    assert spool.pending(pdfs) == pdfs[2:]
+    spool.append(pdfs[2], pdfs[2].stem, record_for(pdfs[2]))
+    assert len(list(spool.records())) == 3
+
+
+def test_changed_pdf_is_parsed_again_and_replaces_its_record(tmp_path):
+    pdfs = make_pdfs(tmp_path, 2)
+    spool = RecordSpool(tmp_path / "spool", "run", SETTINGS)
+    for pdf in pdfs:
+        spool.append(pdf, pdf.stem, record_for(pdf))
+    spool.close()
+    
+    pdfs[0].write_bytes(b"%PDF-1.4 re-issued sheet")
+    spool = RecordSpool(tmp_path / "spool", "run", SETTINGS)
+    assert spool.pending(pdfs) == [pdfs[0]]
+    spool.append(pdfs[0], pdfs[0].stem, dict(record_for(pdfs[0]), name="NEW"))
+    records = list(spool.records())
+    assert len(records) == 2
+    assert records[0]["name"] == "NEW"
+
+
+def test_deleted_pdf_is_forgotten(tmp_path):
+    pdfs = make_pdfs(tmp_path, 3)
+    spool = RecordSpool(tmp_path / "spool", "run", SETTINGS)
+    for pdf in pdfs:
+        spool.append(pdf, pdf.stem, record_for(pdf))
+    spool.close()
+    
+    pdfs[1].unlink()
+    spool = RecordSpool(tmp_path / "spool", "run", SETTINGS)
+    assert spool.pending([pdfs[0], pdfs[2]]) == []
+    assert [r["roll_number"] for r in spool.records()] == [pdfs[0].stem, pdfs[2].stem]
+
+
+def test_other_settings_or_restart_start_over(tmp_path):
+    pdfs = make_pdfs(tmp_path, 2)
+    spool = RecordSpool(tmp_path / "spool", "run", SETTINGS)
+    for pdf in pdfs:
+        spool.append(pdf, pdf.stem, record_for(pdf))
+    spool.close()
+    
+    spool = RecordSpool(tmp_path / "spool", "run", dict(SETTINGS, parser=4))
+    assert spool.pending(pdfs) == pdfs
+    assert spool.path.stat().st_size == 0
+    spool.close()
+    
+    spool = RecordSpool(tmp_path / "spool", "run", SETTINGS, resume=False)
+    assert spool.pending(pdfs) == pdfs
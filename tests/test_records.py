@@ -0,0 +1,74 @@
+"""
+Student and Subject records: every per-roll file round-trips byte for byte,
+numbers printed in a non-canonical form are still numbers, and text that is
+not a number is kept as is.
+"""
+
+import glob
+import json
+import os
+import pickle
+import sys
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+from records import Grade, Student, Subject
+
+
+ROW = {
+    "subject_name": "APPLIED PHYSICS -A", "credits": "3.0", "total_marks": "100", "marks_internal": "17",
+    "marks_final": "028", "marks_total": "45", "grade": "E", "category": "THEORY"
+}
+
+
+def row(**columns):
+    return dict(ROW, **columns)
+
+
+def test_per_roll_files_round_trip():
+    for path in sorted(glob.glob(os.path.join(REPO, "result", "2*.json"))):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        subjects = [Subject.from_dict(subject) for subject in json.loads(text)]
+        assert json.dumps([subject.to_dict() for subject in subjects], indent=2, ensure_ascii=False) == text, path
+
+
+def test_canonical_row_is_parsed_once():
+    subject = Subject.from_dict(ROW)
+    assert (subject.credits, subject.total_marks, subject.marks_final) == (3.0, 100, 28)
+    assert subject.grade is Grade.E
+    assert subject.texts is None
+    assert subject.to_dict() == ROW
+
+
+@pytest.mark.parametrize("columns, credits, max_marks, obtained", [
+    ({"credits": "7.50"}, 7.5, 100, 45),
+    ({"credits": "01.0"}, 1.0, 100, 45),
+    ({"credits": "3"}, 3.0, 100, 45),
+    ({"marks_total": "+5"}, 3.0, 100, 5),
+    ({"total_marks": " 100"}, 3.0, 100, 45),
+])
+def test_non_canonical_numbers_are_numbers(columns, credits, max_marks, obtained):
+    data = row(**columns)
+    subject = Subject.from_dict(data)
+    app = subject.to_app_dict()
+    assert (app["credits"], app["maxMarks"], app["obtainedMarks"]) == (credits, max_marks, obtained)
+    assert subject.to_dict() == data
+    assert pickle.loads(pickle.dumps(subject)).to_dict() == data
+
+
+def test_non_numbers_round_trip_but_do_not_convert():
+    data = row(marks_total="AB", credits="")
+    subject = Subject.from_dict(data)
+    assert subject.marks_total == "AB" and subject.credits is None
+    assert subject.to_dict() == data
+    with pytest.raises(ValueError):
+        subject.to_app_dict()
+
+
+def test_student_round_trip():
+    record = {"roll_number": "211271524001", "registration_number": "1271524001", "name": "ARYA",
+              "subjects": [ROW, row(credits="7.50", marks_total="+5")]}
+    assert Student.from_dict(record).to_dict() == record
@@ -0,0 +1,104 @@
+"""
+Sharded extraction: shard assignment is stable and covers every file once,
+merging the partials gives the unsharded output for any shard count, and
+duplicate roll numbers leave the output untouched.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+from combined_students import write_records
+from run_shards import DuplicateRollError, merge_partials, parse_shard, select_shard, shard_of
+
+
+def entry(i):
+    return {"roll": f"2112715240{i:02d}", "name": f"STUDENT {i:03d}",
+            "subjects": [{"name": "MATHEMATICS-II", "marks_total": 40 + i % 30, "grade": "B"}]}
+
+
+ENTRIES = [entry(i) for i in range(1, 41)]
+
+
+def write_partials(tmp_path, entries, count, suffix=".json"):
+    """Split entries the way pdf_extractor.py --shard K/N would."""
+    paths = []
+    for index in range(1, count + 1):
+        path = tmp_path / f"part{index}{suffix}"
+        write_records(path, [e for e in entries if shard_of(f"{e['roll']}.pdf", count) == index])
+        paths.append(path)
+    return paths
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for text in ("0/4", "5/4", "4", "a/b", "1/2/3"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(text)
+
+
+def test_shard_of_is_stable_and_ignores_the_directory():
+    # Pinned: machines running different shards must agree on these
+    names = [f"2112715240{i:02d}.pdf" for i in range(1, 9)]
+    assert [shard_of(name, 4) for name in names] == [4, 4, 2, 4, 4, 3, 1, 4]
+    assert [shard_of(os.path.join("elsewhere", name), 4) for name in names] == [4, 4, 2, 4, 4, 3, 1, 4]
+    assert shard_of(names[0], 1) == 1
+
+
+def test_shards_partition_the_files():
+    files = [f"{e['roll']}.pdf" for e in ENTRIES]
+    for count in (1, 3, 7):
+        shards = [select_shard(files, (index, count)) for index in range(1, count + 1)]
+        assert sorted(f for shard in shards for f in shard) == files
+    assert select_shard(files) == files
+
+
+@pytest.mark.parametrize("suffix", [".json", ".jsonl"])
+def test_merge_matches_unsharded_output_for_any_shard_count(tmp_path, suffix):
+    expected = tmp_path / f"unsharded{suffix}"
+    write_records(expected, ENTRIES)
+    for count in (1, 2, 5):
+        merged = tmp_path / f"merged{count}{suffix}"
+        assert merge_partials(write_partials(tmp_path, ENTRIES, count, suffix), merged) == len(ENTRIES)
+        assert merged.read_bytes() == expected.read_bytes()
+
+
+def test_duplicates_leave_output_untouched(tmp_path):
+    partials = write_partials(tmp_path, ENTRIES, 2)
+    write_records(partials[0], sorted([ENTRIES[0], ENTRIES[0], *ENTRIES[1:3]], key=lambda e: e["roll"]))
+    write_records(partials[1], [ENTRIES[0], ENTRIES[5]])
+    output = tmp_path / "results.json"
+    output.write_text("previous", encoding="utf-8")
+    
+    with pytest.raises(DuplicateRollError) as excinfo:
+        merge_partials(partials, output)
+    assert excinfo.value.duplicates == {ENTRIES[0]["roll"]: 3}
+    assert output.read_text(encoding="utf-8") == "previous"
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+def test_unsorted_partial_is_rejected(tmp_path):
+    partial = tmp_path / "part1.json"
+    write_records(partial, [ENTRIES[1], ENTRIES[0]])
+    with pytest.raises(ValueError, match="not in roll-number order"):
+        merge_partials([partial], tmp_path / "results.json")
+
+
+def test_merge_results_script_reports_duplicates(tmp_path):
+    partials = [tmp_path / "part1.json", tmp_path / "part2.jsonl"]
+    write_records(partials[0], ENTRIES[:4])
+    write_records(partials[1], ENTRIES[3:5])
+    output = tmp_path / "results.json"
+    run = subprocess.run(
+        [sys.executable, os.path.join(REPO, "scripts", "merge_results.py"), *map(str, partials),
+         "--output_file", str(output)],
+        capture_output=True, text=True, cwd=tmp_path
+    )
+    assert run.returncode == 1
+    assert f"ERROR: Duplicate roll number found: {ENTRIES[3]['roll']} (appears 2 times)" in run.stdout
+    assert not output.exists()
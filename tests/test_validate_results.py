@@ -0,0 +1,122 @@
+"""
+Streaming validation (--stream, run in CI) must reject every results.json
+that the non-streaming json.load path rejects.
+"""
+
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from validate_results import iter_json_records, validate_results
+
+
+RECORD = {
+    "roll": "211271524001",
+    "name": "STUDENT 001",
+    "subjects": [
+        {"name": "MATHEMATICS-II", "marks_internal": 8, "marks_final": 40,
+         "marks_total": 48, "max_marks": 70, "grade": "B"}
+    ]
+}
+SECOND = dict(RECORD, roll="211271524002", name="STUDENT 002")
+ONE = json.dumps(RECORD)
+TWO = json.dumps(SECOND)
+
+MALFORMED = [
+    f"[{ONE} {TWO}]",          # missing comma
+    f"[{ONE},,{TWO}]",         # doubled comma
+    f"[,{ONE}]",               # leading comma
+    f"[{ONE},]",               # trailing comma
+    f"[{ONE}, {TWO},,]",
+    f"[{ONE}]garbage",         # data after the array
+    f"[{ONE}] [{TWO}]",
+    f"[{ONE}",                 # unterminated
+    f"[{ONE},",
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+@pytest.mark.parametrize("text", MALFORMED)
+def test_iter_json_records_rejects_malformed_arrays(text, chunk_size):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_records(io.StringIO(text), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+@pytest.mark.parametrize("text", [
+    f"[{ONE},{TWO}]",
+    f"  [\n  {ONE} ,\n  {TWO}\n]\n  ",
+    f"{ONE}\n{TWO}\n",
+])
+def test_iter_json_records_reads_well_formed_input(text, chunk_size):
+    assert list(iter_json_records(io.StringIO(text), chunk_size=chunk_size)) == [RECORD, SECOND]
+
+
+def test_iter_json_records_reads_empty_array():
+    assert list(iter_json_records(io.StringIO(" [ ] \n"))) == []
+
+
+@pytest.mark.parametrize("text", MALFORMED)
+def test_stream_mode_fails_like_load_mode(tmp_path, text):
+    results_file = tmp_path / "results.json"
+    results_file.write_text(text, encoding="utf-8")
+    for stream in (False, True):
+        is_valid, messages = validate_results(str(results_file), stream=stream)
+        assert not is_valid
+        assert any("Invalid JSON format" in message for message in messages)
+
+
+def test_stream_mode_passes_valid_array(tmp_path):
+    results_file = tmp_path / "results.json"
+    results_file.write_text(json.dumps([RECORD, SECOND], indent=2), encoding="utf-8")
+    is_valid, _ = validate_results(str(results_file), stream=True)
+    assert is_valid
+
+
+class CountingReader(io.StringIO):
+    """StringIO that records how many characters were read."""
+    
+    def __init__(self, text):
+        super().__init__(text)
+        self.consumed = 0
+    
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+@pytest.mark.parametrize("bad", ['{"roll": 1 "name": "x"}', '{"roll": tru}', '{"roll": "1",, }'])
+def test_iter_json_records_stops_at_first_error(bad):
+    tail = ",\n".join([ONE] * 5000) + "]"
+    reader = CountingReader(f"[{ONE},\n{bad},\n{tail}")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_records(reader, chunk_size=256))
+    assert reader.consumed < 2 * 256 + len(ONE) + len(bad)
+
+
+def test_iter_json_records_bounds_unterminated_values():
+    reader = CountingReader('[{"roll": "' + "1" * 100000)
+    with pytest.raises(json.JSONDecodeError, match="Record longer than"):
+        list(iter_json_records(reader, chunk_size=256, max_record_chars=1000))
+    assert reader.consumed < 2000
+
+
+def test_int_and_string_rolls_are_not_duplicates(tmp_path):
+    results_file = tmp_path / "results.json"
+    results_file.write_text(json.dumps([dict(RECORD, roll=211271524001), RECORD]), encoding="utf-8")
+    for stream in (False, True):
+        _, messages = validate_results(str(results_file), stream=stream)
+        assert not any("Duplicate roll number" in message for message in messages)
+
+
+def test_repeated_rolls_are_duplicates(tmp_path):
+    results_file = tmp_path / "results.json"
+    results_file.write_text(json.dumps([RECORD, SECOND, RECORD]), encoding="utf-8")
+    is_valid, messages = validate_results(str(results_file), stream=True)
+    assert not is_valid
+    assert "ERROR: Duplicate roll number found: 211271524001 (appears 2 times)" in messages
@@ -0,0 +1,70 @@
+"""
+ResultWatcher: the first sync writes the app data even without PDFs, the
+app data stays inside a non-default result directory, and a sheet that
+fails to parse keeps its student until a later parse succeeds.
+"""
+
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+from combined_students import CombinedStudents
+from watch_results import ResultWatcher
+
+
+PDF = os.path.join(REPO, "result", "211271524096.pdf")
+
+
+@pytest.fixture
+def result_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result_dir = tmp_path / "batch"
+    result_dir.mkdir()
+    return result_dir
+
+
+def test_first_sync_without_pdfs_writes_app_data(result_dir, tmp_path):
+    store = CombinedStudents(result_dir)
+    store.upsert({"roll_number": "211271524001", "registration_number": "1271524001", "name": "ARYA",
+                  "subjects": []})
+    store.save()
+    
+    watcher = ResultWatcher(result_dir, workers=1)
+    try:
+        assert not watcher.sync()
+        assert (result_dir / "generatedData.ts").exists()
+        assert (result_dir / "public" / "data" / "subject_stats.json").exists()
+        (result_dir / "generatedData.ts").unlink()
+        watcher.sync()
+        assert not (result_dir / "generatedData.ts").exists()  # later syncs only act on changes
+    finally:
+        watcher.close()
+    assert sorted(os.listdir(tmp_path)) == ["batch"]
+
+
+@pytest.mark.skipif(not os.path.exists(PDF), reason="sample mark sheet not available")
+def test_unreadable_pdf_keeps_previous_record(result_dir):
+    pdf = result_dir / "211271524096.pdf"
+    shutil.copy(PDF, pdf)
+    watcher = ResultWatcher(result_dir, workers=1)
+    try:
+        assert watcher.sync()
+        (roll,) = CombinedStudents(result_dir).rolls()
+        
+        full = pdf.read_bytes()
+        pdf.write_bytes(full[:len(full) // 3])  # copy still in progress
+        assert not watcher.sync()
+        assert CombinedStudents(result_dir).rolls() == [roll]
+        assert json.loads((result_dir / "students_app_format.json").read_text())[0]["rollNumber"] == roll
+        
+        pdf.write_bytes(full)
+        watcher.sync()
+        assert watcher.rolls == {pdf.name: roll}
+        assert CombinedStudents(result_dir).rolls() == [roll]
+    finally:
+        watcher.close()
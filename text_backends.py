@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Page text extraction backends for mark sheets.
+
+Every backend is a function taking (pdf_path, crop, timings) and
+returning (header_text, table_text) for the first page: the text the
+student info and the subject table are parsed from (the same full page
+text unless the backend crops). Timings, when a dict is given, receive the
+seconds spent opening the document ("open") and extracting text
+("extract").
+
+Each backend also has a page generator (PAGE_BACKENDS) for consolidated
+PDFs holding many sheets: it opens the document once and yields
+(page_index, header_text, table_text) page by page, releasing each page's
+text and layout objects before the next page is read.
+
+  pdfium      pypdfium2's text page; no character objects are built, so it
+              is an order of magnitude faster than pdfplumber. Optional.
+  pdfplumber  pdfplumber's extract_text, or the header and table bands
+              only with crop=True (see table_regions.py). The reference.
+
+The fast backend is the default when installed; extract_pdf_data checks
+its output structurally and re-extracts with pdfplumber on failure.
+"""
+
+import contextlib
+import time
+
+import pdfplumber
+
+from table_regions import extract_sheet_text
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # optional: without it every sheet goes through pdfplumber
+    pdfium = None
+
+
+FALLBACK_BACKEND = "pdfplumber"
+
+
+def _add_extract_time(timings, start):
+    if timings is not None:
+        timings["extract"] = round(timings.get("extract", 0) + time.perf_counter() - start, 4)
+
+
+def pdfplumber_pages(pdf_path, crop=False, timings=None, start=0, stop=None):
+    """Yield pages start..stop-1 (stop=None: to the end) with pdfplumber."""
+    opening = time.perf_counter()
+    # Only the requested pages get pdfplumber Page objects
+    page_numbers = None if stop is None else range(start + 1, stop + 1)
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        pages = pdf.pages if page_numbers is not None else pdf.pages[start:]
+        if timings is not None:
+            timings["open"] = round(time.perf_counter() - opening, 4)
+        for page in pages:
+            page_start = time.perf_counter()
+            if crop:
+                header_text, table_text, layout = extract_sheet_text(page)
+                if timings is not None:
+                    timings["layout"] = layout
+            else:
+                header_text = table_text = page.extract_text() or ""
+            # Drop the page's chars and layout objects before the next page
+            page.close()
+            _add_extract_time(timings, page_start)
+            yield page.page_number - 1, header_text, table_text
+
+
+def pdfium_pages(pdf_path, crop=False, timings=None, start=0, stop=None):
+    """
+    Yield pages start..stop-1 (stop=None: to the end) with pypdfium2. crop
+    is ignored: the text page is built natively, which is already cheaper
+    than cropping.
+    """
+    opening = time.perf_counter()
+    document = pdfium.PdfDocument(str(pdf_path))
+    try:
+        if timings is not None:
+            timings["open"] = round(time.perf_counter() - opening, 4)
+        for index in range(start, len(document) if stop is None else min(stop, len(document))):
+            page_start = time.perf_counter()
+            page = document[index]
+            text_page = page.get_textpage()
+            text = text_page.get_text_bounded()
+            text_page.close()
+            page.close()
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+            _add_extract_time(timings, page_start)
+            yield index, text, text
+    finally:
+        document.close()
+
+
+def _first_page(pages, pdf_path, crop, timings):
+    with contextlib.closing(pages(pdf_path, crop, timings, stop=1)) as first:
+        for _, header_text, table_text in first:
+            return header_text, table_text
+    raise ValueError(f"{pdf_path} has no pages")
+
+
+def pdfplumber_text(pdf_path, crop=False, timings=None):
+    """Extract the first page with pdfplumber."""
+    return _first_page(pdfplumber_pages, pdf_path, crop, timings)
+
+
+def pdfium_text(pdf_path, crop=False, timings=None):
+    """Extract the first page with pypdfium2 (crop is ignored, see pdfium_pages)."""
+    return _first_page(pdfium_pages, pdf_path, crop, timings)
+
+
+def page_count(pdf_path):
+    """Number of pages in a PDF, read with the cheapest installed library."""
+    if pdfium is not None:
+        document = pdfium.PdfDocument(str(pdf_path))
+        try:
+            return len(document)
+        finally:
+            document.close()
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+BACKENDS = {
+    "pdfium": pdfium_text,
+    "pdfplumber": pdfplumber_text,
+}
+
+
+PAGE_BACKENDS = {
+    "pdfium": pdfium_pages,
+    "pdfplumber": pdfplumber_pages,
+}
+
+
+def available_backends():
+    """Names of the backends that can run in this environment."""
+    return [name for name in BACKENDS if name != "pdfium" or pdfium is not None]
+
+
+DEFAULT_BACKEND = available_backends()[0]
+
+
+def get_backend(name=None):
+    """Return the extraction function for a backend name (default: fastest available)."""
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown text backend '{name}' (choose from {', '.join(BACKENDS)})")
+    if name not in available_backends():
+        raise ValueError(f"Text backend '{name}' is not installed (pip install pypdfium2)")
+    return BACKENDS[name]
+
+
+def get_page_backend(name=None):
+    """Return the page generator for a backend name (default: fastest available)."""
+    get_backend(name)
+    return PAGE_BACKENDS[name or DEFAULT_BACKEND]
+
+
+def add_backend_arguments(parser):
+    """Register the --backend switch on an argparse parser."""
+    parser.add_argument(
+        '--backend',
+        choices=list(BACKENDS),
+        default=None,
+        help=f'Text extraction backend (default: {DEFAULT_BACKEND}); sheets that fail '
+             f'structural checks are re-extracted with {FALLBACK_BACKEND}'
+    )
+
+
+def validate_backend_argument(parser, args):
+    """Exit with a usage error if --backend names a backend that cannot run."""
+    try:
+        get_backend(args.backend)
+    except ValueError as e:
+        parser.error(str(e))
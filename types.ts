@@ -20,7 +20,11 @@ export interface SemesterResult {
   remarks: string;
   backlogCount: number;
   publishedDate: string;
-  percentile: number | string;
+  percentile: number | string; // Marks percentage (historical name)
+  percentage?: number;
+  classRank?: number; // 1 = highest SGPA in the class; ties share a rank
+  classSize?: number;
+  percentileRank?: number; // % of the class with SGPA <= this student's
 }
 
 export interface Student {
@@ -36,6 +40,21 @@ export interface Student {
   avatarUrl?: string; // For AI generated avatar
 }
 
+// Lookup index emitted next to generatedData.ts (see search_index.py).
+// Postings are delta-encoded ascending positions in GENERATED_STUDENTS.
+export interface SearchIndex {
+  version: number;
+  count: number;
+  hash: number;
+  ngram: number;
+  suffixLength: number;
+  rolls: Record<string, number>;
+  suffixFirst: Record<string, number>;
+  suffixes: Record<string, number[]>;
+  names: Record<string, number[]>;
+  numbers: Record<string, number[]>;
+}
+
 export type ImageResolution = '1K' | '2K' | '4K';
 
 export interface AnalysisResult {
@@ -3,82 +3,94 @@
 Update student names in all_students.json from PDF files.
 """
 
-import pdfplumber
-import json
-import re
+import argparse
 from pathlib import Path
 
+from combined_students import CombinedStudents
+from extract_pdf_data import PARSER_VERSION, iter_marksheets
+from extraction_cache import add_cache_arguments, open_cache
+from rebuild_all_students import is_placeholder_name
 
-def extract_student_info_from_pdf(pdf_path):
-    """Extract student information from PDF."""
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            page = pdf.pages[0]
-            text = page.extract_text()
-            
-            info = {}
-            
-            # Extract registration number
-            reg_match = re.search(r'Registration No\s*:\s*(\d+)', text)
-            if reg_match:
-                info['registration_number'] = reg_match.group(1)
-            
-            # Extract roll number
-            roll_match = re.search(r'Roll No\s*:\s*(\d+)', text)
-            if roll_match:
-                info['roll_number'] = roll_match.group(1)
-            
-            # Extract name
-            name_match = re.search(r'obtained by\s+([A-Z\s]+)\s+of', text)
-            if name_match:
-                info['name'] = name_match.group(1).strip()
-            
-            return info
-    except Exception as e:
-        print(f"Error extracting info from {pdf_path}: {e}")
-        return {}
 
-
-def update_student_names(result_dir="result"):
-    """Update student names from PDF files."""
+def update_student_names(result_dir="result", workers=None, no_cache=False, rebuild_cache=False):
+    """
+    Update student names from PDF files.
+    PDF header info comes from the shared extraction cache when the sheet
+    has not changed since it was last parsed. Only the students whose name
+    was filled in are re-serialized, and the file is written atomically.
+    """
     result_path = Path(result_dir)
     
     # Load all_students.json
-    all_students_file = result_path / "all_students.json"
-    with open(all_students_file, 'r', encoding='utf-8') as f:
-        all_students = json.load(f)
+    all_students = CombinedStudents(result_path)
+    if not all_students.path.exists():
+        raise FileNotFoundError(f"{all_students.path} not found")
     
     print(f"Loaded {len(all_students)} students from all_students.json")
     
     # Find PDF files
-    pdf_files = list(result_path.glob("*.pdf"))
+    pdf_files = sorted(result_path.glob("*.pdf"))
     print(f"Found {len(pdf_files)} PDF files")
     
     # Extract info from PDFs
     pdf_info = {}
-    for pdf_file in pdf_files:
-        info = extract_student_info_from_pdf(pdf_file)
-        if info and 'roll_number' in info:
-            pdf_info[info['roll_number']] = info
-            print(f"  Extracted: {info['roll_number']} - {info.get('name', 'N/A')}")
+    cache = open_cache(result_path, PARSER_VERSION, no_cache, rebuild_cache)
+    for pdf_file, marksheet, error in iter_marksheets(pdf_files, workers, cache):
+        if error:
+            print(f"Error extracting info from {pdf_file}: {error}")
+            continue
+        info = marksheet.to_dict()
+        pdf_info[info['roll_number']] = info
+        print(f"  Extracted: {info['roll_number']} - {info.get('name') or 'N/A'}")
+    
+    if cache is not None:
+        cache.close()
+        print(f"✓ {cache.summary()}")
     
     # Update student names
     updated_count = 0
-    for student in all_students:
-        roll_number = student['roll_number']
-        if roll_number in pdf_info:
-            if student['name'].startswith('STUDENT '):
-                student['name'] = pdf_info[roll_number].get('name', student['name'])
-                student['registration_number'] = pdf_info[roll_number].get('registration_number', student['registration_number'])
+    for roll_number, info in pdf_info.items():
+        student = all_students.get(roll_number)
+        if student is not None:
+            if is_placeholder_name(student['name']):
+                student['name'] = info.get('name') or student['name']
+                student['registration_number'] = info.get('registration_number') or student['registration_number']
+                all_students.upsert(student)
                 updated_count += 1
     
     # Save updated data
-    with open(all_students_file, 'w', encoding='utf-8') as f:
-        json.dump(all_students, f, indent=2, ensure_ascii=False)
+    all_students.save()
     
     print(f"\n✓ Updated {updated_count} student names")
-    print(f"✓ Saved to {all_students_file}")
+    print(f"✓ Saved to {all_students.path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Fill in placeholder student names in all_students.json from PDFs'
+    )
+    parser.add_argument(
+        '--result_dir',
+        default='result',
+        help='Directory containing PDF files and all_students.json (default: result)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of parser processes (default: CPU count, 1 = serial)'
+    )
+    add_cache_arguments(parser)
+    
+    args = parser.parse_args()
+    
+    update_student_names(
+        args.result_dir,
+        workers=args.workers,
+        no_cache=args.no_cache,
+        rebuild_cache=args.rebuild_cache
+    )
 
 
 if __name__ == "__main__":
-    update_student_names()
+    main()
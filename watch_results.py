@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Watch result/ and keep the combined and app data current as PDFs arrive.
+
+Replaces running extract_pdf_data.py, rebuild_all_students.py,
+update_student_names_from_pdfs.py and convert_to_app_format.py by hand
+after every PDF drop. On start the watcher brings everything up to date
+once; after that, each burst of new, changed or deleted PDFs (debounced
+until the directory has been quiet for --debounce seconds) is handled by:
+
+  - parsing only the PDFs whose size or mtime changed (unchanged content
+    is still served from the extraction cache),
+  - rewriting their result/<roll>.json files and patching their students
+    into all_students.json, and removing the students of deleted PDFs
+    from all_students.json (their per-roll files are left alone); a sheet
+    that fails to parse, e.g. one still being copied, leaves its student
+    as it was and is retried at the next sync,
+  - rebuilding the app data when any student changed. Shards are named by
+    content, so only the shards whose students changed are written. The
+    app data goes to the same place convert_to_app_format.py would write
+    it for --result_dir and --app-dir.
+
+Change notification uses Linux inotify when available and falls back to
+polling the directory every --poll-interval seconds elsewhere (or with
+--poll). Either way the set of changed files is taken from a size/mtime
+snapshot, so a missed or duplicate event never skips or repeats work.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from combined_students import CombinedStudents
+from convert_to_app_format import (DEFAULT_SHARD_DIR, DEFAULT_SHARD_SIZE, add_app_dir_argument, resolve_app_dir,
+                                   write_app_data)
+from extract_pdf_data import PARSER_VERSION, iter_marksheets, save_marksheet
+from extraction_cache import open_cache
+from run_report import RunReport
+from text_backends import add_backend_arguments, validate_backend_argument
+
+
+DEFAULT_DEBOUNCE = 2.0
+DEFAULT_POLL_INTERVAL = 1.0
+# A steady trickle of PDFs is processed at least this often
+MAX_DEBOUNCE_FACTOR = 10
+
+# inotify(7) event bits
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_WATCH_MASK = _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def pdf_snapshot(result_path):
+    """{file name: (mtime_ns, size)} for every PDF in result_path."""
+    snapshot = {}
+    for pdf_file in Path(result_path).glob("*.pdf"):
+        try:
+            stat = pdf_file.stat()
+        except FileNotFoundError:
+            continue
+        snapshot[pdf_file.name] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+class InotifyWatcher:
+    """Wakes up on PDF events in one directory, via inotify through libc."""
+    
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(fd, os.fsencode(str(path)), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+        self.fd = fd
+    
+    def wait(self, timeout=None):
+        """
+        Block until a PDF event arrives or timeout seconds pass (None waits
+        forever). Returns True if any PDF may have changed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return False
+            if self._drain():
+                return True
+    
+    def _drain(self):
+        """Read all queued events; True if any concerned a PDF."""
+        relevant = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return relevant
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                start = offset + _EVENT_HEADER.size
+                name = data[start:start + length].rstrip(b"\0")
+                offset = start + length
+                if mask & _IN_Q_OVERFLOW or name.endswith(b".pdf"):
+                    relevant = True
+    
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback: compares directory snapshots every interval seconds."""
+    
+    def __init__(self, path, interval=DEFAULT_POLL_INTERVAL):
+        self.path = Path(path)
+        self.interval = interval
+        self._last = pdf_snapshot(self.path)
+    
+    def wait(self, timeout=None):
+        """Same contract as InotifyWatcher.wait."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+            current = pdf_snapshot(self.path)
+            if current != self._last:
+                self._last = current
+                return True
+    
+    def close(self):
+        pass
+
+
+def make_watcher(path, poll=False, poll_interval=DEFAULT_POLL_INTERVAL):
+    """An InotifyWatcher on Linux unless poll is set, else a PollingWatcher."""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError) as e:
+            print(f"⚠ inotify unavailable ({e}); polling every {poll_interval}s")
+    return PollingWatcher(path, poll_interval)
+
+
+class ResultWatcher:
+    """
+    Incremental extract + combine + convert for one result directory.
+    
+    Remembers the PDF snapshot and the roll number each PDF produced, so a
+    deleted or re-issued sheet can be removed from the combined data. The
+    app data goes where convert_to_app_format would put it for the same
+    result_dir and app_dir.
+    """
+    
+    def __init__(self, result_dir="result", workers=None, crop=False, backend=None,
+                 sharded=False, shard_dir=None, shard_size=DEFAULT_SHARD_SIZE, compact=False, app_dir=None):
+        self.result_path = Path(result_dir)
+        self.workers = workers
+        self.crop = crop
+        self.backend = backend
+        self.app_options = {
+            "sharded": sharded, "shard_dir": shard_dir, "shard_size": shard_size, "compact": compact,
+            "result_dir": self.result_path, "app_dir": resolve_app_dir(result_dir, app_dir)
+        }
+        self.cache = open_cache(self.result_path, PARSER_VERSION)
+        self.snapshot = {}
+        self.rolls = {}
+        self.synced = False
+    
+    def sync(self):
+        """
+        Process every PDF added, changed or deleted since the last sync.
+        The first call processes them all and always rewrites the app data,
+        even when there are no PDFs. A sheet that fails to parse (e.g. one
+        still being copied) keeps its student's previous record and is
+        tried again at the next sync. Returns True if any student in
+        all_students.json changed.
+        """
+        initial = not self.synced
+        current = pdf_snapshot(self.result_path)
+        changed = sorted(name for name, stamp in current.items() if self.snapshot.get(name) != stamp)
+        deleted = sorted(name for name in self.snapshot.keys() | self.rolls.keys() if name not in current)
+        self.snapshot = current
+        if not changed and not deleted and not initial:
+            return False
+        
+        report = RunReport("watch_results")
+        start = time.perf_counter()
+        print(f"\n[{time.strftime('%H:%M:%S')}] {len(changed)} new or changed, {len(deleted)} deleted PDFs")
+        
+        store = CombinedStudents(self.result_path)
+        stale_rolls = {self.rolls.pop(name) for name in deleted if name in self.rolls}
+        
+        # The first sync sees every PDF, so it may prune the cache too
+        marksheets = iter_marksheets(
+            [self.result_path / name for name in changed], self.workers, self.cache, report,
+            self.crop, self.backend, evict=initial
+        )
+        for pdf_file, marksheet, error in marksheets:
+            print(f"  {pdf_file.name}")
+            if not save_marksheet(self.result_path, pdf_file, marksheet, error, report):
+                # Leave its student as it was; forget the stamp so it is retried
+                self.snapshot.pop(pdf_file.name, None)
+                continue
+            previous = self.rolls.get(pdf_file.name)
+            if previous is not None and previous != marksheet.roll_number:
+                stale_rolls.add(previous)
+            self.rolls[pdf_file.name] = marksheet.roll_number
+            store.upsert(marksheet.to_dict())
+        
+        # Students whose sheet was deleted (or now carries another roll) leave
+        # the derived data only: result/<roll>.json is source data and is kept
+        for roll_number in stale_rolls - set(self.rolls.values()):
+            store.remove(roll_number)
+            print(f"  ⚠ Removed {roll_number} from all_students.json; result/{roll_number}.json is kept "
+                  f"(delete it too, or a full rebuild will bring the student back)")
+        
+        upserted, removed = len(store.upserted), len(store.removed)
+        changed_students = store.dirty
+        store.save()
+        print(f"✓ all_students.json: {upserted} updated, {removed} removed ({len(store)} students)")
+        
+        # The first sync always writes the app data: it may be missing or stale
+        if changed_students or initial:
+            write_app_data(store.students(), report=report, **self.app_options)
+        else:
+            print("✓ No student data changed; app data left as is")
+        self.synced = True
+        
+        print(f"✓ Synced in {time.perf_counter() - start:.2f}s")
+        return changed_students
+    
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
+
+
+def watch(result_watcher, watcher, debounce=DEFAULT_DEBOUNCE):
+    """
+    Sync once, then sync again after every debounced burst of PDF events,
+    until interrupted.
+    """
+    result_watcher.sync()
+    print(f"\nWatching {result_watcher.result_path} for PDF changes (Ctrl+C to stop)...")
+    while True:
+        watcher.wait()
+        # Let copies finish: wait for a quiet period, but not forever
+        deadline = time.monotonic() + debounce * MAX_DEBOUNCE_FACTOR
+        while time.monotonic() < deadline and watcher.wait(debounce):
+            pass
+        result_watcher.sync()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Watch result/ and re-extract, combine and convert only what changed'
+    )
+    parser.add_argument(
+        '--result_dir',
+        default='result',
+        help='Directory containing PDF files (default: result)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of parser processes (default: CPU count, 1 = serial)'
+    )
+    parser.add_argument(
+        '--crop',
+        action='store_true',
+        help='Extract only the header block and subject table (see extract_pdf_data.py)'
+    )
+    add_backend_arguments(parser)
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        default=DEFAULT_DEBOUNCE,
+        help=f'Seconds without PDF changes before a batch is processed (default: {DEFAULT_DEBOUNCE})'
+    )
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        help='Poll the directory instead of using inotify'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f'Seconds between directory scans when polling (default: {DEFAULT_POLL_INTERVAL})'
+    )
+    parser.add_argument(
+        '--once',
+        action='store_true',
+        help='Bring everything up to date once and exit instead of watching'
+    )
+    parser.add_argument(
+        '--sharded',
+        action='store_true',
+        help='Also write roll-number shards next to generatedData.ts (see convert_to_app_format.py)'
+    )
+    add_app_dir_argument(parser)
+    parser.add_argument(
+        '--shard-dir',
+        default=None,
+        help=f'Output directory for shards (default: <app dir>/{DEFAULT_SHARD_DIR})'
+    )
+    parser.add_argument(
+        '--shard-size',
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help=f'Students per shard (default: {DEFAULT_SHARD_SIZE})'
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Minify the app data and write .gz/.br siblings for sharded files'
+    )
+    
+    args = parser.parse_args()
+    validate_backend_argument(parser, args)
+    
+    if not Path(args.result_dir).is_dir():
+        print(f"✗ {args.result_dir} is not a directory")
+        sys.exit(1)
+    
+    result_watcher = ResultWatcher(
+        args.result_dir,
+        workers=args.workers,
+        crop=args.crop,
+        backend=args.backend,
+        sharded=args.sharded,
+        shard_dir=args.shard_dir,
+        shard_size=args.shard_size,
+        compact=args.compact,
+        app_dir=args.app_dir
+    )
+    try:
+        if args.once:
+            result_watcher.sync()
+            return
+        watcher = make_watcher(args.result_dir, args.poll, args.poll_interval)
+        try:
+            watch(result_watcher, watcher, args.debounce)
+        finally:
+            watcher.close()
+    except KeyboardInterrupt:
+        print("\n✓ Stopped watching")
+    finally:
+        result_watcher.close()
+
+
+if __name__ == "__main__":
+    main()